@@ -0,0 +1,162 @@
+"""Benchmark of the compression options of the report objects.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compression --days 5 --isins 3000
+
+A report is built from generated source days with XetraETL.transform,
+like in the report job. The objects of the report are serialised
+in memory with every trg_format, trg_compression and
+trg_compression_level combination, using the write options of
+S3BucketConnector:
+
+- partition: the rows of one date without the date column,
+  as written under trg_partition_key
+- report: all rows, as written under trg_key
+
+For every combination, the object size, the ratio to the uncompressed
+object and the best write and read times are printed. The dictionary
+encoded Parquet columns are set with --dictionary-columns.
+"""
+
+from argparse import ArgumentParser
+from io import BytesIO
+from os import environ
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+environ.setdefault('AWS_ACCESS_KEY_ID', 'KEY1')
+environ.setdefault('AWS_SECRET_ACCESS_KEY', 'KEY2')
+
+from benchmarks.bench_transform import (  # noqa: E402
+    SOURCE_CONFIG, TARGET_CONFIG, best_time
+)
+from benchmarks.generator import generate_day, trading_dates  # noqa: E402
+from xetra.common.meta_process import MetaProcess  # noqa: E402
+from xetra.common.s3 import csv_output, parquet_options  # noqa: E402
+from xetra.transformers.xetra_transformer import XetraETL  # noqa: E402
+
+# (trg_format, trg_compression, trg_compression_level)
+SCENARIOS = [
+    ('csv', None, None),
+    ('csv', 'gzip', 1),
+    ('csv', 'gzip', 6),
+    ('csv', 'gzip', 9),
+    ('parquet', 'none', None),
+    ('parquet', 'snappy', None),
+    ('parquet', 'gzip', 6),
+    ('parquet', 'zstd', 1),
+    ('parquet', 'zstd', 3),
+    ('parquet', 'zstd', 9),
+    ('parquet', 'zstd', 19)
+]
+
+
+def make_report(days: int, isins: int, seed: int = 42):
+    """Creates a report of generated source days.
+
+    returns
+    -------
+    data_frame : DataFrame
+    The report of all days but the first, which is only
+    needed for the change to the previous closing price
+    """
+
+    dates = trading_dates(SOURCE_CONFIG.src_first_extract_date, days + 1)
+    data_frame = pd.concat([
+        source_file
+        for number, date in enumerate(dates)
+        for source_file in generate_day(
+            date, isins, seed=seed + number
+        ).values()
+    ], ignore_index=True)
+
+    with patch.object(MetaProcess, 'get_date_list',
+            return_value=[dates[1], dates]):
+        xetra_etl = XetraETL(MagicMock(), MagicMock(), 'meta.csv',
+            SOURCE_CONFIG, TARGET_CONFIG)
+
+    return xetra_etl.transform(data_frame)
+
+
+def write_object(data_frame: pd.DataFrame, format: str, compression: str,
+        compression_level: int, row_group_size: int,
+        dictionary_columns: list):
+    """Serialises a report object like S3BucketConnector.write_df_to_s3."""
+
+    out_buffer = BytesIO()
+
+    if format == 'csv':
+        with csv_output(out_buffer, compression,
+                compression_level) as csv_buffer:
+            csv_buffer.write(data_frame.to_csv(index=False).encode('utf-8'))
+
+    else:
+        data_frame.to_parquet(out_buffer, index=False, **parquet_options(
+            row_group_size, compression, compression_level,
+            dictionary_columns
+        ))
+
+    return out_buffer.getvalue()
+
+
+def read_object(body: bytes, format: str, compression: str):
+    """Reads a report object into a Pandas dataframe."""
+
+    if format == 'csv':
+        return pd.read_csv(BytesIO(body), compression=compression)
+
+    return pd.read_parquet(BytesIO(body))
+
+
+def main():
+    """Times the writes and reads of every compression option."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--isins', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--row-group-size', type=int, default=1000)
+    parser.add_argument('--dictionary-columns', nargs='*',
+        default=[TARGET_CONFIG.trg_col_isin, TARGET_CONFIG.trg_col_date])
+    args = parser.parse_args()
+
+    df_report = make_report(args.days, args.isins)
+    date_column = TARGET_CONFIG.trg_col_date
+    df_partition = (
+        df_report[df_report[date_column] == df_report[date_column].iloc[0]]
+        .drop(columns=[date_column])
+        .sort_values(TARGET_CONFIG.trg_col_isin)
+        .reset_index(drop=True)
+    )
+
+    for name, data_frame in [('partition', df_partition),
+            ('report', df_report)]:
+        print(f"\n{name}: {len(data_frame):,} rows")
+        print(f"{'format':<8} {'codec':<7} {'level':>5} {'bytes':>11} "
+            f"{'ratio':>6} {'write ms':>9} {'read ms':>8} {'identical':>10}")
+
+        sizes = {}
+
+        for format, compression, level in SCENARIOS:
+            body, time_write = best_time(
+                lambda: write_object(data_frame, format, compression, level,
+                    args.row_group_size, args.dictionary_columns),
+                args.repeat
+            )
+            df_result, time_read = best_time(
+                lambda: read_object(body, format, compression), args.repeat
+            )
+            # Sizes are compared to the uncompressed object of the format
+            sizes.setdefault(format, len(body))
+
+            print(f"{format:<8} {compression or '-':<7} "
+                f"{'-' if level is None else level:>5} {len(body):>11,} "
+                f"{len(body) / sizes[format]:>6.2f} "
+                f"{time_write * 1000:>9.1f} {time_read * 1000:>8.1f} "
+                f"{data_frame.equals(df_result)!s:>10}")
+
+
+if __name__ == '__main__':
+    main()
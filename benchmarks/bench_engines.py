@@ -0,0 +1,87 @@
+"""Benchmark of XetraETL.transform on every dataframe engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_engines --rows 3000000
+
+The source rows of benchmarks.bench_transform are transformed with
+every available src_transform_engine, serially and, with --workers,
+in the ISIN-sharded process pool. Every report is compared with the
+serial Pandas report, which is the reference of the conformance tests.
+"""
+
+from argparse import ArgumentParser
+from os import environ
+from unittest.mock import MagicMock, patch
+
+environ.setdefault('AWS_ACCESS_KEY_ID', 'KEY1')
+environ.setdefault('AWS_SECRET_ACCESS_KEY', 'KEY2')
+
+from benchmarks.bench_transform import (  # noqa: E402
+    SOURCE_CONFIG, TARGET_CONFIG, best_time, make_source_data
+)
+from xetra.common.constants import TransformEngine  # noqa: E402
+from xetra.common.custom_exceptions import WrongEngineException  # noqa: E402
+from xetra.common.meta_process import MetaProcess  # noqa: E402
+from xetra.transformers.engines import get_engine  # noqa: E402
+from xetra.transformers.xetra_transformer import XetraETL  # noqa: E402
+
+
+def main():
+    """Times the transform on every engine and compares the reports."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    parser.add_argument('--isins', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--engines', nargs='+',
+        default=[engine.value for engine in TransformEngine])
+    args = parser.parse_args()
+
+    data_frame = make_source_data(args.rows, args.isins)
+    extract_date = '2022-05-09'
+
+    with patch.object(MetaProcess, 'get_date_list',
+            return_value=[extract_date, []]):
+        xetra_etl = XetraETL(MagicMock(), MagicMock(), 'meta.csv',
+            SOURCE_CONFIG, TARGET_CONFIG)
+
+    df_reference, time_reference = best_time(
+        lambda: xetra_etl.transform(data_frame), args.repeat
+    )
+
+    print(f"rows:            {len(data_frame):>12,}")
+    print(f"{'engine':<16} {'seconds':>12} {'speedup':>8} {'identical':>10}")
+
+    # Polars runs multi-threaded and is never sharded
+    runs = [(engine, 1) for engine in args.engines]
+    if args.workers > 1:
+        runs += [
+            (engine, args.workers) for engine in args.engines
+            if engine != TransformEngine.POLARS.value
+        ]
+
+    for engine, workers in runs:
+        try:
+            get_engine(engine)
+
+        except WrongEngineException as error:
+            print(f"{engine:<16} {error}")
+            continue
+
+        xetra_etl.src_args = SOURCE_CONFIG._replace(
+            src_transform_engine=engine, src_transform_workers=workers
+        )
+        df_engine, time_engine = best_time(
+            lambda: xetra_etl.transform(data_frame), args.repeat
+        )
+        label = engine if workers == 1 else f"{engine} x{workers}"
+
+        print(f"{label:<16} {time_engine:>12.3f} "
+            f"{time_reference / time_engine:>7.2f}x "
+            f"{df_reference.equals(df_engine)!s:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark of the csv parsers for the source objects.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_read_csv --rows 1000000
+
+Compares the previous read path (decode the body, wrap it in a StringIO,
+parse with the C engine) with the current read paths on the same
+object body: the C engine on the raw bytes, the multi-threaded pyarrow
+engine converted to Pandas, and the Arrow table without conversion.
+"""
+
+from argparse import ArgumentParser
+from io import StringIO
+from os import environ
+
+from pandas import read_csv
+
+environ.setdefault('AWS_ACCESS_KEY_ID', 'KEY1')
+environ.setdefault('AWS_SECRET_ACCESS_KEY', 'KEY2')
+
+from benchmarks.bench_transform import (  # noqa: E402
+    best_time, make_source_data
+)
+from xetra.common.s3 import csv_body_to_df, csv_body_to_table  # noqa: E402
+
+COLUMNS = ['ISIN', 'Date', 'Time', 'StartPrice', 'MinPrice',
+    'MaxPrice', 'TradedVolume']
+
+DTYPES = {
+    'ISIN': 'category',
+    'Date': 'category',
+    'Time': 'category',
+    'StartPrice': 'float64',
+    'MinPrice': 'float64',
+    'MaxPrice': 'float64',
+    'TradedVolume': 'int64'
+}
+
+
+def legacy_read(body: bytes):
+    """The read path before the byte-level parsers."""
+
+    return read_csv(StringIO(body.decode('utf-8')), delimiter=',')
+
+
+def main():
+    """Times the csv parsers and compares their dataframes."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    body = make_source_data(args.rows).to_csv(index=False).encode('utf-8')
+
+    _, time_legacy = best_time(lambda: legacy_read(body), args.repeat)
+    df_c, time_c = best_time(
+        lambda: csv_body_to_df(body, columns=COLUMNS, dtype=DTYPES),
+        args.repeat
+    )
+    df_arrow, time_arrow = best_time(
+        lambda: csv_body_to_df(body, columns=COLUMNS, dtype=DTYPES,
+            engine='pyarrow'), args.repeat
+    )
+    _, time_table = best_time(
+        lambda: csv_body_to_table(body, columns=COLUMNS, dtype=DTYPES),
+        args.repeat
+    )
+
+    megabytes = len(body) / 1024 ** 2
+
+    print(f"body:          {megabytes:>10.1f} MiB")
+    for name, seconds in [('legacy', time_legacy), ('c', time_c),
+            ('pyarrow', time_arrow), ('arrow table', time_table)]:
+        print(f"{name + ':':<14} {seconds:>10.3f} s"
+            f" {megabytes / seconds:>8.1f} MiB/s")
+    print(f"identical:     {df_c.equals(df_arrow)!s:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Benchmark of XetraETL.transform against the previous implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transform --rows 3000000 --workers 16
+
+The previous transform sorted the data twice, ran two grouped
+transforms and a second aggregation. It is kept here as reference,
+both for timing and for checking that the report is bit-identical.
+With --workers, the ISIN-sharded process pool is timed as well:
+the first call, which starts the pool, separately from the calls
+reusing it. Sharding only pays off with more than one CPU and
+enough rows per shard; src_transform_shard_rows is the threshold.
+"""
+
+from argparse import ArgumentParser
+from os import cpu_count, environ
+from time import perf_counter
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from pandas import DataFrame
+
+environ.setdefault('AWS_ACCESS_KEY_ID', 'KEY1')
+environ.setdefault('AWS_SECRET_ACCESS_KEY', 'KEY2')
+
+from xetra.common.meta_process import MetaProcess  # noqa: E402
+from xetra.transformers.xetra_transformer import (  # noqa: E402
+    XetraETL, XetraSourceConfig, XetraTargetConfig
+)
+
+SOURCE_CONFIG = XetraSourceConfig(
+    src_first_extract_date='2022-05-09',
+    src_columns=['ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+        'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'],
+    src_col_date='Date',
+    src_col_isin='ISIN',
+    src_col_time='Time',
+    src_col_start_price='StartPrice',
+    src_col_min_price='MinPrice',
+    src_col_max_price='MaxPrice',
+    src_col_traded_vol='TradedVolume'
+)
+
+TARGET_CONFIG = XetraTargetConfig(
+    trg_col_isin='isin',
+    trg_col_date='date',
+    trg_col_op_price='opening_price_eur',
+    trg_col_clos_price='closing_price_eur',
+    trg_col_min_price='minimum_price_eur',
+    trg_col_max_price='maximum_price_eur',
+    trg_col_dail_trad_vol='daily_traded_volume',
+    trg_col_ch_prev_clos='change_prev_closing_%',
+    trg_key='report/xetra_daily_report_',
+    trg_key_date_format='%Y%m%d_%H%M%S',
+    trg_format='parquet'
+)
+
+
+def make_source_data(rows: int, isins: int = 3000, seed: int = 42):
+    """Creates random source rows for two trading days.
+
+    Every (ISIN, Date, Time) combination occurs at most once,
+    like in the Deutsche Boerse data.
+    """
+
+    rng = np.random.default_rng(seed)
+    times = np.array([
+        f"{hour:02d}:{minute:02d}"
+        for hour in range(8, 17) for minute in range(60)
+    ])
+    dates = np.array(['2022-05-09', '2022-05-10'])
+    slots = len(dates) * len(times)
+
+    # Draw unique (ISIN, slot) pairs
+    cells = rng.choice(isins * slots, size=min(rows, isins * slots),
+        replace=False)
+    isin_ids, slot_ids = np.divmod(cells, slots)
+    start_prices = rng.uniform(1, 500, len(cells)).round(2)
+
+    return DataFrame({
+        'ISIN': np.char.add('DE', np.char.zfill(isin_ids.astype(str), 10)),
+        'Mnemonic': 'XXX',
+        'Date': dates[slot_ids // len(times)],
+        'Time': times[slot_ids % len(times)],
+        'StartPrice': start_prices,
+        'EndPrice': start_prices,
+        'MinPrice': (start_prices * 0.99).round(2),
+        'MaxPrice': (start_prices * 1.01).round(2),
+        'TradedVolume': rng.integers(0, 10000, len(cells))
+    })
+
+
+def legacy_transform(data_frame: DataFrame, src_args: XetraSourceConfig,
+        trg_args: XetraTargetConfig, extract_date: str):
+    """The transform implementation before the single-pass engine."""
+
+    data_frame = data_frame.loc[:, src_args.src_columns]
+    data_frame.dropna(inplace=True)
+    data_frame[trg_args.trg_col_op_price] = (
+        data_frame.sort_values(by=[src_args.src_col_time])
+        .groupby([src_args.src_col_isin, src_args.src_col_date])
+        [src_args.src_col_start_price].transform('first')
+    )
+    data_frame[trg_args.trg_col_clos_price] = (
+        data_frame.sort_values(by=[src_args.src_col_time])
+        .groupby([src_args.src_col_isin, src_args.src_col_date])
+        [src_args.src_col_start_price].transform('last')
+    )
+    data_frame.rename(columns={
+        src_args.src_col_isin: trg_args.trg_col_isin,
+        src_args.src_col_date: trg_args.trg_col_date,
+        src_args.src_col_min_price: trg_args.trg_col_min_price,
+        src_args.src_col_max_price: trg_args.trg_col_max_price,
+        src_args.src_col_traded_vol: trg_args.trg_col_dail_trad_vol
+    }, inplace=True)
+    data_frame = (
+        data_frame.groupby([trg_args.trg_col_isin, trg_args.trg_col_date],
+            as_index=False)
+        .agg({
+            trg_args.trg_col_op_price: 'min',
+            trg_args.trg_col_clos_price: 'min',
+            trg_args.trg_col_min_price: 'min',
+            trg_args.trg_col_max_price: 'max',
+            trg_args.trg_col_dail_trad_vol: 'sum'
+        })
+    )
+    data_frame[trg_args.trg_col_ch_prev_clos] = (
+        data_frame.sort_values(by=[trg_args.trg_col_date])
+        .groupby([trg_args.trg_col_isin])
+        [trg_args.trg_col_op_price].shift(1)
+    )
+    data_frame[trg_args.trg_col_ch_prev_clos] = (
+        (data_frame[trg_args.trg_col_op_price] -
+            data_frame[trg_args.trg_col_ch_prev_clos]
+        ) / data_frame[trg_args.trg_col_ch_prev_clos] * 100
+    )
+    data_frame = data_frame.round(decimals=2)
+    return data_frame[
+        data_frame.date >= extract_date
+    ].reset_index(drop=True)
+
+
+def best_time(function, repeat: int):
+    """Returns the result and the best wall time of several runs."""
+
+    timings = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start)
+
+    return result, min(timings)
+
+
+def main():
+    """Times both transform implementations and compares the reports."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    parser.add_argument('--isins', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    data_frame = make_source_data(args.rows, args.isins)
+    extract_date = '2022-05-09'
+
+    with patch.object(MetaProcess, 'get_date_list',
+            return_value=[extract_date, []]):
+        xetra_etl = XetraETL(MagicMock(), MagicMock(), 'meta.csv',
+            SOURCE_CONFIG, TARGET_CONFIG)
+
+    df_legacy, time_legacy = best_time(
+        lambda: legacy_transform(data_frame.copy(), SOURCE_CONFIG,
+            TARGET_CONFIG, extract_date), args.repeat
+    )
+    df_single, time_single = best_time(
+        lambda: xetra_etl.transform(data_frame.copy()), args.repeat
+    )
+
+    print(f"rows:        {len(data_frame):>12,}")
+    print(f"legacy:      {time_legacy:>12.3f} s")
+    print(f"single-pass: {time_single:>12.3f} s")
+    print(f"speedup:     {time_legacy / time_single:>12.2f} x")
+    print(f"identical:   {df_legacy.equals(df_single)!s:>12}")
+
+    if args.workers > 1:
+        xetra_etl.src_args = SOURCE_CONFIG._replace(
+            src_transform_workers=args.workers, src_transform_shard_rows=0
+        )
+        _, time_start = best_time(
+            lambda: xetra_etl.transform(data_frame.copy()), 1
+        )
+        df_sharded, time_sharded = best_time(
+            lambda: xetra_etl.transform(data_frame.copy()), args.repeat
+        )
+        xetra_etl.close()
+
+        print(f"cpus:        {cpu_count():>12}")
+        print(f"first call:  {time_start:>12.3f} s (starts the pool)")
+        print(f"{args.workers:>2} workers:  {time_sharded:>12.3f} s")
+        print(f"scaling:     {time_single / time_sharded:>12.2f} x")
+        print(f"identical:   {df_single.equals(df_sharded)!s:>12}")
+
+
+if __name__ == '__main__':
+    main()
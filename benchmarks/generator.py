@@ -0,0 +1,174 @@
+"""Generator of synthetic Xetra source files.
+
+The files have the layout of the Deutsche Boerse public data set:
+one csv object per trading hour, keyed by date,
+
+    2022-05-09/2022-05-09_BINS_XETR08.csv
+
+with one row per ISIN and minute in which the ISIN was traded.
+Prices follow a random walk per ISIN, so opening, closing, minimum
+and maximum prices behave like real ones.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from pandas import DataFrame
+
+from xetra.common.constants import MetaProcessFormat
+
+COLUMNS = ['ISIN', 'Mnemonic', 'SecurityDesc', 'SecurityType', 'Currency',
+    'SecurityID', 'Date', 'Time', 'StartPrice', 'MaxPrice', 'MinPrice',
+    'EndPrice', 'TradedVolume', 'NumberOfTrades']
+
+# Trading starts at 08:00 in the time zone of the data set
+FIRST_MINUTE = 8 * 60
+
+
+def trading_dates(start_date: str, days: int, skip_weekends: bool = True):
+    """Returns the dates of the generated trading days.
+
+    parameters
+    ----------
+    start_date : str
+    The first date, in META_DATE_FORMAT
+
+    days : int
+    The number of trading days
+
+    skip_weekends : bool, default True
+    Whether Saturdays and Sundays are skipped
+
+    returns
+    -------
+    dates : list
+    The trading dates, in META_DATE_FORMAT
+    """
+
+    date_format = MetaProcessFormat.META_DATE_FORMAT.value
+    date = datetime.strptime(start_date, date_format).date()
+    dates = []
+
+    while len(dates) < days:
+        if not skip_weekends or date.weekday() < 5:
+            dates.append(date.strftime(date_format))
+        date += timedelta(days=1)
+
+    return dates
+
+
+def generate_day(date: str, isins: int = 3000, minutes_per_day: int = 540,
+        trade_probability: float = 0.25, seed: int = None):
+    """Generates the source files of one trading day.
+
+    parameters
+    ----------
+    date : str
+    The trading date, in META_DATE_FORMAT
+
+    isins : int, default 3000
+    The number of traded ISINs
+
+    minutes_per_day : int, default 540
+    The number of trading minutes, starting at 08:00
+
+    trade_probability : float, default 0.25
+    The probability that an ISIN is traded in a minute
+
+    seed : int, default None
+    Seed of the random numbers (defaults to a random seed)
+
+    returns
+    -------
+    files : dict
+    Pandas dataframes of the source files by object key
+    """
+
+    rng = np.random.default_rng(seed)
+
+    # Random walk of the prices per ISIN and minute
+    base_prices = rng.uniform(1, 500, (isins, 1))
+    returns = rng.normal(0, 0.001, (isins, minutes_per_day))
+    prices = base_prices * np.exp(np.cumsum(returns, axis=1))
+
+    isin_ids, minutes = np.nonzero(
+        rng.random((isins, minutes_per_day)) < trade_probability
+    )
+    start_prices = prices[isin_ids, minutes]
+    end_prices = start_prices * np.exp(rng.normal(0, 0.0005, len(minutes)))
+    spread = np.abs(rng.normal(0, 0.001, len(minutes)))
+    trades = rng.integers(1, 50, len(minutes))
+
+    isin_names = np.char.add('DE000', np.char.zfill(
+        np.arange(isins).astype(str), 7
+    ))
+    mnemonics = np.char.add('X', np.char.zfill(np.arange(isins).astype(str), 4))
+    clock = FIRST_MINUTE + minutes
+
+    data_frame = DataFrame({
+        'ISIN': isin_names[isin_ids],
+        'Mnemonic': mnemonics[isin_ids],
+        'SecurityDesc': np.char.add('SYNTHETIC SECURITY ', isin_names[isin_ids]),
+        'SecurityType': 'Common stock',
+        'Currency': 'EUR',
+        'SecurityID': 2_000_000 + isin_ids,
+        'Date': date,
+        'Time': np.char.add(
+            np.char.add(np.char.zfill((clock // 60).astype(str), 2), ':'),
+            np.char.zfill((clock % 60).astype(str), 2)
+        ),
+        'StartPrice': start_prices.round(2),
+        'MaxPrice': (np.maximum(start_prices, end_prices) * (1 + spread)).round(2),
+        'MinPrice': (np.minimum(start_prices, end_prices) * (1 - spread)).round(2),
+        'EndPrice': end_prices.round(2),
+        'TradedVolume': trades * rng.integers(1, 500, len(minutes)),
+        'NumberOfTrades': trades
+    }, columns=COLUMNS)
+
+    # Rows are ordered by time, like in the data set
+    data_frame = (
+        data_frame.iloc[np.argsort(minutes, kind='stable')]
+        .reset_index(drop=True)
+    )
+    hours = clock[np.argsort(minutes, kind='stable')] // 60
+
+    return {
+        f"{date}/{date}_BINS_XETR{hour:02d}.csv":
+            data_frame[hours == hour].reset_index(drop=True)
+        for hour in np.unique(hours)
+    }
+
+
+def generate_source_files(start_date: str, days: int, isins: int = 3000,
+        minutes_per_day: int = 540, trade_probability: float = 0.25,
+        seed: int = 42):
+    """Generates the source files of several trading days.
+
+    The files are generated day by day, so that only
+    one day is held in memory at a time.
+
+    parameters
+    ----------
+    start_date : str
+    The first date, in META_DATE_FORMAT
+
+    days : int
+    The number of trading days
+
+    isins, minutes_per_day, trade_probability :
+    See generate_day
+
+    seed : int, default 42
+    Seed of the random numbers of the first day
+
+    returns
+    -------
+    files : generator
+    Tuples of the object key and the Pandas dataframe of every file
+    """
+
+    for number, date in enumerate(trading_dates(start_date, days)):
+        files = generate_day(date, isins, minutes_per_day,
+            trade_probability, seed + number)
+
+        yield from files.items()
@@ -0,0 +1,356 @@
+"""End-to-end benchmark suite of the Xetra ETL job.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --days 5 --isins 1000
+    python -m benchmarks.suite --days 5 --isins 1000 --save-baseline
+    python -m benchmarks.suite --days 5 --isins 1000 --check
+    python -m benchmarks.suite --days 5 --isins 1000 --arrow-native
+
+Synthetic source files (see benchmarks.generator) are uploaded to a
+local moto server. Then extract, transform, load and the MetaProcess
+methods are timed one by one. For every stage the suite reports the
+wall time, rows/s, MB/s of the S3 objects read or written, and the peak
+memory traced by tracemalloc. Peak memory is measured in a separate
+run, since tracing slows down the timed runs.
+
+Baselines are stored per scenario in benchmarks/baselines.json.
+A stage that is slower or uses more memory than its baseline by more
+than the tolerance (and more than a small absolute margin) is flagged,
+and --check exits with status 1.
+Baselines are only comparable on the host that recorded them.
+With --arrow-native, the stages run on Arrow tables (src_arrow_native)
+and are stored as a separate scenario. Their peak memory only covers
+Python allocations, since tracemalloc does not see the Arrow memory pool.
+"""
+
+import json
+import socket
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from logging import ERROR, getLogger
+from os import environ, path
+from time import perf_counter
+from unittest.mock import patch
+
+environ.setdefault('AWS_ACCESS_KEY_ID', 'KEY1')
+environ.setdefault('AWS_SECRET_ACCESS_KEY', 'KEY2')
+
+import boto3  # noqa: E402
+from moto.server import ThreadedMotoServer  # noqa: E402
+from yaml import safe_load  # noqa: E402
+
+from benchmarks.generator import (  # noqa: E402
+    generate_source_files, trading_dates
+)
+from xetra.common.constants import MetaProcessFormat  # noqa: E402
+from xetra.common.meta_process import MetaProcess  # noqa: E402
+from xetra.common.s3 import S3BucketConnector  # noqa: E402
+from xetra.transformers.xetra_transformer import (  # noqa: E402
+    XetraETL, XetraSourceConfig, XetraTargetConfig
+)
+
+BASELINE_PATH = path.join(path.dirname(__file__), 'baselines.json')
+CONFIG_PATH = path.join(path.dirname(__file__), '..', 'config',
+    'xetra-config.yml')
+SRC_BUCKET = 'bench-src'
+TRG_BUCKET = 'bench-trg'
+META_KEY = 'meta/report/xetra_report_meta.csv'
+START_DATE = '2022-05-09'
+MIB = 1024 ** 2
+
+
+def load_configs(arrow_native: bool = False):
+    """Returns the source and target config of config/xetra-config.yml.
+
+    The caches that persist across runs are disabled, so that
+    every repetition does the same work.
+    """
+
+    with open(CONFIG_PATH, mode='rt', encoding='utf-8') as config_file:
+        config = safe_load(config_file.read())
+
+    source_config = XetraSourceConfig(**config['source'])._replace(
+        src_first_extract_date=START_DATE,
+        src_day_cache_key=None,
+        src_manifest_key=None,
+        src_arrow_native=arrow_native
+    )
+    target_config = XetraTargetConfig(**config['target'])._replace(
+        trg_state_key=None
+    )
+
+    return source_config, target_config
+
+
+def measure(function, repeat: int):
+    """Runs a stage repeat times, and once more with tracemalloc.
+
+    returns
+    -------
+    result : object
+    The result of the last timed run
+
+    seconds : float
+    The best wall time of the timed runs
+
+    peak_mib : float
+    The peak traced memory of the traced run in MiB
+    """
+
+    timings = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return result, min(timings), peak / MIB
+
+
+def stage_result(seconds: float, peak_mib: float, rows: int, size: int):
+    """Returns the metrics of a stage."""
+
+    return {
+        'seconds': round(seconds, 4),
+        'rows': rows,
+        'rows_per_s': round(rows / seconds),
+        'mb': round(size / MIB, 2),
+        'mb_per_s': round(size / MIB / seconds, 2),
+        'peak_mib': round(peak_mib, 1)
+    }
+
+
+def object_bytes(bucket: S3BucketConnector, prefix: str):
+    """Returns the total size of the objects with the given prefix."""
+
+    return sum(obj['size'] for obj in bucket.list_objects_by_prefix(prefix))
+
+
+def start_server():
+    """Starts a moto server on a free local port.
+
+    The in-process moto mock is not used, since it mixes up
+    the bodies of concurrent requests.
+
+    returns
+    -------
+    server : ThreadedMotoServer
+    The running server
+
+    endpoint_url : str
+    The endpoint url of the server
+    """
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    getLogger('werkzeug').setLevel(ERROR)
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port,
+        verbose=False)
+    server.start()
+
+    return server, f'http://127.0.0.1:{port}'
+
+
+def run_suite(days: int, isins: int, minutes: int, meta_dates: int,
+        repeat: int, arrow_native: bool = False):
+    """Runs all stages against a moto server and returns their metrics."""
+
+    results = {}
+    dates = trading_dates(START_DATE, days)
+    source_config, target_config = load_configs(arrow_native)
+    server, endpoint_url = start_server()
+
+    try:
+        s3 = boto3.resource(service_name='s3', endpoint_url=endpoint_url,
+            region_name='eu-central-1')
+
+        for bucket_name in [SRC_BUCKET, TRG_BUCKET]:
+            s3.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            })
+
+        # Upload the synthetic source files (not timed)
+        source_rows = 0
+        source_bytes = 0
+
+        for key, data_frame in generate_source_files(
+                START_DATE, days, isins, minutes):
+            body = data_frame.to_csv(index=False).encode('utf-8')
+            s3.Bucket(SRC_BUCKET).put_object(Body=body, Key=key)
+            source_rows += len(data_frame)
+            source_bytes += len(body)
+
+        src_bucket = S3BucketConnector(SRC_BUCKET,
+            endpoint_url=endpoint_url)
+        trg_bucket = S3BucketConnector(TRG_BUCKET,
+            endpoint_url=endpoint_url)
+
+        # The report covers the generated dates, independent of today
+        with patch.object(MetaProcess, 'get_date_list',
+                return_value=[dates[1], dates]):
+            xetra_etl = XetraETL(src_bucket, trg_bucket, META_KEY,
+                source_config, target_config)
+
+        if arrow_native:
+            data_frame, seconds, peak = measure(xetra_etl.extract_table,
+                repeat)
+            data_bytes = data_frame.nbytes
+
+            # Arrow tables are immutable and need no copy
+            def transform():
+                return xetra_etl.transform_table(data_frame)
+
+        else:
+            data_frame, seconds, peak = measure(xetra_etl.extract, repeat)
+            data_bytes = int(data_frame.memory_usage(deep=True).sum())
+
+            def transform():
+                return xetra_etl.transform(data_frame.copy())
+
+        results['extract'] = stage_result(seconds, peak, source_rows,
+            source_bytes)
+
+        report, seconds, peak = measure(transform, repeat)
+        results['transform'] = stage_result(seconds, peak, len(data_frame),
+            data_bytes)
+
+        # Repeated loads replace the date partitions; without partitions,
+        # loads within the same second overwrite the same report object
+        _, seconds, peak = measure(lambda: xetra_etl.load(report), repeat)
+
+        if target_config.trg_partition_key:
+            report_bytes = object_bytes(trg_bucket,
+                target_config.trg_partition_key)
+
+        else:
+            reports = trg_bucket.list_objects_by_prefix(target_config.trg_key)
+            report_bytes = sum(obj['size'] for obj in reports) // len(reports)
+
+        results['load'] = stage_result(seconds, peak, len(report),
+            report_bytes)
+
+        # Meta file with meta_dates processed dates up to yesterday
+        date_format = MetaProcessFormat.META_DATE_FORMAT.value
+        today = datetime.today().date()
+        processed = [
+            (today - timedelta(days=day)).strftime(date_format)
+            for day in range(meta_dates, 0, -1)
+        ]
+        s3.Bucket(TRG_BUCKET).Object(META_KEY).delete()
+        MetaProcess.update_meta_file(trg_bucket, processed, META_KEY)
+        meta_bytes = object_bytes(trg_bucket, META_KEY)
+
+        def meta_process():
+            MetaProcess.get_date_list(trg_bucket, processed[0], META_KEY)
+            MetaProcess.update_meta_file(
+                trg_bucket, [today.strftime(date_format)], META_KEY
+            )
+
+        _, seconds, peak = measure(meta_process, repeat)
+        results['meta_process'] = stage_result(seconds, peak, meta_dates,
+            meta_bytes)
+
+    finally:
+        server.stop()
+
+    return results
+
+
+# Differences below these are noise, whatever the relative change
+MIN_DELTAS = {'seconds': 0.05, 'peak_mib': 1.0}
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Returns the regressions of the results against the baseline."""
+
+    regressions = []
+
+    for stage, metrics in results.items():
+        for metric, min_delta in MIN_DELTAS.items():
+            base = baseline.get(stage, {}).get(metric)
+
+            if base and metrics[metric] > max(base * (1 + tolerance),
+                    base + min_delta):
+                regressions.append(
+                    f"{stage} {metric}: {metrics[metric]} "
+                    f"(baseline {base}, +{metrics[metric] / base - 1:.0%})"
+                )
+
+    return regressions
+
+
+def main():
+    """Runs the suite and compares it with the stored baseline."""
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=3)
+    parser.add_argument('--isins', type=int, default=1000)
+    parser.add_argument('--minutes', type=int, default=540)
+    parser.add_argument('--meta-dates', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--baseline-file', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--arrow-native', action='store_true')
+    args = parser.parse_args()
+
+    scenario = (f"days={args.days},isins={args.isins},"
+        f"minutes={args.minutes},meta_dates={args.meta_dates}")
+    if args.arrow_native:
+        scenario += ",arrow_native"
+    results = run_suite(args.days, args.isins, args.minutes,
+        args.meta_dates, args.repeat, args.arrow_native)
+
+    print(f"scenario: {scenario}")
+    print(f"{'stage':<14}{'seconds':>10}{'rows/s':>12}"
+        f"{'MB/s':>10}{'peak MiB':>10}")
+    for stage, metrics in results.items():
+        print(f"{stage:<14}{metrics['seconds']:>10.3f}"
+            f"{metrics['rows_per_s']:>12,}{metrics['mb_per_s']:>10.1f}"
+            f"{metrics['peak_mib']:>10.1f}")
+
+    baselines = {}
+
+    if path.exists(args.baseline_file):
+        with open(args.baseline_file, mode='rt', encoding='utf-8') as file:
+            baselines = json.load(file)
+
+    if args.save_baseline:
+        baselines[scenario] = results
+
+        with open(args.baseline_file, mode='wt', encoding='utf-8') as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+        print(f"Saved the baseline of {scenario}.")
+        return
+
+    if scenario not in baselines:
+        print("No baseline for this scenario.")
+        return
+
+    regressions = compare(results, baselines[scenario], args.tolerance)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    if not regressions:
+        print("No regressions against the baseline.")
+
+    if regressions and args.check:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
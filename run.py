@@ -1,12 +1,20 @@
 """Runs the Xetra ETL application."""
 
+from argparse import ArgumentParser
+from datetime import datetime
 from logging import getLogger
 from logging.config import dictConfig
+from os import environ
 from pydoc import source_synopsis
 
 from yaml import safe_load
 
+from xetra.common.cache import S3ObjectCache
+from xetra.common.constants import MetaProcessFormat
+from xetra.common.meta_process import MetaProcess
+from xetra.common.metrics import JsonLinesSink, PrometheusTextfileSink
 from xetra.common.s3 import S3BucketConnector
+from xetra.transformers.backfill import XetraBackfill
 from xetra.transformers.xetra_transformer import XetraETL, XetraSourceConfig, XetraTargetConfig
 
 
@@ -15,6 +23,14 @@ def main():
 
     logger = getLogger(__name__)
 
+    # Parse the date range of a backfill
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--start-date',
+        help="first date of a backfill, e.g. 2022-01-03")
+    parser.add_argument('--end-date',
+        help="last date of a backfill (inclusive)")
+    args = parser.parse_args()
+
     # Parse the yaml config file
     config_path = './config/xetra-config.yml'
     with open(config_path, mode='rt', encoding='utf-8') as config_file:
@@ -34,33 +50,95 @@ def main():
     # Read meta config
     meta_config = config['meta']
 
-    # Create S3 buckets
-    src_name = 'deutsche-boerse-xetra-pds'
-    trg_name = 'xetra-data-jt'
+    # Create the local cache for the immutable source objects
+    src_cache = None
 
-    src_bucket = S3BucketConnector(bucket_name=src_name,
-        access_key=source_config['access_key'],
-        secret_key=source_config['secret_key'],
-        endpoint_url=source_config['endpoint_url']
-    )
+    if s3_config.get('src_cache_dir'):
+        src_cache = S3ObjectCache(
+            cache_dir=s3_config['src_cache_dir'],
+            max_bytes=s3_config['src_cache_max_bytes']
+        )
 
-    trg_bucket = S3BucketConnector(bucket_name=trg_name,
-        access_key=target_config['access_key'],
-        secret_key=target_config['secret_key'],
-        endpoint_url=target_config['endpoint_url']
+    # Create S3 buckets
+    src_bucket = S3BucketConnector(bucket_name=s3_config['src_bucket'],
+        access_key=environ[s3_config['access_key']],
+        secret_key=environ[s3_config['secret_key']],
+        endpoint_url=s3_config['src_endpoint_url'],
+        cache=src_cache,
+        max_pool_connections=s3_config['max_pool_connections']
     )
 
-    # Create Xetra ETL job
-    logger.info("Preparing to run the Xetra ETL job ...")
-    xetra_etl = XetraETL(
-        src_bucket=src_bucket,
-        trg_bucket=trg_bucket,
-        meta_key=meta_config['meta_key'],
-        src_args=source_config,
-        trg_args=target_config
+    trg_bucket = S3BucketConnector(bucket_name=s3_config['trg_bucket'],
+        access_key=environ[s3_config['access_key']],
+        secret_key=environ[s3_config['secret_key']],
+        endpoint_url=s3_config['trg_endpoint_url'],
+        part_size=s3_config['trg_part_size'],
+        max_upload_workers=s3_config['trg_max_upload_workers'],
+        max_pool_connections=s3_config['max_pool_connections']
     )
 
-    xetra_etl.report()
+    # Sinks of the stage metrics
+    metrics_config = config.get('metrics') or {}
+    metrics_sinks = []
+    if metrics_config.get('jsonl_path'):
+        metrics_sinks.append(JsonLinesSink(metrics_config['jsonl_path']))
+    if metrics_config.get('prometheus_path'):
+        metrics_sinks.append(
+            PrometheusTextfileSink(metrics_config['prometheus_path'])
+        )
+
+    # Backfill the date range in concurrent chunks
+    if args.start_date or args.end_date:
+        backfill_config = config['backfill']
+        logger.info("Preparing to run the Xetra backfill ...")
+        xetra_backfill = XetraBackfill(
+            src_bucket=src_bucket,
+            trg_bucket=trg_bucket,
+            meta_key=meta_config['meta_key'],
+            src_args=source_config,
+            trg_args=target_config,
+            chunk_days=backfill_config['chunk_days'],
+            max_workers=backfill_config['max_workers'],
+            meta_index_key=meta_config.get('meta_index_key'),
+            meta_segment_prefix=meta_config.get('meta_segment_prefix'),
+            metrics_sinks=metrics_sinks
+        )
+        xetra_backfill.run(
+            args.start_date or source_config.src_first_extract_date,
+            args.end_date or datetime.today().strftime(
+                MetaProcessFormat.META_DATE_FORMAT.value
+            )
+        )
+
+    else:
+        # Create Xetra ETL job
+        logger.info("Preparing to run the Xetra ETL job ...")
+        xetra_etl = XetraETL(
+            src_bucket=src_bucket,
+            trg_bucket=trg_bucket,
+            meta_key=meta_config['meta_key'],
+            src_args=source_config,
+            trg_args=target_config,
+            meta_index_key=meta_config.get('meta_index_key'),
+            meta_segment_prefix=meta_config.get('meta_segment_prefix'),
+            metrics_sinks=metrics_sinks
+        )
+
+        xetra_etl.report()
+
+    # Merge the meta segments once enough of them have accumulated
+    if meta_config.get('meta_segment_prefix'):
+        MetaProcess.compact_meta_file(
+            bucket=trg_bucket,
+            meta_key=meta_config['meta_key'],
+            segment_prefix=meta_config['meta_segment_prefix'],
+            index_key=meta_config.get('meta_index_key'),
+            min_segments=meta_config['meta_compact_min_segments']
+        )
+
+    if src_cache is not None:
+        logger.info("Source object cache: %s", src_cache.stats())
+
     logger.info("Finished the Xetra ETL job!")
 
 
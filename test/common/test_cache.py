@@ -0,0 +1,92 @@
+"""Test S3ObjectCache methods."""
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from xetra.common.cache import S3ObjectCache
+
+
+class TestS3ObjectCacheMethods(unittest.TestCase):
+    """Testing the S3ObjectCache class."""
+
+    def setUp(self):
+        """Setting up the environment."""
+
+        self.cache_dir = TemporaryDirectory()
+        self.cache = S3ObjectCache(self.cache_dir.name, max_bytes=10)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+
+        self.cache_dir.cleanup()
+
+    def test_get_miss(self):
+        """Test the get method for an object that is not cached."""
+
+        # Method execution
+        result = self.cache.get('bucket', 'key.csv', '"etag1"')
+
+        # Test after method execution
+        self.assertIsNone(result)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+
+    def test_put_get_hit(self):
+        """Test the get method for a cached object."""
+
+        # Expected results
+        body_exp = b'col1\n1'
+
+        # Method execution
+        self.cache.put('bucket', 'key.csv', '"etag1"', body_exp)
+        result = self.cache.get('bucket', 'key.csv', '"etag1"')
+
+        # Test after method execution
+        self.assertEqual(body_exp, result)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['size_bytes'], len(body_exp))
+
+    def test_get_changed_etag(self):
+        """Test the get method for an object with a new ETag."""
+
+        # Method execution
+        self.cache.put('bucket', 'key.csv', '"etag1"', b'old')
+        result = self.cache.get('bucket', 'key.csv', '"etag2"')
+
+        # Test after method execution
+        self.assertIsNone(result)
+
+    def test_put_lru_eviction(self):
+        """Test the put method evicting
+        the least recently used object."""
+
+        # Method execution
+        self.cache.put('bucket', 'a.csv', '"a"', b'aaaa')
+        self.cache.put('bucket', 'b.csv', '"b"', b'bbbb')
+        self.cache.get('bucket', 'a.csv', '"a"')
+        self.cache.put('bucket', 'c.csv', '"c"', b'cccc')
+
+        # Test after method execution
+        self.assertEqual(self.cache.get('bucket', 'a.csv', '"a"'), b'aaaa')
+        self.assertIsNone(self.cache.get('bucket', 'b.csv', '"b"'))
+        self.assertEqual(self.cache.get('bucket', 'c.csv', '"c"'), b'cccc')
+        self.assertEqual(self.cache.stats()['size_bytes'], 8)
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 2)
+
+    def test_init_restore(self):
+        """Test restoring the cache entries of an earlier run."""
+
+        # Test init
+        self.cache.put('bucket', 'a.csv', '"a"', b'aaaa')
+
+        # Method execution
+        cache = S3ObjectCache(self.cache_dir.name, max_bytes=10)
+
+        # Test after method execution
+        self.assertEqual(cache.get('bucket', 'a.csv', '"a"'), b'aaaa')
+        self.assertEqual(cache.stats()['objects'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""TestSourceManifestMethods."""
+import os
+import unittest
+from datetime import datetime
+
+import boto3
+from moto import mock_s3
+
+from xetra.common.s3 import S3BucketConnector
+from xetra.common.manifest import SourceManifest
+from xetra.common.constants import MetaProcessFormat
+from xetra.common.custom_exceptions import WrongMetaFileException
+
+
+class TestSourceManifestMethods(unittest.TestCase):
+    """Testing the SourceManifest class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # mock s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # Define the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.us-west-2.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+        self.manifest_key = 'manifest/source_listing.csv'
+
+        # Create s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create a bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'us-west-2'
+        }
+        )
+        self.s3_bucket = self.s3.Bucket(self.s3_bucket_name)
+
+        # Create a S3BucketConnector instance
+        self.s3_bucket_manifest = S3BucketConnector(
+            self.s3_bucket_name,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+        self.objects = [
+            {'key': '2021-04-16/file1.csv', 'size': 10, 'etag': '"etag1"'},
+            {'key': '2021-04-16/file2.csv', 'size': 20, 'etag': '"etag2"'}
+        ]
+
+    def tearDown(self):
+        """Clean up the test environment."""
+
+        # Mock s3 connection stop
+        self.mock_s3.stop()
+
+    def test_objects_no_manifest(self):
+        """Test the objects method when there is no manifest."""
+
+        # Method execution
+        manifest = SourceManifest(self.s3_bucket_manifest, self.manifest_key)
+
+        # Test after method execution
+        self.assertIsNone(manifest.objects('2021-04-16'))
+        self.assertEqual(manifest.dates(), set())
+
+    def test_add_ok(self):
+        """Test the add method storing finalised dates
+        and reading them back in a new manifest object."""
+
+        # Expected results
+        today = datetime.today().strftime(
+            MetaProcessFormat.META_DATE_FORMAT.value
+        )
+
+        # Method execution
+        result = SourceManifest(
+            self.s3_bucket_manifest, self.manifest_key
+        ).add({
+            '2021-04-16': self.objects,
+            '2021-04-17': [],
+            today: [{'key': f'{today}/file.csv', 'size': 1, 'etag': '"e"'}]
+        })
+        manifest = SourceManifest(self.s3_bucket_manifest, self.manifest_key)
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(manifest.dates(), {'2021-04-16', '2021-04-17'})
+        self.assertEqual(manifest.objects('2021-04-16'), self.objects)
+        self.assertEqual(manifest.objects('2021-04-17'), [])
+        self.assertIsNone(manifest.objects(today))
+
+    def test_add_known_dates(self):
+        """Test the add method for dates that are already stored."""
+
+        # Test init
+        manifest = SourceManifest(self.s3_bucket_manifest, self.manifest_key)
+        manifest.add({'2021-04-16': self.objects})
+
+        # Method execution
+        result = manifest.add({'2021-04-16': self.objects[:1]})
+
+        # Test after method execution
+        self.assertFalse(result)
+        self.assertEqual(manifest.objects('2021-04-16'), self.objects)
+
+    def test_objects_wrong_manifest(self):
+        """Test the objects method when the manifest
+        has the wrong format."""
+
+        # Test init
+        self.s3_bucket.put_object(Body='col1,col2\na,b', Key=self.manifest_key)
+        manifest = SourceManifest(self.s3_bucket_manifest, self.manifest_key)
+
+        # Method execution
+        with self.assertRaises(WrongMetaFileException):
+            manifest.objects('2021-04-16')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""TestMetaDateIndexMethods."""
+import os
+import unittest
+from datetime import date
+
+import boto3
+from moto import mock_s3
+
+from xetra.common.s3 import S3BucketConnector
+from xetra.common.meta_index import MetaDateIndex
+
+
+class TestMetaDateIndexMethods(unittest.TestCase):
+    """Testing the MetaDateIndex class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # mock s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # Define the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.us-west-2.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+
+        # Create s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create a bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'us-west-2'
+        }
+        )
+
+        # Create a S3BucketConnector instance
+        self.s3_bucket_meta = S3BucketConnector(
+            self.s3_bucket_name,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+        self.index = MetaDateIndex.from_dates([
+            '2021-04-19', '2021-04-17', '2021-04-18', '2021-04-21',
+            '2021-04-18'
+        ])
+
+    def tearDown(self):
+        """Clean up the test environment."""
+
+        # Mock s3 connection stop
+        self.mock_s3.stop()
+
+    def test_from_dates(self):
+        """Test the from_dates method sorting
+        and deduplicating the dates."""
+
+        # Test after method execution
+        self.assertEqual(len(self.index), 4)
+        self.assertIn(date(2021, 4, 18), self.index)
+        self.assertNotIn(date(2021, 4, 20), self.index)
+
+    def test_first_missing(self):
+        """Test the first_missing method for gaps,
+        unprocessed and fully processed start dates."""
+
+        # Test after method execution
+        self.assertEqual(
+            self.index.first_missing(date(2021, 4, 17)), date(2021, 4, 20)
+        )
+        self.assertEqual(
+            self.index.first_missing(date(2021, 4, 16)), date(2021, 4, 16)
+        )
+        self.assertEqual(
+            self.index.first_missing(date(2021, 4, 21)), date(2021, 4, 22)
+        )
+        self.assertEqual(
+            MetaDateIndex().first_missing(date(2021, 4, 21)), date(2021, 4, 21)
+        )
+
+    def test_first_missing_long_history(self):
+        """Test the first_missing method on years of processed dates."""
+
+        # Test init
+        index = MetaDateIndex.from_dates(
+            [date.fromordinal(day) for day in range(730000, 733000)
+                if day != 732500]
+        )
+
+        # Method execution
+        result = index.first_missing(date.fromordinal(730100))
+
+        # Test after method execution
+        self.assertEqual(result, date.fromordinal(732500))
+
+    def test_dates_between(self):
+        """Test the dates_between method."""
+
+        # Method execution
+        result = self.index.dates_between(date(2021, 4, 18), date(2021, 4, 20))
+
+        # Test after method execution
+        self.assertEqual(result, [date(2021, 4, 18), date(2021, 4, 19)])
+
+    def test_write_read(self):
+        """Test writing and reading the index object."""
+
+        # Method execution
+        self.index.add(['2021-04-20']).write(self.s3_bucket_meta, 'index.parquet')
+        result = MetaDateIndex.read(self.s3_bucket_meta, 'index.parquet')
+
+        # Test after method execution
+        self.assertEqual(
+            result.dates_between(date(2021, 4, 1), date(2021, 4, 30)),
+            [date(2021, 4, day) for day in range(17, 22)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
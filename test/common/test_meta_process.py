@@ -1,6 +1,7 @@
 """TestMetaProcessMethods."""
 import os
 import unittest
+from unittest.mock import patch
 from io import StringIO
 from datetime import datetime, timedelta
 
@@ -264,6 +265,25 @@ class TestMetaProcessMethods(unittest.TestCase):
         self.assertEqual(set(date_list_exp), set(date_list_result))
         self.assertEqual(min_date_exp, min_date_result)
 
+    def test_get_date_range(self):
+        """Tests the get_date_range method starting
+        at the previous weekday."""
+
+        # Expected results
+        date_list_exp = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19', '2021-04-20'
+        ]
+        min_date_exp = '2021-04-19'
+
+        # Method execution
+        min_date_result, date_list_result = MetaProcess.get_date_range(
+            '2021-04-19', '2021-04-20'
+        )
+
+        # Test after method execution
+        self.assertEqual(date_list_exp, date_list_result)
+        self.assertEqual(min_date_exp, min_date_result)
+
     def test_get_date_list_meta_file_ok(self):
         """Tests the get_date_list method
         when there is a meta file"""
@@ -402,6 +422,174 @@ class TestMetaProcessMethods(unittest.TestCase):
             }
         )
 
+    def test_get_date_list_meta_index(self):
+        """Tests the get_date_list method creating the date index
+        from the meta file and answering from the index."""
+
+        # Test init
+        meta_key = 'meta.csv'
+        index_key = 'meta_index.parquet'
+        meta_content = (
+          f"{MetaProcessFormat.META_SOURCE_DATE_COL.value},"
+          f"{MetaProcessFormat.META_PROCESS_COL.value}\n"
+          f"{self.dates[3]},{self.dates[0]}\n"
+          f"{self.dates[4]},{self.dates[0]}"
+        )
+        self.s3_bucket.put_object(Body=meta_content, Key=meta_key)
+        first_date_list = [
+          self.dates[0],
+          self.dates[1],
+          self.dates[4],
+          self.dates[7]
+        ]
+
+        # Method execution
+        for first_date in first_date_list:
+            result_exp = MetaProcess.get_date_list(
+                self.s3_bucket_meta, first_date, meta_key
+            )
+            result = MetaProcess.get_date_list(
+                self.s3_bucket_meta, first_date, meta_key, index_key
+            )
+
+            # Test after method execution
+            self.assertEqual(result_exp, result)
+
+        self.assertEqual(
+            self.s3_bucket_meta.list_files_by_prefix(index_key), [index_key]
+        )
+
+    def test_update_meta_file_meta_index(self):
+        """Tests the update_meta_file method
+        updating the date index."""
+
+        # Expected results
+        min_date_exp = '2500-01-01'
+        date_list_exp = []
+
+        # Test init
+        meta_key = 'meta.csv'
+        index_key = 'meta_index.parquet'
+
+        # Method execution
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, self.dates[:2], meta_key, index_key
+        )
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, self.dates[2:4], meta_key, index_key
+        )
+
+        with patch.object(self.s3_bucket_meta, 'read_csv_to_df') as read_meta:
+            min_date_result, date_list_result = MetaProcess.get_date_list(
+                self.s3_bucket_meta, self.dates[3], meta_key, index_key
+            )
+
+        # Test after method execution
+        read_meta.assert_not_called()
+        self.assertEqual(date_list_exp, date_list_result)
+        self.assertEqual(min_date_exp, min_date_result)
+
+    def test_update_meta_file_segments(self):
+        """Tests the update_meta_file method writing
+        segments instead of rewriting the meta file."""
+
+        # Expected results
+        min_date_exp = '2500-01-01'
+        date_list_exp = []
+
+        # Test init
+        meta_key = 'meta.csv'
+        segment_prefix = 'segments/'
+
+        # Method execution
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, self.dates[:2], meta_key,
+            segment_prefix=segment_prefix
+        )
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, self.dates[2:4], meta_key,
+            segment_prefix=segment_prefix
+        )
+        min_date_result, date_list_result = MetaProcess.get_date_list(
+            self.s3_bucket_meta, self.dates[3], meta_key,
+            segment_prefix=segment_prefix
+        )
+
+        # Test after method execution
+        self.assertEqual(
+            len(self.s3_bucket_meta.list_files_by_prefix(segment_prefix)), 2
+        )
+        self.assertEqual(self.s3_bucket_meta.list_files_by_prefix(meta_key), [])
+        self.assertEqual(date_list_exp, date_list_result)
+        self.assertEqual(min_date_exp, min_date_result)
+
+    def test_compact_meta_file_ok(self):
+        """Tests the compact_meta_file method merging
+        the segments into the meta file and the index."""
+
+        # Expected results
+        dates_exp = [self.dates[4], self.dates[2], self.dates[1]]
+
+        # Test init
+        meta_key = 'meta.csv'
+        index_key = 'meta_index.parquet'
+        segment_prefix = 'segments/'
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, dates_exp[:1], meta_key, index_key
+        )
+        for date in dates_exp[1:]:
+            MetaProcess.update_meta_file(
+                self.s3_bucket_meta, [date], meta_key, index_key,
+                segment_prefix
+            )
+        date_list_exp = MetaProcess.get_date_list(
+            self.s3_bucket_meta, self.dates[4], meta_key, index_key,
+            segment_prefix
+        )
+
+        # Method execution
+        result = MetaProcess.compact_meta_file(
+            self.s3_bucket_meta, meta_key, segment_prefix, index_key
+        )
+
+        # Test after method execution
+        df_meta = self.s3_bucket_meta.read_csv_to_df(meta_key)
+        self.assertTrue(result)
+        self.assertEqual(
+            list(df_meta[MetaProcessFormat.META_SOURCE_DATE_COL.value]),
+            dates_exp
+        )
+        self.assertEqual(
+            self.s3_bucket_meta.list_files_by_prefix(segment_prefix), []
+        )
+        self.assertEqual(
+            date_list_exp,
+            MetaProcess.get_date_list(
+                self.s3_bucket_meta, self.dates[4], meta_key, index_key
+            )
+        )
+
+    def test_compact_meta_file_min_segments(self):
+        """Tests the compact_meta_file method
+        when there are too few segments."""
+
+        # Test init
+        meta_key = 'meta.csv'
+        segment_prefix = 'segments/'
+        MetaProcess.update_meta_file(
+            self.s3_bucket_meta, self.dates[:1], meta_key,
+            segment_prefix=segment_prefix
+        )
+
+        # Method execution
+        result = MetaProcess.compact_meta_file(
+            self.s3_bucket_meta, meta_key, segment_prefix, min_segments=2
+        )
+
+        # Test after method execution
+        self.assertFalse(result)
+        self.assertEqual(self.s3_bucket_meta.list_files_by_prefix(meta_key), [])
+
 
 if __name__ == '__main__':
     unittest.main()
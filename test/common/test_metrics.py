@@ -0,0 +1,194 @@
+"""TestMetricsMethods."""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from importlib.util import module_from_spec, spec_from_file_location
+from unittest.mock import patch
+
+import boto3
+from moto import mock_s3
+from pandas import DataFrame
+
+from xetra.common import metrics as metrics_module
+from xetra.common.metrics import (
+    JsonLinesSink, PrometheusTextfileSink, ReportMetrics
+)
+from xetra.common.s3 import S3BucketConnector
+
+
+class TestMetricsMethods(unittest.TestCase):
+    """Testing the ReportMetrics class and the sinks."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # mock s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # Define the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.us-west-2.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+
+        # Create s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create a bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'us-west-2'
+        }
+        )
+
+        # Create a S3BucketConnector instance
+        self.s3_bucket_conn = S3BucketConnector(
+            self.s3_bucket_name,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up the test environment."""
+
+        # Mock s3 connection stop
+        self.mock_s3.stop()
+        self.tmp_dir.cleanup()
+
+    def test_stage_s3_requests(self):
+        """Test the stage method counting the S3 requests
+        and bytes of every stage separately."""
+
+        # Test init
+        df_test = DataFrame({'col1': ['A', 'B'], 'col2': [1, 2]})
+        key = 'test.csv'
+        metrics = ReportMetrics()
+
+        # Method execution
+        with metrics.stage('write') as stage:
+            self.s3_bucket_conn.write_df_to_s3(key, df_test, 'csv')
+            stage.rows_out = len(df_test)
+        with metrics.stage('read') as stage:
+            df_result = self.s3_bucket_conn.read_csv_to_df(key)
+            stage.rows_out = len(df_result)
+
+        # Test after method execution
+        size = self.s3.Object(self.s3_bucket_name, key).content_length
+        write, read = metrics.stages
+        self.assertEqual(write.name, 'write')
+        self.assertEqual(write.rows_out, 2)
+        self.assertEqual(write.objects_written, 1)
+        self.assertEqual(write.bytes_written, size)
+        self.assertEqual(write.objects_read, 0)
+        self.assertEqual(write.s3_calls, {'PutObject': 1})
+        self.assertEqual(read.objects_read, 1)
+        self.assertEqual(read.bytes_read, size)
+        self.assertEqual(read.objects_written, 0)
+        self.assertEqual(read.s3_calls, {'GetObject': 1})
+        self.assertEqual(set(read.s3_latency), {'GetObject'})
+        self.assertGreater(read.seconds, 0)
+        self.assertGreater(read.peak_rss_mb, 0)
+
+    def test_stage_exception(self):
+        """Test the stage method recording a failing stage."""
+
+        # Test init
+        metrics = ReportMetrics()
+
+        # Method execution
+        with self.assertRaises(ValueError):
+            with metrics.stage('extract'):
+                raise ValueError
+
+        # Test after method execution
+        self.assertEqual([stage.name for stage in metrics.stages], ['extract'])
+        self.assertFalse(metrics)
+
+    def test_stage_without_resource(self):
+        """Test the stage method on a platform without
+        the resource module, e.g. Windows."""
+
+        # Test init
+        path = os.path.join(self.tmp_dir.name, 'xetra.prom')
+        spec = spec_from_file_location(
+            'metrics_without_resource', metrics_module.__file__
+        )
+        module = module_from_spec(spec)
+        with patch.dict(sys.modules, {'resource': None}):
+            spec.loader.exec_module(module)
+        metrics = module.ReportMetrics()
+
+        # Method execution
+        with metrics.stage('extract') as stage:
+            stage.rows_out = 10
+        module.PrometheusTextfileSink(path).emit(metrics)
+
+        # Test after method execution
+        self.assertIsNone(module.getrusage)
+        self.assertIsNone(metrics.stages[0].peak_rss_mb)
+        with open(path, mode='rt', encoding='utf-8') as sink_file:
+            lines = sink_file.read().splitlines()
+        self.assertIn('xetra_etl_stage_rows_out{stage="extract"} 10', lines)
+        self.assertFalse(any(
+            line.startswith('xetra_etl_stage_peak_rss_megabytes{')
+            for line in lines
+        ))
+
+    def test_json_lines_sink(self):
+        """Test the JsonLinesSink appending one line per stage."""
+
+        # Test init
+        path = os.path.join(self.tmp_dir.name, 'logs', 'metrics.jsonl')
+        sink = JsonLinesSink(path)
+        metrics = ReportMetrics()
+        with metrics.stage('extract') as stage:
+            stage.rows_out = 10
+        with metrics.stage('load') as stage:
+            stage.rows_in = 10
+        metrics.is_successful = True
+
+        # Method execution
+        sink.emit(metrics)
+        sink.emit(ReportMetrics())
+
+        # Test after method execution
+        with open(path, mode='rt', encoding='utf-8') as sink_file:
+            lines = [json.loads(line) for line in sink_file]
+        self.assertEqual([line['name'] for line in lines], ['extract', 'load'])
+        self.assertEqual(lines[0]['rows_out'], 10)
+        self.assertEqual(lines[0]['run_id'], metrics.run_id)
+        self.assertTrue(lines[1]['is_successful'])
+
+    def test_prometheus_textfile_sink(self):
+        """Test the PrometheusTextfileSink replacing the textfile."""
+
+        # Test init
+        path = os.path.join(self.tmp_dir.name, 'xetra.prom')
+        sink = PrometheusTextfileSink(path)
+        metrics = ReportMetrics()
+        with metrics.stage('load') as stage:
+            stage.rows_in = 10
+        metrics.is_successful = True
+
+        # Method execution
+        sink.emit(ReportMetrics())
+        sink.emit(metrics)
+
+        # Test after method execution
+        with open(path, mode='rt', encoding='utf-8') as sink_file:
+            lines = sink_file.read().splitlines()
+        self.assertIn('xetra_etl_success 1', lines)
+        self.assertIn('xetra_etl_stage_rows_in{stage="load"} 10', lines)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['xetra.prom'])
+
+
+if __name__ == '__main__':
+    unittest.main()
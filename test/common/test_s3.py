@@ -4,12 +4,19 @@ import os
 import unittest
 import sys
 from io import StringIO, BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 import boto3
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from moto import mock_s3
 
-from xetra.common.s3 import S3BucketConnector
+from xetra.common.cache import S3ObjectCache
+from xetra.common.metrics import S3_CALLS
+from xetra.common.s3 import PARQUET_FOOTER_BYTES, S3BucketConnector
+from xetra.common.s3_client import clear_s3_clients
 from xetra.common.custom_exceptions import WrongFormatException
 
 
@@ -156,6 +163,407 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
             }
         )
 
+    def test_read_csv_to_df_projection(self):
+        """Test the read_csv_to_df method with
+        a column projection and data types."""
+
+        # Expected results
+        key_exp = 'test.csv'
+
+        # Init test
+        csv_content = "col1,col2,col3\nA,2,3.5\nB,4,5.5"
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+
+        # Method execution
+        df_result = self.s3_bucket_conn.read_csv_to_df(
+            key=key_exp, columns=['col1', 'col3'],
+            dtype={'col1': 'category', 'col3': 'float32'}
+        )
+
+        # Test after method execution
+        self.assertEqual(list(df_result.columns), ['col1', 'col3'])
+        self.assertEqual(df_result['col1'].dtype, 'category')
+        self.assertEqual(df_result['col3'].dtype, 'float32')
+        self.assertEqual(list(df_result['col1']), ['A', 'B'])
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_csv_to_df_pyarrow(self):
+        """Test the read_csv_to_df method with the pyarrow
+        engine against the results of the c engine."""
+
+        # Expected results
+        key_exp = 'test.csv'
+
+        # Init test
+        csv_content = (
+            "ISIN,Date,Time,StartPrice,TradedVolume\n"
+            "AT0000A0E9W5,2021-04-15,12:00,20.19,877\n"
+            "DE0000A0E9W5,2021-04-15,12:01,20.5,87"
+        )
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+        columns = ['ISIN', 'Date', 'Time', 'StartPrice']
+        dtype = {'ISIN': 'category', 'Date': 'category',
+            'StartPrice': 'float64'}
+
+        # Method execution
+        df_c = self.s3_bucket_conn.read_csv_to_df(
+            key=key_exp, columns=columns, dtype=dtype
+        )
+        df_result = self.s3_bucket_conn.read_csv_to_df(
+            key=key_exp, columns=columns, dtype=dtype, engine='pyarrow'
+        )
+
+        # Test after method execution
+        self.assertTrue(df_c.equals(df_result))
+        self.assertEqual(df_result['ISIN'].dtype, 'category')
+        self.assertEqual(list(df_result['Time']), ['12:00', '12:01'])
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_csv_to_df_pyarrow_category_order(self):
+        """Test the read_csv_to_df method with the pyarrow engine
+        sorting the categories like the c engine, when the values
+        do not appear in sorted order."""
+
+        # Expected results
+        key_exp = 'test.csv'
+        categories_exp = ['08:01', '08:05']
+        start_prices_exp = [11.0, 12.0, 10.0]
+
+        # Init test
+        csv_content = (
+            "ISIN,Time,StartPrice\n"
+            "A,08:05,12.0\n"
+            "B,08:01,11.0\n"
+            "B,08:05,10.0"
+        )
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+        dtype = {'ISIN': 'category', 'Time': 'category'}
+
+        # Method execution
+        df_c = self.s3_bucket_conn.read_csv_to_df(key=key_exp, dtype=dtype)
+        df_result = self.s3_bucket_conn.read_csv_to_df(
+            key=key_exp, dtype=dtype, engine='pyarrow'
+        )
+
+        # Test after method execution
+        self.assertEqual(
+            list(df_result['Time'].cat.categories), categories_exp
+        )
+        self.assertEqual(
+            list(df_c['Time'].cat.categories), categories_exp
+        )
+        df_sorted_c = df_c.sort_values(by=['Time'], kind='stable')
+        df_sorted = df_result.sort_values(by=['Time'], kind='stable')
+        self.assertEqual(list(df_sorted['StartPrice']), start_prices_exp)
+        self.assertTrue(df_sorted_c.equals(df_sorted))
+
+    def test_read_csv_to_table_ok(self):
+        """Test the read_csv_to_table method
+        reading a csv file to an Arrow table."""
+
+        # Expected results
+        key_exp = 'test.csv'
+
+        # Init test
+        csv_content = "col1,col2,col3\nA,2021-04-15,3.5\nB,2021-04-16,5.5"
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+
+        # Method execution
+        table_result = self.s3_bucket_conn.read_csv_to_table(
+            key=key_exp, columns=['col2', 'col3']
+        )
+
+        # Test after method execution
+        self.assertEqual(table_result.column_names, ['col2', 'col3'])
+        self.assertEqual(str(table_result.schema.field('col2').type), 'string')
+        self.assertEqual(table_result.column('col3').to_pylist(), [3.5, 5.5])
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_csv_to_df_cached(self):
+        """Test the read_csv_to_df method reading
+        a listed object from the local cache."""
+
+        # Expected results
+        key_exp = 'prefix/test.csv'
+
+        # Init test
+        self.s3_bucket.put_object(Body="col1,col2\n1,2", Key=key_exp)
+
+        with TemporaryDirectory() as cache_dir:
+            cache = S3ObjectCache(cache_dir)
+            s3_bucket_conn = S3BucketConnector(
+                bucket_name=self.s3_bucket_name,
+                access_key=self.s3_access_key,
+                secret_key=self.s3_secret_key,
+                endpoint_url=self.s3_endpoint_url,
+                cache=cache
+            )
+
+            # Method execution
+            s3_bucket_conn.list_files_by_prefix('prefix/')
+            df_first = s3_bucket_conn.read_csv_to_df(key_exp)
+
+            with patch.object(s3_bucket_conn._client,
+                    'get_object') as get_obj:
+                df_second = s3_bucket_conn.read_csv_to_df(key_exp)
+
+            # Test after method execution
+            get_obj.assert_not_called()
+            self.assertTrue(df_first.equals(df_second))
+            self.assertEqual(cache.stats()['hits'], 1)
+            self.assertEqual(cache.stats()['misses'], 1)
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_parquet_to_df_ok(self):
+        """Test the read_parquet_to_df method for
+        reading selected columns of 1 parquet file."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame(
+            data=[
+                [1, 2],
+                [3, 4]
+            ],
+            columns=['col1', 'col2']
+        )
+
+        # Init test
+        self.s3_bucket.put_object(
+            Body=df_exp.to_parquet(index=False), Key=key_exp
+        )
+
+        # Method execution
+        df_result = self.s3_bucket_conn.read_parquet_to_df(
+            key=key_exp, columns=['col2']
+        )
+
+        # Test after method execution
+        self.assertTrue(df_exp[['col2']].equals(df_result))
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_parquet_to_table_ok(self):
+        """Test the read_parquet_to_table method for
+        reading selected columns of 1 parquet file."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame(
+            data=[
+                [1, 2],
+                [3, 4]
+            ],
+            columns=['col1', 'col2']
+        )
+
+        # Init test
+        self.s3_bucket.put_object(
+            Body=df_exp.to_parquet(index=False), Key=key_exp
+        )
+
+        # Method execution
+        table_result = self.s3_bucket_conn.read_parquet_to_table(
+            key=key_exp, columns=['col2']
+        )
+
+        # Test after method execution
+        self.assertIsInstance(table_result, pa.Table)
+        self.assertTrue(df_exp[['col2']].equals(table_result.to_pandas()))
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': key_exp
+                            }
+                        ]
+            }
+        )
+
+    def test_read_parquet_ranged(self):
+        """Test the read_parquet_to_table and read_parquet_to_df methods
+        downloading only the footer and the needed column chunks."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        rows = 10_000
+        df_source = pd.DataFrame({
+            'isin': [f'DE{number:010d}' for number in range(rows)],
+            'payload': [f'{number * 7919 % 10 ** 9:032x}' for number in range(rows)],
+            'price': [number / 100 for number in range(rows)]
+        })
+        df_exp = df_source.loc[df_source['isin'] < 'DE0000002500', ['price']]
+
+        # Init test
+        self.s3_bucket_conn.write_df_to_s3(
+            key_exp, df_source, 'parquet', row_group_size=2500
+        )
+        size = self.s3_bucket.Object(key=key_exp).content_length
+
+        # Method execution
+        calls, _, totals = S3_CALLS.snapshot()
+        table_result = self.s3_bucket_conn.read_parquet_to_table(
+            key_exp, columns=['price'], filters=[('isin', '<', 'DE0000002500')]
+        )
+        calls_end, _, totals_end = S3_CALLS.snapshot()
+        df_result = self.s3_bucket_conn.read_parquet_to_df(
+            key_exp, columns=['price'], filters=[('isin', '<', 'DE0000002500')]
+        )
+
+        # Test after method execution
+        self.assertGreater(size, PARQUET_FOOTER_BYTES)
+        self.assertTrue(df_exp.equals(table_result.to_pandas()))
+        self.assertTrue(df_exp.equals(df_result))
+        # The footer, then the isin and the price chunk of the first
+        # row group, which are not coalesced across the payload chunk
+        self.assertEqual(calls_end['GetObject'] - calls['GetObject'], 3)
+        self.assertLess(totals_end['bytes_read'] - totals['bytes_read'],
+            size // 2)
+
+    def test_read_parquet_ranged_small(self):
+        """Test the read_parquet_to_table method reading a small
+        object completely with the footer request."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame({'col1': [1, 3], 'col2': [2, 4]})
+
+        # Init test
+        self.s3_bucket.put_object(
+            Body=df_exp.to_parquet(index=False), Key=key_exp
+        )
+
+        # Method execution
+        calls, _, _ = S3_CALLS.snapshot()
+        table_result = self.s3_bucket_conn.read_parquet_to_table(
+            key_exp, columns=['col2']
+        )
+        calls_end, _, _ = S3_CALLS.snapshot()
+
+        # Test after method execution
+        self.assertTrue(df_exp[['col2']].equals(table_result.to_pandas()))
+        self.assertEqual(calls_end['GetObject'] - calls['GetObject'], 1)
+
+    def test_write_table_to_s3(self):
+        """Test the write_table_to_s3 method
+        with a csv, a parquet and an empty table."""
+
+        # Expected results
+        df_exp = pd.DataFrame(
+            data=[
+                ['A', 2],
+                ['B, C', 4]
+            ],
+            columns=['col1', 'col2']
+        )
+        table = pa.Table.from_pandas(df_exp, preserve_index=False)
+
+        # Method execution
+        result_csv = self.s3_bucket_conn.write_table_to_s3(
+            'test.csv', table, 'csv'
+        )
+        result_parquet = self.s3_bucket_conn.write_table_to_s3(
+            'test.parquet', table, 'parquet', row_group_size=1
+        )
+        result_empty = self.s3_bucket_conn.write_table_to_s3(
+            'empty.parquet', table.slice(0, 0)
+        )
+
+        # Test after method execution
+        self.assertTrue(result_csv)
+        self.assertTrue(result_parquet)
+        self.assertFalse(result_empty)
+        data = self.s3_bucket.Object(key='test.csv').get().get('Body').read()
+        self.assertTrue(df_exp.equals(pd.read_csv(BytesIO(data))))
+        data = self.s3_bucket.Object(key='test.parquet').get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        self.assertEqual(parquet_file.num_row_groups, 2)
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+        self.assertEqual(
+            self.s3_bucket_conn.list_files_by_prefix('empty'), []
+        )
+        with self.assertRaises(WrongFormatException):
+            self.s3_bucket_conn.write_table_to_s3('test.xlsx', table, 'xlsx')
+
+    def test_delete_objects_ok(self):
+        """Test the delete_objects method."""
+
+        # Test init
+        keys = [f'prefix/test{number}.csv' for number in range(3)]
+        for key in keys:
+            self.s3_bucket.put_object(Body="col1\n1", Key=key)
+
+        # Method execution
+        result = self.s3_bucket_conn.delete_objects(keys[:2])
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(
+            self.s3_bucket_conn.list_files_by_prefix('prefix/'), keys[2:]
+        )
+
+        # Clean up
+        self.s3_bucket.delete_objects(
+            Delete={
+                        'Objects': [
+                            {
+                                'Key': keys[2]
+                            }
+                        ]
+            }
+        )
+
     def test_write_df_to_s3_empty(self):
         """Test the write_df_to_s3 method
         in the case of n empty dataframe."""
@@ -283,6 +691,168 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
             }
         )
 
+    def test_open_object_ranges(self):
+        """Test the open_object method reading
+        byte ranges of an object."""
+
+        # Test init
+        key = 'test.txt'
+        self.s3_bucket.put_object(Body=b'0123456789', Key=key)
+
+        # Method execution
+        s3_file = self.s3_bucket_conn.open_object(key)
+
+        # Test after method execution
+        self.assertEqual(s3_file.size, 10)
+        self.assertEqual(s3_file.read(3), b'012')
+        s3_file.seek(-2, 2)
+        self.assertEqual(s3_file.read(), b'89')
+        self.assertEqual(s3_file.read(5), b'')
+        s3_file.seek(4)
+        self.assertEqual(s3_file.read(2), b'45')
+        self.assertEqual(s3_file.tell(), 6)
+
+    def test_write_df_to_s3_parquet_row_group_size(self):
+        """Test the write_df_to_s3 method
+        writing parquet row groups of a given size."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame({'col1': range(5), 'col2': range(5)})
+
+        # Method execution
+        result = self.s3_bucket_conn.write_df_to_s3(
+            key_exp, df_exp, 'parquet', row_group_size=2
+        )
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        self.assertTrue(result)
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+
+    def test_write_df_to_s3_parquet_compression(self):
+        """Test the write_df_to_s3 method writing parquet
+        with a codec, a level and dictionary encoded columns."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame({
+            'isin': ['A', 'B', 'A'],
+            'date': ['2021-04-16'] * 3,
+            'price': [1.5, 2.5, 3.5]
+        })
+
+        # Method execution
+        result = self.s3_bucket_conn.write_df_to_s3(
+            key_exp, df_exp, 'parquet', compression='zstd',
+            compression_level=5, dictionary_columns=['isin', 'date']
+        )
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        row_group = parquet_file.metadata.row_group(0)
+        self.assertTrue(result)
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+        for number, column in enumerate(df_exp.columns):
+            column_meta = row_group.column(number)
+            self.assertEqual(column_meta.compression, 'ZSTD')
+            self.assertEqual(
+                'RLE_DICTIONARY' in column_meta.encodings,
+                column in ['isin', 'date']
+            )
+
+    def test_write_df_to_s3_csv_gzip(self):
+        """Test the write_df_to_s3 and write_table_to_s3 methods
+        writing gzip compressed csv, and other codecs for csv."""
+
+        # Expected results
+        df_exp = pd.DataFrame({'col1': ['A', 'B, C'], 'col2': [2, 4]})
+        table = pa.Table.from_pandas(df_exp, preserve_index=False)
+
+        # Method execution
+        result_df = self.s3_bucket_conn.write_df_to_s3(
+            'test_df.csv.gz', df_exp, 'csv', compression='gzip',
+            compression_level=1
+        )
+        result_table = self.s3_bucket_conn.write_table_to_s3(
+            'test_table.csv.gz', table, 'csv', compression='gzip'
+        )
+
+        # Test after method execution
+        self.assertTrue(result_df)
+        self.assertTrue(result_table)
+        for key in ['test_df.csv.gz', 'test_table.csv.gz']:
+            data = self.s3_bucket.Object(key=key).get().get('Body').read()
+            self.assertEqual(data[:2], b'\x1f\x8b')
+            self.assertTrue(df_exp.equals(
+                pd.read_csv(BytesIO(data), compression='gzip')
+            ))
+        with self.assertRaises(WrongFormatException):
+            self.s3_bucket_conn.write_df_to_s3('test.csv', df_exp, 'csv',
+                compression='zstd')
+        with self.assertRaises(WrongFormatException):
+            self.s3_bucket_conn.write_table_to_s3('test.csv', table, 'csv',
+                compression='snappy')
+
+    def test_write_df_to_s3_multipart(self):
+        """Test the write_df_to_s3 method uploading
+        csv and parquet files in several parts."""
+
+        # Expected results
+        df_exp = pd.DataFrame({
+            'col1': range(600_000),
+            'col2': ['value_of_a_string_column'] * 600_000
+        })
+        part_size = 5 * 1024 ** 2
+
+        # Test init
+        # The mocked s3 cannot decode the aws-chunked bodies that botocore
+        # sends for upload_part by default, so checksums are disabled
+        # on a new client instead of the shared one
+        with patch.dict(os.environ,
+                {'AWS_REQUEST_CHECKSUM_CALCULATION': 'when_required'}):
+            clear_s3_clients()
+            s3_bucket_conn = S3BucketConnector(
+                    bucket_name=self.s3_bucket_name,
+                    access_key=self.s3_access_key,
+                    secret_key=self.s3_secret_key,
+                    endpoint_url=self.s3_endpoint_url,
+                    part_size=part_size,
+                    max_upload_workers=2
+            )
+
+        for file_format in ['csv', 'parquet']:
+            key_exp = f'test.{file_format}'
+
+            # Method execution
+            result = s3_bucket_conn.write_df_to_s3(
+                key_exp, df_exp, file_format
+            )
+
+            # Test after method execution
+            obj = self.s3_bucket.Object(key=key_exp).get()
+            data = BytesIO(obj.get('Body').read())
+            parts = len(data.getvalue()) // part_size + 1
+
+            if file_format == 'csv':
+                df_result = pd.read_csv(data)
+                self.assertGreater(parts, 1)
+                self.assertTrue(obj['ETag'].endswith(f'-{parts}"'))
+
+            else:
+                df_result = pd.read_parquet(data)
+
+            self.assertTrue(result)
+            self.assertTrue(df_exp.equals(df_result))
+
+            # Clean up
+            self.s3_bucket.Object(key=key_exp).delete()
+
+        clear_s3_clients()
+
     def test_write_df_to_s3_wrong_format(self):
         """Test the write_df_to_s3 method
         in the case of a file with an invalid format."""
@@ -0,0 +1,456 @@
+"""Test AsyncS3BucketConnector methods."""
+
+import asyncio
+import os
+import socket
+import unittest
+from io import StringIO, BytesIO
+from unittest.mock import patch
+
+import boto3
+import pandas as pd
+import pyarrow.parquet as pq
+from moto.server import ThreadedMotoServer
+
+from xetra.common.s3 import S3BucketConnector
+from xetra.common.s3_async import AsyncS3BucketConnector, AsyncS3MultipartWriter
+from xetra.common.custom_exceptions import WrongFormatException
+
+
+class TestAsyncS3BucketConnectorMethods(unittest.IsolatedAsyncioTestCase):
+    """Testing the AsyncS3BucketConnector class
+    against a local moto server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local moto server."""
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            cls.port = sock.getsockname()[1]
+
+        cls.server = ThreadedMotoServer(
+            ip_address='127.0.0.1', port=cls.port, verbose=False
+        )
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local moto server."""
+
+        cls.server.stop()
+
+    def setUp(self):
+        """Setting up the environment."""
+
+        # Define class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = f'http://127.0.0.1:{self.port}'
+        self.s3_bucket_name = 'test-bucket'
+
+        # Create access keys as new environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create test bucket on the moto server
+        self.s3 = boto3.resource(
+            service_name='s3', endpoint_url=self.s3_endpoint_url,
+            region_name='us-west-2'
+        )
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'us-west-2'
+            }
+        )
+        self.s3_bucket = self.s3.Bucket(self.s3_bucket_name)
+
+        # Create new async s3 bucket connector for the test bucket
+        self.s3_bucket_conn = AsyncS3BucketConnector(
+                bucket_name=self.s3_bucket_name,
+                access_key=os.environ[self.s3_access_key],
+                secret_key=os.environ[self.s3_secret_key],
+                endpoint_url=self.s3_endpoint_url
+        )
+
+    def tearDown(self):
+        """Delete the test bucket."""
+
+        self.s3_bucket.objects.all().delete()
+        self.s3_bucket.delete()
+
+    async def test_list_files_by_prefix_ok(self):
+        """Test the list_files_by_prefix method
+        by getting 2 file keys, in the case of valid prefix."""
+
+        # Expected results
+        prefix_exp = 'prefix/'
+        key1_exp = f"{prefix_exp}test1.csv"
+        key2_exp = f"{prefix_exp}test2.csv"
+
+        # Test init
+        csv_content = """col1,col2
+        valA,valB"""
+
+        self.s3_bucket.put_object(Body=csv_content, Key=key1_exp)
+        self.s3_bucket.put_object(Body=csv_content, Key=key2_exp)
+
+        # Method execution
+        list_result = await self.s3_bucket_conn.list_files_by_prefix(
+            prefix_exp
+        )
+
+        # Tests after method execution
+        self.assertEqual(len(list_result), 2)
+        self.assertIn(key1_exp, list_result)
+        self.assertIn(key2_exp, list_result)
+
+    async def test_list_files_by_prefix_wrong(self):
+        """Test the list_files_by_prefix method
+        in case of wrong or non-existant prefix."""
+
+        # Method execution
+        list_result = await self.s3_bucket_conn.list_files_by_prefix(
+            'no-prefix/'
+        )
+
+        # Test after method execution
+        self.assertTrue(not list_result)
+
+    async def test_read_csv_to_df_ok(self):
+        """Test the read_csv_to_df method for reading
+        several csv files through one shared client."""
+
+        # Expected results
+        keys_exp = [f'test{number}.csv' for number in range(5)]
+        log_exp = (
+            f"Reading {self.s3_endpoint_url}"
+            f"/{self.s3_bucket_name}"
+            f"/{keys_exp[0]} ..."
+        )
+
+        # Init test
+        for number, key in enumerate(keys_exp):
+            self.s3_bucket.put_object(
+                Body=f"col1,col2\n{number},2", Key=key
+            )
+
+        # Method execution
+        with self.assertLogs() as log:
+            async with self.s3_bucket_conn as bucket:
+                df_results = [
+                    await bucket.read_csv_to_df(key=key) for key in keys_exp
+                ]
+
+            # Test log after method execution
+            self.assertIn(log_exp, log.output[0])
+
+        # Test after method execution
+        for number, df_result in enumerate(df_results):
+            self.assertEqual(df_result.shape, (1, 2))
+            self.assertEqual(df_result['col1'][0], number)
+            self.assertEqual(df_result['col2'][0], 2)
+
+    async def test_write_df_to_s3_empty(self):
+        """Test the write_df_to_s3 method
+        in the case of n empty dataframe."""
+
+        # Expected results
+        log_exp = "The data frame is empty! No files will be written."
+
+        # Method execution
+        with self.assertLogs() as log:
+            result = await self.s3_bucket_conn.write_df_to_s3(
+                'test.csv', pd.DataFrame(), 'csv'
+            )
+
+        # Test after method execution
+        self.assertIn(log_exp, log.output[0])
+        self.assertFalse(result)
+
+    async def test_write_df_to_s3_csv(self):
+        """Test the write_df_to_s3 method
+        in the case of a csv file."""
+
+        # Expected results
+        key_exp = 'test.csv'
+        df_exp = pd.DataFrame(
+            data=[
+                [1, 2],
+                [3, 4]
+            ],
+            columns=['col1', 'col2']
+        )
+
+        # Method execution
+        result = await self.s3_bucket_conn.write_df_to_s3(
+            key_exp, df_exp, 'csv'
+        )
+
+        # Test after method execution
+        data = (
+            self.s3_bucket.Object(key=key_exp).get()
+            .get('Body').read().decode('utf-8')
+        )
+        df_result = pd.read_csv(StringIO(data))
+
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertTrue(result)
+
+    async def test_write_df_to_s3_parquet(self):
+        """Test the write_df_to_s3 method
+        in the case of a parquet file."""
+
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame(
+            data=[
+                [1, 2],
+                [3, 4]
+            ],
+            columns=['col1', 'col2']
+        )
+
+        # Method execution
+        result = await self.s3_bucket_conn.write_df_to_s3(
+            key_exp, df_exp, 'parquet'
+        )
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        df_result = pd.read_parquet(BytesIO(data))
+
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertTrue(result)
+
+    async def test_write_df_to_s3_compression(self):
+        """Test the write_df_to_s3 method writing gzip
+        compressed csv and zstd compressed parquet."""
+
+        # Expected results
+        df_exp = pd.DataFrame(
+            data=[
+                ['A', 2],
+                ['B', 4]
+            ],
+            columns=['col1', 'col2']
+        )
+
+        # Method execution
+        result_csv = await self.s3_bucket_conn.write_df_to_s3(
+            'test.csv.gz', df_exp, 'csv', compression='gzip'
+        )
+        result_parquet = await self.s3_bucket_conn.write_df_to_s3(
+            'test.parquet', df_exp, 'parquet', compression='zstd',
+            compression_level=3, dictionary_columns=['col1']
+        )
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key='test.csv.gz').get().get('Body').read()
+        df_result = pd.read_csv(BytesIO(data), compression='gzip')
+        self.assertTrue(df_exp.equals(df_result))
+        data = self.s3_bucket.Object(key='test.parquet').get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        self.assertEqual(
+            parquet_file.metadata.row_group(0).column(0).compression, 'ZSTD'
+        )
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+        self.assertTrue(result_csv)
+        self.assertTrue(result_parquet)
+
+    async def test_write_df_to_s3_multipart(self):
+        """Test the write_df_to_s3 method uploading
+        csv and parquet files in several parts."""
+
+        # Expected results
+        df_exp = pd.DataFrame({
+            'col1': range(600_000),
+            'col2': ['value_of_a_string_column'] * 600_000
+        })
+        part_size = 5 * 1024 ** 2
+
+        # Test init
+        s3_bucket_conn = AsyncS3BucketConnector(
+                bucket_name=self.s3_bucket_name,
+                access_key=os.environ[self.s3_access_key],
+                secret_key=os.environ[self.s3_secret_key],
+                endpoint_url=self.s3_endpoint_url,
+                part_size=part_size
+        )
+
+        for file_format, row_group_size in [('csv', None),
+                ('parquet', 200_000)]:
+            key_exp = f'test.{file_format}'
+
+            # Method execution
+            with patch.object(AsyncS3MultipartWriter, 'upload_parts',
+                    autospec=True,
+                    side_effect=AsyncS3MultipartWriter.upload_parts) as \
+                    upload_parts:
+                result = await s3_bucket_conn.write_df_to_s3(
+                    key_exp, df_exp, file_format,
+                    row_group_size=row_group_size
+                )
+
+            # Test after method execution
+            obj = self.s3_bucket.Object(key=key_exp).get()
+            data = BytesIO(obj.get('Body').read())
+            parts = len(data.getvalue()) // part_size + 1
+
+            if file_format == 'csv':
+                df_result = pd.read_csv(data)
+                self.assertGreater(parts, 1)
+                self.assertTrue(obj['ETag'].endswith(f'-{parts}"'))
+
+            else:
+                parquet_file = pq.ParquetFile(data)
+                df_result = parquet_file.read().to_pandas()
+                self.assertEqual(parquet_file.num_row_groups, 3)
+
+            # Parts are uploaded after every chunk or row group and on
+            # close, not only once the whole body is serialised
+            self.assertEqual(upload_parts.call_count, 7 if
+                file_format == 'csv' else 4)
+            self.assertTrue(result)
+            self.assertTrue(df_exp.equals(df_result))
+
+    async def test_write_df_to_s3_concurrent_parts(self):
+        """Test the write_df_to_s3 method uploading
+        up to max_upload_workers parts concurrently."""
+
+        # Expected results
+        df_exp = pd.DataFrame({
+            'col1': range(600_000),
+            'col2': ['value_of_a_string_column'] * 600_000
+        })
+        key_exp = 'test.csv'
+        max_in_flight_exp = 2
+
+        # Test init
+        s3_bucket_conn = AsyncS3BucketConnector(
+                bucket_name=self.s3_bucket_name,
+                access_key=os.environ[self.s3_access_key],
+                secret_key=os.environ[self.s3_secret_key],
+                endpoint_url=self.s3_endpoint_url,
+                part_size=5 * 1024 ** 2,
+                max_upload_workers=max_in_flight_exp
+        )
+        in_flight = []
+        max_in_flight = 0
+
+        # Method execution
+        async with s3_bucket_conn:
+            upload_part = s3_bucket_conn._client.upload_part
+
+            async def tracked_upload_part(**kwargs):
+                nonlocal max_in_flight
+                in_flight.append(kwargs['PartNumber'])
+                max_in_flight = max(max_in_flight, len(in_flight))
+                try:
+                    await asyncio.sleep(0.1)
+                    return await upload_part(**kwargs)
+                finally:
+                    in_flight.remove(kwargs['PartNumber'])
+
+            with patch.object(s3_bucket_conn._client, 'upload_part',
+                    tracked_upload_part):
+                result = await s3_bucket_conn.write_df_to_s3(
+                    key_exp, df_exp, 'csv'
+                )
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(max_in_flight, max_in_flight_exp)
+        data = BytesIO(self.s3_bucket.Object(key=key_exp).get()['Body'].read())
+        self.assertTrue(df_exp.equals(pd.read_csv(data)))
+
+    async def test_write_df_to_s3_failed_part(self):
+        """Test the write_df_to_s3 method cancelling the pending
+        parts and aborting the upload when a part fails."""
+
+        # Expected results
+        df_exp = pd.DataFrame({
+            'col1': range(600_000),
+            'col2': ['value_of_a_string_column'] * 600_000
+        })
+        key_exp = 'test.csv'
+
+        # Test init
+        s3_bucket_conn = AsyncS3BucketConnector(
+                bucket_name=self.s3_bucket_name,
+                access_key=os.environ[self.s3_access_key],
+                secret_key=os.environ[self.s3_secret_key],
+                endpoint_url=self.s3_endpoint_url,
+                part_size=5 * 1024 ** 2
+        )
+        cancelled = []
+
+        async def failing_upload_part(**kwargs):
+            if kwargs['PartNumber'] == 2:
+                raise ValueError('failed')
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(kwargs['PartNumber'])
+                raise
+
+        # Method execution
+        async with s3_bucket_conn:
+            with patch.object(s3_bucket_conn._client, 'upload_part',
+                    failing_upload_part):
+                with self.assertRaises(ValueError):
+                    await s3_bucket_conn.write_df_to_s3(
+                        key_exp, df_exp, 'csv'
+                    )
+
+        # Test after method execution
+        self.assertIn(1, cancelled)
+        self.assertNotIn(2, cancelled)
+        uploads = self.s3.meta.client.list_multipart_uploads(
+            Bucket=self.s3_bucket_name
+        )
+        self.assertEqual(uploads.get('Uploads', []), [])
+        self.assertEqual(list(self.s3_bucket.objects.all()), [])
+
+    async def test_write_df_to_s3_wrong_format(self):
+        """Test the write_df_to_s3 method
+        in the case of a file with an invalid format."""
+
+        # Test init
+        df_exp = pd.DataFrame(data=[[1, 2]], columns=['col1', 'col2'])
+
+        # Method execution
+        with self.assertRaises(WrongFormatException):
+            await self.s3_bucket_conn.write_df_to_s3(
+                'test.parquet', df_exp, 'wrongformat'
+            )
+
+    async def test_copy(self):
+        """Test the copy method returning an unopened
+        connector while the original one is open."""
+
+        # Method execution
+        async with self.s3_bucket_conn:
+            copy_conn = self.s3_bucket_conn.copy()
+
+        # Test after method execution
+        self.assertIsInstance(copy_conn, AsyncS3BucketConnector)
+        self.assertIsNot(copy_conn, self.s3_bucket_conn)
+        self.assertIsNone(copy_conn._client)
+        self.assertEqual(copy_conn.endpoint_url, self.s3_endpoint_url)
+        self.assertEqual(copy_conn.part_size, self.s3_bucket_conn.part_size)
+
+    def test_sync_connector(self):
+        """Test the sync_connector method."""
+
+        # Method execution
+        sync_conn = self.s3_bucket_conn.sync_connector()
+
+        # Test after method execution
+        self.assertIsInstance(sync_conn, S3BucketConnector)
+        self.assertEqual(sync_conn.endpoint_url, self.s3_endpoint_url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Test the shared S3 client pool."""
+
+import unittest
+
+from xetra.common.s3_client import clear_s3_clients, get_s3_client
+
+
+class TestS3ClientMethods(unittest.TestCase):
+    """Testing the get_s3_client function."""
+
+    def setUp(self):
+        """Start every test with an empty pool."""
+
+        clear_s3_clients()
+
+    def tearDown(self):
+        """Drop the clients created by the test."""
+
+        clear_s3_clients()
+
+    def test_get_s3_client_shared(self):
+        """Test the get_s3_client function returning
+        the same client for the same endpoint."""
+
+        # Method execution
+        client1 = get_s3_client('KEY1', 'KEY2', 'https://s3.amazonaws.com')
+        client2 = get_s3_client('KEY1', 'KEY2', 'https://s3.amazonaws.com')
+
+        # Test after method execution
+        self.assertIs(client1.client, client2.client)
+        # boto3 resources are not thread-safe and are never shared
+        self.assertNotIn('resource', client1._fields)
+        self.assertIs(client1.exceptions.NoSuchKey,
+            client1.client.exceptions.NoSuchKey)
+
+    def test_get_s3_client_config(self):
+        """Test the get_s3_client function creating separate clients
+        for other endpoints and applying the pool settings."""
+
+        # Method execution
+        client1 = get_s3_client('KEY1', 'KEY2', 'https://s3.amazonaws.com',
+            max_pool_connections=20, tcp_keepalive=False)
+        client2 = get_s3_client('KEY1', 'KEY2',
+            'https://s3.us-west-2.amazonaws.com')
+
+        # Test after method execution
+        self.assertIsNot(client1.client, client2.client)
+        self.assertEqual(client1.client.meta.config.max_pool_connections, 20)
+        self.assertFalse(client1.client.meta.config.tcp_keepalive)
+        self.assertTrue(client2.client.meta.config.tcp_keepalive)
+
+
+if __name__ == '__main__':
+    unittest.main()
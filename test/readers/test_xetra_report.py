@@ -0,0 +1,211 @@
+"""Test XetraReportReader Methods."""
+import os
+import unittest
+from unittest.mock import patch
+
+import boto3
+import pandas as pd
+from moto import mock_s3
+
+from xetra.common.custom_exceptions import WrongFormatException
+from xetra.common.metrics import S3_CALLS
+from xetra.common.s3 import S3BucketConnector
+from xetra.readers.xetra_report import XetraReportReader
+from xetra.transformers.xetra_transformer import XetraTargetConfig
+
+
+class TestXetraReportReaderMethods(unittest.TestCase):
+    """Test the XetraReportReader class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # mock s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # Define the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.us-west-2.amazonaws.com'
+        self.s3_bucket_name = 'trg-bucket'
+
+        # Create s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create the target bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name='s3',
+            endpoint_url=self.s3_endpoint_url
+        )
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'us-west-2'
+            }
+        )
+
+        # Create S3BucketConnector testing instance
+        self.s3_bucket_trg = S3BucketConnector(
+            self.s3_bucket_name,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+
+        # Create target configuration
+        conf_dict_trg = {
+            'trg_col_isin': 'isin',
+            'trg_col_date': 'date',
+            'trg_col_op_price': 'opening_price_eur',
+            'trg_col_clos_price': 'closing_price_eur',
+            'trg_col_min_price': 'minimum_price_eur',
+            'trg_col_max_price': 'maximum_price_eur',
+            'trg_col_dail_trad_vol': 'daily_traded_volume',
+            'trg_col_ch_prev_clos': 'change_prev_closing_%',
+            'trg_key': 'report/xetra_daily_report',
+            'trg_key_date_format': '%Y%m%d_%H%M%S',
+            'trg_format': 'parquet',
+            'trg_partition_key': 'report/partitioned/'
+        }
+        self.target_config = XetraTargetConfig(**conf_dict_trg)
+
+        # Report of three ISINs on three dates
+        isins = ['AT0000A0E9W5', 'DE0005557508', 'DE000A0D9PT0']
+        dates = ['2021-04-16', '2021-04-17', '2021-04-19']
+        self.df_report = pd.DataFrame(
+            [
+                [isin, date, 10.0 + number, 11.0 + number, 9.0 + number,
+                    12.0 + number, 100 * number, 1.5]
+                for number, (date, isin) in enumerate(
+                    (date, isin) for date in dates for isin in isins
+                )
+            ],
+            columns=[
+                'isin', 'date', 'opening_price_eur', 'closing_price_eur',
+                'minimum_price_eur', 'maximum_price_eur',
+                'daily_traded_volume', 'change_prev_closing_%'
+            ]
+        )
+
+        # One ISIN per row group in the date partitions
+        for date in dates:
+            self.s3_bucket_trg.write_df_to_s3(
+                f"report/partitioned/date={date}/part-0.parquet",
+                self.df_report[self.df_report.date == date]
+                .drop(columns=['date']),
+                'parquet', row_group_size=1
+            )
+
+    def tearDown(self):
+        """Clean up the test environment."""
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_read_df_partitioned(self):
+        """Tests the read_df method reading only the matching
+        partitions, row groups and columns."""
+
+        # Expected results
+        columns = ['date', 'isin', 'closing_price_eur']
+        df_exp = self.df_report.loc[
+            (self.df_report['isin'] == 'DE0005557508')
+            & (self.df_report.date >= '2021-04-17'),
+            columns
+        ].reset_index(drop=True)
+        keys_exp = [
+            'report/partitioned/date=2021-04-17/part-0.parquet',
+            'report/partitioned/date=2021-04-19/part-0.parquet'
+        ]
+
+        # Method execution
+        reader = XetraReportReader(self.s3_bucket_trg, self.target_config)
+        calls, _, totals = S3_CALLS.snapshot()
+        with patch.object(self.s3_bucket_trg, 'open_object',
+                wraps=self.s3_bucket_trg.open_object) as open_object:
+            df_result = reader.read_df(
+                isins=['DE0005557508'], start_date='2021-04-17',
+                columns=columns
+            )
+        calls_end, _, totals_end = S3_CALLS.snapshot()
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertEqual(
+            sorted(call.args[0] for call in open_object.call_args_list),
+            keys_exp
+        )
+        # Small partitions are read with a single GET
+        partition_bytes = sum(
+            obj['size']
+            for obj in self.s3_bucket_trg.list_objects_by_prefix('report/')
+            if obj['key'] in keys_exp
+        )
+        self.assertEqual(calls_end['GetObject'] - calls['GetObject'], 2)
+        self.assertEqual(totals_end['bytes_read'] - totals['bytes_read'],
+            partition_bytes)
+
+    def test_read_table_all(self):
+        """Tests the read_table method without filters."""
+
+        # Method execution
+        reader = XetraReportReader(self.s3_bucket_trg, self.target_config)
+        table = reader.read_table()
+
+        # Test after method execution
+        self.assertEqual(table.column_names, list(self.df_report.columns))
+        self.assertTrue(self.df_report.equals(table.to_pandas()))
+
+    def test_read_df_not_partitioned(self):
+        """Tests the read_df method with a report
+        that is not partitioned."""
+
+        # Expected results
+        df_exp = self.df_report[
+            self.df_report['isin'].isin(['AT0000A0E9W5', 'DE000A0D9PT0'])
+            & (self.df_report.date <= '2021-04-17')
+        ].reset_index(drop=True)
+
+        # Test init
+        target_config = self.target_config._replace(trg_partition_key=None)
+        self.s3_bucket_trg.write_df_to_s3(
+            'report/xetra_daily_report_20210420_000000.parquet',
+            self.df_report, 'parquet', row_group_size=3
+        )
+
+        # Method execution
+        reader = XetraReportReader(self.s3_bucket_trg, target_config)
+        df_result = reader.read_df(
+            isins=['DE000A0D9PT0', 'AT0000A0E9W5'], end_date='2021-04-17'
+        )
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_read_df_no_match(self):
+        """Tests the read_df method when no row matches."""
+
+        # Method execution
+        reader = XetraReportReader(self.s3_bucket_trg, self.target_config)
+        df_result = reader.read_df(isins=['XX0000000000'],
+            columns=['isin', 'date'])
+
+        # Test after method execution
+        self.assertTrue(df_result.empty)
+        self.assertEqual(list(df_result.columns), ['isin', 'date'])
+
+    def test_init_wrong_format(self):
+        """Tests the constructor with a csv report."""
+
+        # Test init
+        target_config = self.target_config._replace(trg_format='csv')
+
+        # Method execution
+        with self.assertRaises(WrongFormatException):
+            XetraReportReader(self.s3_bucket_trg, target_config)
+
+
+if __name__ == '__main__':
+    unittest.main()
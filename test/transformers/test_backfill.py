@@ -0,0 +1,500 @@
+"""Test XetraBackfill Methods."""
+import os
+import socket
+import unittest
+from unittest.mock import patch
+from io import BytesIO
+
+import boto3
+import pandas as pd
+from moto import mock_s3
+from moto.server import ThreadedMotoServer
+
+from xetra.common.manifest import SourceManifest
+from xetra.common.meta_process import MetaProcess
+from xetra.common.s3 import S3BucketConnector
+from xetra.common.s3_async import AsyncS3BucketConnector
+from xetra.transformers.backfill import XetraBackfill, plan_chunks
+from xetra.transformers.xetra_transformer import XetraETL, XetraSourceConfig, XetraTargetConfig
+
+
+class TestXetraBackfillMethods(unittest.TestCase):
+    """Test the XetraBackfill class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # mock s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # Define the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.us-west-2.amazonaws.com'
+        self.s3_bucket_name_src = 'src-bucket'
+        self.s3_bucket_name_trg = 'trg-bucket'
+        self.meta_key = 'meta_key'
+
+        # Create s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Create the source and target bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name='s3',
+            endpoint_url=self.s3_endpoint_url
+        )
+        for bucket_name in [self.s3_bucket_name_src, self.s3_bucket_name_trg]:
+            self.s3.create_bucket(
+                Bucket=bucket_name,
+                CreateBucketConfiguration={
+                    'LocationConstraint': 'us-west-2'
+                }
+            )
+        self.trg_bucket = self.s3.Bucket(self.s3_bucket_name_trg)
+
+        # Create S3BucketConnector testing instances
+        self.s3_bucket_src = S3BucketConnector(
+            self.s3_bucket_name_src,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+        self.s3_bucket_trg = S3BucketConnector(
+            self.s3_bucket_name_trg,
+            self.s3_access_key,
+            self.s3_secret_key,
+            self.s3_endpoint_url
+        )
+
+        # Create source and target configuration
+        conf_dict_src = {
+            'src_first_extract_date': '2021-04-01',
+            'src_columns': [
+                'ISIN', 'Mnemonic', 'Date', 'Time',
+                'StartPrice', 'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+            ],
+            'src_col_date': 'Date',
+            'src_col_isin': 'ISIN',
+            'src_col_time': 'Time',
+            'src_col_start_price': 'StartPrice',
+            'src_col_min_price': 'MinPrice',
+            'src_col_max_price': 'MaxPrice',
+            'src_col_traded_vol': 'TradedVolume'
+        }
+        conf_dict_trg = {
+            'trg_col_isin': 'isin',
+            'trg_col_date': 'date',
+            'trg_col_op_price': 'opening_price_eur',
+            'trg_col_clos_price': 'closing_price_eur',
+            'trg_col_min_price': 'minimum_price_eur',
+            'trg_col_max_price': 'maximum_price_eur',
+            'trg_col_dail_trad_vol': 'daily_traded_volume',
+            'trg_col_ch_prev_clos': 'change_prev_closing_%',
+            'trg_key': 'report/xetra_daily_report',
+            'trg_key_date_format': '%Y%m%d_%H%M%S',
+            'trg_format': 'parquet'
+        }
+        self.source_config = XetraSourceConfig(**conf_dict_src)
+        self.target_config = XetraTargetConfig(**conf_dict_trg)
+
+        # Creating source files on mocked s3
+        columns_src = [
+            'ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+            'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
+        data = [
+            ['AT0000A0E9W5', 'SANT', '2021-04-16', '15:00', 18.27, 21.19, 18.27, 21.34, 987],
+            ['AT0000A0E9W5', 'SANT', '2021-04-17', '13:00', 20.21, 18.27, 18.21, 20.42, 633],
+            ['AT0000A0E9W5', 'SANT', '2021-04-17', '14:00', 18.27, 21.19, 18.27, 21.34, 455],
+            ['AT0000A0E9W5', 'SANT', '2021-04-18', '07:00', 20.58, 19.27, 18.89, 20.58, 9066],
+            ['AT0000A0E9W5', 'SANT', '2021-04-18', '08:00', 19.27, 21.14, 19.27, 21.14, 1220],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '07:00', 23.58, 23.58, 23.58, 23.58, 1035],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '08:00', 23.58, 24.22, 23.31, 24.34, 1028],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '09:00', 24.22, 22.21, 22.21, 25.01, 1523]
+        ]
+        df_src = pd.DataFrame(data, columns=columns_src)
+
+        for row in range(len(df_src)):
+            date, time = df_src.loc[row, ['Date', 'Time']]
+            self.s3_bucket_src.write_df_to_s3(
+                f"{date}/{date}_BINS_XETR{time[:2]}.csv",
+                df_src.loc[row:row], 'csv'
+            )
+
+        columns_report = [
+            'isin', 'date', 'opening_price_eur', 'closing_price_eur',
+            'minimum_price_eur', 'maximum_price_eur', 'daily_traded_volume', 'change_prev_closing_%'
+        ]
+        data_report = [
+            ['AT0000A0E9W5', '2021-04-17', 20.21, 18.27, 18.21, 21.34, 1088, 10.62],
+            ['AT0000A0E9W5', '2021-04-18', 20.58, 19.27, 18.89, 21.14, 10286, 1.83],
+            ['AT0000A0E9W5', '2021-04-19', 23.58, 24.22, 22.21, 25.01, 3586, 14.58]
+        ]
+        self.df_report = pd.DataFrame(data_report, columns=columns_report)
+
+    def tearDown(self):
+        """Clean up the test environment."""
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_plan_chunks(self):
+        """Tests the plan_chunks function."""
+
+        # Expected results
+        chunks_exp = [
+            ('2021-04-17', '2021-04-19'),
+            ('2021-04-20', '2021-04-22'),
+            ('2021-04-23', '2021-04-23')
+        ]
+
+        # Method execution
+        chunks = plan_chunks('2021-04-17', '2021-04-23', chunk_days=3)
+
+        # Test after method execution
+        self.assertEqual(chunks, chunks_exp)
+        self.assertEqual(plan_chunks('2021-04-19', '2021-04-18'), [])
+
+    def test_run_chunks(self):
+        """Tests the run method with one chunk per date
+        producing the same report as a single run."""
+
+        # Expected results
+        df_exp = self.df_report
+        meta_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+
+        # Method execution
+        xetra_backfill = XetraBackfill(
+            self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+            self.source_config, self.target_config,
+            chunk_days=1, max_workers=1
+        )
+        result = xetra_backfill.run('2021-04-17', '2021-04-19')
+
+        # Test after method execution
+        self.assertTrue(result)
+        trg_files = self.s3_bucket_trg.list_files_by_prefix(
+            self.target_config.trg_key)
+        self.assertEqual(len(trg_files), 3)
+        self.assertIn('report/xetra_daily_report2021-04-18_2021-04-18_',
+            trg_files[1])
+        df_result = pd.concat([
+            pd.read_parquet(BytesIO(
+                self.trg_bucket.Object(key=trg_file).get().get('Body').read()
+            ))
+            for trg_file in trg_files
+        ], ignore_index=True)
+        self.assertTrue(df_exp.equals(df_result))
+
+        df_meta_result = self.s3_bucket_trg.read_csv_to_df(self.meta_key)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+
+    def test_run_failed_chunk(self):
+        """Tests the run method adding only the dates
+        of the successful chunks to the meta file."""
+
+        # Expected results
+        meta_exp = ['2021-04-17', '2021-04-19']
+
+        # Method execution
+        xetra_backfill = XetraBackfill(
+            self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+            self.source_config, self.target_config,
+            chunk_days=1, max_workers=1
+        )
+        with patch.object(XetraETL, 'report',
+                side_effect=[True, ValueError('failed'), True]):
+            result = xetra_backfill.run('2021-04-17', '2021-04-19')
+
+        # Test after method execution
+        self.assertFalse(result)
+        df_meta_result = self.s3_bucket_trg.read_csv_to_df(self.meta_key)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+
+
+    def test_run_monday_chunk(self):
+        """Tests the run method with a chunk starting on a Monday
+        and source data on weekdays only, where the previous closing
+        price is the one of the Friday before."""
+
+        # Expected results
+        change_exp = [20.0]
+
+        # Test init
+        columns_src = [
+            'ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+            'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
+        for date, price in [('2022-05-13', 10.0), ('2022-05-16', 12.0)]:
+            self.s3_bucket_src.write_df_to_s3(
+                f"{date}/{date}_BINS_XETR12.csv",
+                pd.DataFrame(
+                    [['AT0000A0E9W5', 'SANT', date, '12:00', price, price,
+                        price, price, 100]],
+                    columns=columns_src
+                ),
+                'csv'
+            )
+
+        # Method execution
+        xetra_backfill = XetraBackfill(
+            self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+            self.source_config, self.target_config,
+            chunk_days=1, max_workers=1
+        )
+        result = xetra_backfill.run('2022-05-16', '2022-05-16')
+
+        # Test after method execution
+        self.assertTrue(result)
+        trg_file = self.s3_bucket_trg.list_files_by_prefix(
+            self.target_config.trg_key)[0]
+        df_result = pd.read_parquet(BytesIO(
+            self.trg_bucket.Object(key=trg_file).get().get('Body').read()
+        ))
+        self.assertEqual(list(df_result['date']), ['2022-05-16'])
+        self.assertEqual(
+            list(df_result['change_prev_closing_%']), change_exp
+        )
+    def test_run_state_between_daily_runs(self):
+        """Tests the run method updating the state table, so a daily
+        run after the backfill continues from the last backfilled
+        closing price instead of the one of the daily run before."""
+
+        # Expected results
+        change_exp = [25.0]
+        state_dates_exp = ['2021-04-15']
+
+        # Test init
+        columns_src = [
+            'ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+            'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
+        for date, price in [('2021-04-12', 10.0), ('2021-04-13', 20.0),
+                ('2021-04-14', 30.0), ('2021-04-15', 40.0),
+                ('2021-04-16', 50.0)]:
+            self.s3_bucket_src.write_df_to_s3(
+                f"{date}/{date}_BINS_XETR10.csv",
+                pd.DataFrame(
+                    [['DE0005557508', 'DTE', date, '10:00', price, price,
+                        price, price, 100]],
+                    columns=columns_src
+                ),
+                'csv'
+            )
+        target_config = self.target_config._replace(
+            trg_state_key='state/last_prices.parquet'
+        )
+
+        def run_daily(extract_date, extract_date_list):
+            with patch.object(MetaProcess, 'get_date_list',
+                    return_value=[extract_date, extract_date_list]):
+                xetra_etl = XetraETL(
+                    self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                    self.source_config, target_config
+                )
+                xetra_etl.report()
+            return xetra_etl
+
+        # Method execution
+        run_daily('2021-04-12', ['2021-04-12'])
+        xetra_backfill = XetraBackfill(
+            self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+            self.source_config, target_config,
+            chunk_days=1, max_workers=3
+        )
+        result = xetra_backfill.run('2021-04-13', '2021-04-15')
+        df_state = self.s3_bucket_trg.read_parquet_to_df(
+            target_config.trg_state_key
+        )
+        xetra_etl = run_daily('2021-04-16', ['2021-04-15', '2021-04-16'])
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(list(df_state['date']), state_dates_exp)
+        self.assertEqual(xetra_etl.plan().scan.dates, ['2021-04-16'])
+        trg_file = self.s3_bucket_trg.list_files_by_prefix(
+            f"{target_config.trg_key}_")[0]
+        df_result = pd.read_parquet(BytesIO(
+            self.trg_bucket.Object(key=trg_file).get().get('Body').read()
+        ))
+        df_result = df_result[df_result['isin'] == 'DE0005557508']
+        self.assertEqual(list(df_result['date']), ['2021-04-16'])
+        self.assertEqual(
+            list(df_result['change_prev_closing_%']), change_exp
+        )
+
+    def test_run_shared_manifest(self):
+        """Tests the run method with one source manifest for all
+        chunks, holding the source dates of every chunk."""
+
+        # Expected results
+        dates_exp = {'2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'}
+
+        # Test init
+        source_config = self.source_config._replace(
+            src_manifest_key='meta/source_manifest.csv'
+        )
+
+        # Method execution
+        with patch('xetra.transformers.backfill.SourceManifest',
+                wraps=SourceManifest) as backfill_manifest, \
+                patch('xetra.transformers.xetra_transformer.SourceManifest',
+                    wraps=SourceManifest) as chunk_manifest:
+            xetra_backfill = XetraBackfill(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config,
+                chunk_days=1, max_workers=3
+            )
+            result = xetra_backfill.run('2021-04-17', '2021-04-19')
+
+        # Test after method execution
+        self.assertTrue(result)
+        backfill_manifest.assert_called_once_with(
+            self.s3_bucket_trg, source_config.src_manifest_key
+        )
+        chunk_manifest.assert_not_called()
+        manifest = SourceManifest(
+            self.s3_bucket_trg, source_config.src_manifest_key
+        )
+        self.assertEqual(manifest.dates(), dates_exp)
+
+
+class TestXetraBackfillAsyncMethods(unittest.TestCase):
+    """Test the XetraBackfill class with async connectors
+    against a local moto server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local moto server."""
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        cls.s3_endpoint_url = f'http://127.0.0.1:{port}'
+        cls.server = ThreadedMotoServer(
+            ip_address='127.0.0.1', port=port, verbose=False
+        )
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local moto server."""
+
+        cls.server.stop()
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # Reuse the data and configuration of the synchronous tests
+        self.sync_tests = TestXetraBackfillMethods()
+        self.sync_tests.setUp()
+        self.sync_tests.tearDown()
+        self.source_config = self.sync_tests.source_config
+        self.target_config = self.sync_tests.target_config
+        self.df_report = self.sync_tests.df_report
+        self.meta_key = 'meta_key'
+
+        # Create the source and target bucket on the moto server
+        self.s3 = boto3.resource(
+            service_name='s3', endpoint_url=self.s3_endpoint_url,
+            region_name='us-west-2'
+        )
+        self.buckets = []
+
+        for name in ['src-bucket', 'trg-bucket']:
+            self.s3.create_bucket(
+                Bucket=name,
+                CreateBucketConfiguration={
+                    'LocationConstraint': 'us-west-2'
+                }
+            )
+            self.buckets.append(self.s3.Bucket(name))
+
+        self.s3_bucket_src = AsyncS3BucketConnector(
+            'src-bucket', 'KEY1', 'KEY2', self.s3_endpoint_url
+        )
+        self.s3_bucket_trg = AsyncS3BucketConnector(
+            'trg-bucket', 'KEY1', 'KEY2', self.s3_endpoint_url
+        )
+
+        # Creating source files on the moto server
+        sync_src = self.s3_bucket_src.sync_connector()
+        columns_src = [
+            'ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+            'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
+        data = [
+            ['AT0000A0E9W5', 'SANT', '2021-04-16', '15:00', 18.27, 21.19, 18.27, 21.34, 987],
+            ['AT0000A0E9W5', 'SANT', '2021-04-17', '13:00', 20.21, 18.27, 18.21, 20.42, 633],
+            ['AT0000A0E9W5', 'SANT', '2021-04-17', '14:00', 18.27, 21.19, 18.27, 21.34, 455],
+            ['AT0000A0E9W5', 'SANT', '2021-04-18', '07:00', 20.58, 19.27, 18.89, 20.58, 9066],
+            ['AT0000A0E9W5', 'SANT', '2021-04-18', '08:00', 19.27, 21.14, 19.27, 21.14, 1220],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '07:00', 23.58, 23.58, 23.58, 23.58, 1035],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '08:00', 23.58, 24.22, 23.31, 24.34, 1028],
+            ['AT0000A0E9W5', 'SANT', '2021-04-19', '09:00', 24.22, 22.21, 22.21, 25.01, 1523]
+        ]
+        df_src = pd.DataFrame(data, columns=columns_src)
+
+        for row in range(len(df_src)):
+            date, time = df_src.loc[row, ['Date', 'Time']]
+            sync_src.write_df_to_s3(
+                f"{date}/{date}_BINS_XETR{time[:2]}.csv",
+                df_src.loc[row:row], 'csv'
+            )
+
+    def tearDown(self):
+        """Delete the buckets."""
+
+        for bucket in self.buckets:
+            bucket.objects.all().delete()
+            bucket.delete()
+
+    def test_run_chunks(self):
+        """Tests the run method with an async target connector
+        updating the meta file, the state table and the manifest."""
+
+        # Expected results
+        df_exp = self.df_report
+        meta_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+        state_dates_exp = ['2021-04-19']
+        manifest_dates_exp = {
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        }
+
+        # Test init
+        source_config = self.source_config._replace(
+            src_manifest_key='meta/source_manifest.csv'
+        )
+        target_config = self.target_config._replace(
+            trg_state_key='state/last_prices.parquet'
+        )
+
+        # Method execution
+        xetra_backfill = XetraBackfill(
+            self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+            source_config, target_config,
+            chunk_days=1, max_workers=3
+        )
+        result = xetra_backfill.run('2021-04-17', '2021-04-19')
+
+        # Test after method execution
+        self.assertTrue(result)
+        trg_bucket = self.s3_bucket_trg.sync_connector()
+        trg_files = trg_bucket.list_files_by_prefix(target_config.trg_key)
+        df_result = pd.concat([
+            trg_bucket.read_parquet_to_df(trg_file) for trg_file in trg_files
+        ], ignore_index=True)
+        self.assertTrue(df_exp.equals(df_result))
+        df_meta_result = trg_bucket.read_csv_to_df(self.meta_key)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+        df_state = trg_bucket.read_parquet_to_df(target_config.trg_state_key)
+        self.assertEqual(list(df_state['date']), state_dates_exp)
+        manifest = SourceManifest(trg_bucket, source_config.src_manifest_key)
+        self.assertEqual(manifest.dates(), manifest_dates_exp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Conformance tests of the transform engines."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from xetra.common.constants import TransformEngine
+from xetra.common.custom_exceptions import WrongEngineException
+from xetra.common.meta_process import MetaProcess
+from xetra.transformers import engines
+from xetra.transformers.engines import get_engine
+from xetra.transformers.xetra_transformer import XetraETL, XetraSourceConfig, XetraTargetConfig
+
+
+class TestTransformEngines(unittest.TestCase):
+    """Testing that every engine gives the same report as Pandas."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # Create source and target configuration
+        conf_dict_src = {
+            'src_first_extract_date': '2021-04-17',
+            'src_columns': ['ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+                'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'],
+            'src_col_date': 'Date',
+            'src_col_isin': 'ISIN',
+            'src_col_time': 'Time',
+            'src_col_start_price': 'StartPrice',
+            'src_col_min_price': 'MinPrice',
+            'src_col_max_price': 'MaxPrice',
+            'src_col_traded_vol': 'TradedVolume'
+        }
+        conf_dict_trg = {
+            'trg_col_isin': 'isin',
+            'trg_col_date': 'date',
+            'trg_col_op_price': 'opening_price_eur',
+            'trg_col_clos_price': 'closing_price_eur',
+            'trg_col_min_price': 'minimum_price_eur',
+            'trg_col_max_price': 'maximum_price_eur',
+            'trg_col_dail_trad_vol': 'daily_traded_volume',
+            'trg_col_ch_prev_clos': 'change_prev_closing_%',
+            'trg_key': 'report/xetra_daily_report_',
+            'trg_key_date_format': '%Y%m%d_%H%M%S',
+            'trg_format': 'parquet'
+        }
+        self.source_config = XetraSourceConfig(**conf_dict_src)
+        self.target_config = XetraTargetConfig(**conf_dict_trg)
+        self.engines = [
+            engine.value for engine in TransformEngine
+            if engine != TransformEngine.POLARS or engines.polars is not None
+        ]
+
+        # Random source rows of few ISINs and times, so that many
+        # rows share their time, with shuffled rows and null values
+        rng = np.random.default_rng(7)
+        rows = 2000
+        start_prices = rng.uniform(1, 100, rows).round(2)
+        self.df_src = pd.DataFrame({
+            'ISIN': rng.choice(['AT0000A0E9W5', 'DE0005557508',
+                'DE000A0D9PT0', 'US0378331005'], rows),
+            'Mnemonic': 'XXX',
+            'Date': rng.choice(['2021-04-16', '2021-04-17', '2021-04-19'], rows),
+            'Time': rng.choice(['09:00', '09:01', '12:00', '17:30'], rows),
+            'StartPrice': start_prices,
+            'EndPrice': start_prices,
+            'MinPrice': (start_prices * 0.99).round(2),
+            'MaxPrice': (start_prices * 1.01).round(2),
+            'TradedVolume': rng.integers(0, 10000, rows)
+        })
+        self.df_src.loc[::97, 'StartPrice'] = np.nan
+
+    def test_aggregate_conformance(self):
+        """Tests that the engines give the same aggregates,
+        also with categorical columns and the helper time columns."""
+
+        df_categorical = self.df_src.astype({
+            'ISIN': 'category', 'Date': 'category', 'Time': 'category'
+        })
+
+        for df_src in [self.df_src, df_categorical]:
+            for with_times in [False, True]:
+                # Expected results
+                df_exp = get_engine('pandas')(df_src, self.source_config,
+                    self.target_config, with_times)
+
+                for engine in self.engines:
+                    with self.subTest(engine=engine, with_times=with_times,
+                            dtype=str(df_src['ISIN'].dtype)):
+                        # Method execution
+                        df_result = get_engine(engine)(df_src,
+                            self.source_config, self.target_config,
+                            with_times)
+
+                        # Test after method execution
+                        assert_frame_equal(df_result, df_exp)
+
+    def test_transform_report_conformance(self):
+        """Tests that XetraETL.transform gives the same report
+        with every engine, serially and in sharded processes."""
+
+        # Expected results
+        with patch.object(MetaProcess, 'get_date_list',
+                return_value=['2021-04-17', []]):
+            xetra_etl = XetraETL(MagicMock(), MagicMock(), 'meta.csv',
+                self.source_config, self.target_config)
+        df_exp = xetra_etl.transform(self.df_src)
+
+        for engine in self.engines:
+            for workers in [1, 2]:
+                with self.subTest(engine=engine, workers=workers):
+                    # Method execution
+                    xetra_etl.src_args = self.source_config._replace(
+                        src_transform_engine=engine,
+                        src_transform_workers=workers,
+                        src_transform_shard_rows=0
+                    )
+                    df_result = xetra_etl.transform(self.df_src)
+
+                    # Test after method execution
+                    assert_frame_equal(df_result, df_exp)
+
+        xetra_etl.close()
+
+    def test_get_engine_unknown(self):
+        """Tests the get_engine function with an unknown engine."""
+
+        # Method execution
+        with self.assertRaises(WrongEngineException):
+            get_engine('spark')
+
+    def test_get_engine_polars_missing(self):
+        """Tests the get_engine function without the polars package."""
+
+        # Method execution
+        with patch.object(engines, 'polars', None):
+            with self.assertRaises(WrongEngineException):
+                get_engine('polars')
+
+
+if __name__ == '__main__':
+    unittest.main()
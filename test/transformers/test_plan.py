@@ -0,0 +1,128 @@
+"""Test the report plan and its optimizer."""
+import unittest
+
+from xetra.transformers.plan import (
+    ReportPlan, build_plan, optimize, push_down_projection
+)
+from xetra.transformers.xetra_transformer import XetraSourceConfig, XetraTargetConfig
+
+
+class TestReportPlan(unittest.TestCase):
+    """Testing the build_plan and optimize functions."""
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # Create source and target configuration
+        conf_dict_src = {
+            'src_first_extract_date': '2021-04-01',
+            'src_columns': [
+                'ISIN', 'Mnemonic', 'Date', 'Time',
+                'StartPrice', 'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'
+            ],
+            'src_col_date': 'Date',
+            'src_col_isin': 'ISIN',
+            'src_col_time': 'Time',
+            'src_col_start_price': 'StartPrice',
+            'src_col_min_price': 'MinPrice',
+            'src_col_max_price': 'MaxPrice',
+            'src_col_traded_vol': 'TradedVolume'
+        }
+        conf_dict_trg = {
+            'trg_col_isin': 'isin',
+            'trg_col_date': 'date',
+            'trg_col_op_price': 'opening_price_eur',
+            'trg_col_clos_price': 'closing_price_eur',
+            'trg_col_min_price': 'minimum_price_eur',
+            'trg_col_max_price': 'maximum_price_eur',
+            'trg_col_dail_trad_vol': 'daily_traded_volume',
+            'trg_col_ch_prev_clos': 'change_prev_closing_%',
+            'trg_key': 'report/xetra_daily_report',
+            'trg_key_date_format': '%Y%m%d_%H%M%S',
+            'trg_format': 'parquet'
+        }
+        self.source_config = XetraSourceConfig(**conf_dict_src)
+        self.target_config = XetraTargetConfig(**conf_dict_trg)
+        self.dates = ['2021-04-14', '2021-04-15', '2021-04-16', '2021-04-19']
+
+    def test_build_plan(self):
+        """Tests the build_plan function scanning everything."""
+
+        # Method execution
+        plan = build_plan(self.source_config, self.target_config,
+            '2021-04-16', self.dates)
+
+        # Test after method execution
+        self.assertIsInstance(plan, ReportPlan)
+        self.assertEqual(plan.scan.dates, self.dates)
+        self.assertEqual(plan.scan.columns, self.source_config.src_columns)
+        self.assertEqual(plan.aggregate.keys, ['ISIN', 'Date'])
+        self.assertEqual(plan.date_filter.column, 'date')
+
+    def test_optimize(self):
+        """Tests the optimize function pushing the projection
+        and the date filter down into the scan."""
+
+        # Expected results
+        columns_exp = [
+            'ISIN', 'Date', 'Time', 'StartPrice',
+            'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
+        dates_exp = ['2021-04-15', '2021-04-16', '2021-04-19']
+        explain_exp = (
+            f"Scan(dates=2021-04-15..2021-04-19, columns={columns_exp}) -> "
+            "Aggregate(keys=['ISIN', 'Date'], order_by='Time') -> "
+            "DateFilter(date >= '2021-04-16')"
+        )
+
+        # Method execution
+        plan = optimize(build_plan(self.source_config, self.target_config,
+            '2021-04-16', self.dates))
+
+        # Test after method execution
+        self.assertEqual(plan.scan.columns, columns_exp)
+        self.assertEqual(plan.scan.dates, dates_exp)
+        self.assertEqual(plan.explain(), explain_exp)
+
+    def test_optimize_rules(self):
+        """Tests the optimize function with selected rules."""
+
+        # Test init
+        plan = build_plan(self.source_config, self.target_config,
+            '2021-04-16', self.dates)
+        plan = plan._replace(
+            date_filter=plan.date_filter._replace(lookback_days=0)
+        )
+
+        # Method execution
+        plan_none = optimize(plan, rules=[])
+        plan_projected = optimize(plan, rules=[push_down_projection])
+        plan_all = optimize(plan)
+
+        # Test after method execution
+        self.assertEqual(plan_none, plan)
+        self.assertEqual(plan_projected.scan.dates, self.dates)
+        self.assertNotIn('Mnemonic', plan_projected.scan.columns)
+        self.assertEqual(plan_all.scan.dates, ['2021-04-16', '2021-04-19'])
+
+
+    def test_optimize_monday(self):
+        """Tests the optimize function keeping the Friday and
+        the weekend before a Monday as lookback dates."""
+
+        # Expected results
+        dates_exp = ['2022-05-13', '2022-05-14', '2022-05-15', '2022-05-16',
+            '2022-05-17']
+
+        # Test init
+        dates = ['2022-05-12'] + dates_exp
+
+        # Method execution
+        plan = optimize(build_plan(self.source_config, self.target_config,
+            '2022-05-16', dates))
+
+        # Test after method execution
+        self.assertEqual(plan.scan.dates, dates_exp)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,23 @@
 """Test XetraETL Methods."""
 import os
+import socket
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import patch
 from io import BytesIO
 
 import boto3
 import pandas as pd
+import yaml
+import pyarrow.parquet as pq
 from moto import mock_s3
+from moto.server import ThreadedMotoServer
 
 from xetra.common.s3 import S3BucketConnector
+from xetra.common.s3_async import AsyncS3BucketConnector
+from xetra.common.manifest import SourceManifest
 from xetra.common.meta_process import MetaProcess
+from xetra.common.custom_exceptions import ExtractionException
 from xetra.transformers.xetra_transformer import XetraETL, XetraSourceConfig, XetraTargetConfig
 
 
@@ -120,6 +128,13 @@ class TestXetraETLMethods(unittest.TestCase):
         ]
 
         self.df_src = pd.DataFrame(data, columns=columns_src)
+
+        # Columns scanned by the report plan, which skips the source
+        # columns that are not aggregated (Mnemonic and EndPrice)
+        self.columns_scan = [
+            'ISIN', 'Date', 'Time', 'StartPrice',
+            'MinPrice', 'MaxPrice', 'TradedVolume'
+        ]
         self.s3_bucket_src.write_df_to_s3(
             '2021-04-15/2021-04-15_BINS_XETR12.csv',
                         self.df_src.loc[0:0], 'csv'
@@ -198,7 +213,7 @@ class TestXetraETLMethods(unittest.TestCase):
         when there are files to be extracted."""
 
         # Expected results
-        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
 
         # Test init
         extract_date = '2021-04-17'
@@ -221,6 +236,294 @@ class TestXetraETLMethods(unittest.TestCase):
         # Test after method execution
         self.assertTrue(df_exp.equals(df_result))
 
+    def test_extract_files_pushdown(self):
+        """Tests the extract method listing and reading only the dates
+        and columns of the optimized report plan."""
+
+        # Expected results
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
+        prefixes_exp = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-15', '2021-04-16', '2021-04-17',
+            '2021-04-18', '2021-04-19'
+        ]
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+
+            with patch.object(self.s3_bucket_src, 'list_objects_by_prefix',
+                    wraps=self.s3_bucket_src.list_objects_by_prefix) as \
+                    list_objects:
+                df_result = xetra_etl.extract()
+
+        # Test after method execution
+        self.assertEqual(
+            [call.args[0] for call in list_objects.call_args_list],
+            prefixes_exp
+        )
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_extract_files_manifest(self):
+        """Tests the extract method serving the listings
+        of past dates from the source manifest."""
+
+        # Expected results
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
+        manifest_key_exp = 'manifest/source_listing.csv'
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18',
+            '2021-04-19', '2021-04-20'
+        ]
+        source_config = self.source_config._replace(
+            src_manifest_key=manifest_key_exp
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            xetra_etl.extract()
+
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+
+            with patch.object(self.s3_bucket_src,
+                    'list_objects_by_prefix') as list_objects, \
+                    patch.object(SourceManifest, 'dates', autospec=True,
+                        side_effect=SourceManifest.dates) as manifest_dates:
+                df_result = xetra_etl.extract()
+
+        # Test after method execution
+        list_objects.assert_not_called()
+        # The dates of the manifest are built once, not once per date
+        manifest_dates.assert_called_once()
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertEqual(
+            self.s3_bucket_trg.list_files_by_prefix(manifest_key_exp),
+            [manifest_key_exp]
+        )
+
+    def test_extract_files_projected(self):
+        """Tests the extract method with a column
+        projection and data types for the source columns."""
+
+        # Expected results
+        columns_exp = ['ISIN', 'Date', 'Time', 'StartPrice', 'TradedVolume']
+        df_exp = self.df_src.loc[1:8, columns_exp].reset_index(drop=True)
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        source_config = self.source_config._replace(
+            src_columns=columns_exp,
+            src_dtypes={
+                'ISIN': 'category',
+                'Date': 'category',
+                'StartPrice': 'float32'
+            }
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_result = xetra_etl.extract()
+
+        # Test after method execution
+        self.assertEqual(list(df_result.columns), columns_exp)
+        self.assertEqual(df_result['ISIN'].dtype, 'category')
+        self.assertEqual(df_result['Date'].dtype, 'category')
+        self.assertEqual(df_result['StartPrice'].dtype, 'float32')
+        self.assertEqual(
+            list(df_result['Date'].astype(str)), list(df_exp['Date'])
+        )
+        self.assertEqual(
+            list(df_result['TradedVolume']), list(df_exp['TradedVolume'])
+        )
+
+    def test_extract_missing_volume_config_dtypes(self):
+        """Tests the extract and transform methods with the src_dtypes
+        of the configuration and a source row without volume."""
+
+        # Test init
+        extract_date = '2021-04-19'
+        extract_date_list = ['2021-04-18', '2021-04-19']
+        with open('config/xetra-config.yml', encoding='utf-8') as config_file:
+            src_dtypes = yaml.safe_load(config_file)['source']['src_dtypes']
+        source_config = self.source_config._replace(
+            src_dtypes=src_dtypes, src_csv_engine='c'
+        )
+        self.src_bucket.put_object(
+            Key='2021-04-19/2021-04-19_BINS_XETR10.csv',
+            Body=','.join(self.df_src.columns) +
+                '\nDE0005557508,DTE,2021-04-19,10:00,18.0,18.1,17.9,18.2,\n'
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            df_extract = xetra_etl.extract()
+            df_report = xetra_etl.transform(df_extract)
+
+        # Test after method execution
+        self.assertEqual(len(df_extract), 6)
+        self.assertEqual(df_extract['TradedVolume'].isna().sum(), 1)
+        self.assertEqual(list(df_report['isin']), ['AT0000A0E9W5'])
+
+    def test_extract_files_pyarrow(self):
+        """Tests the extract method parsing
+        the source files with the pyarrow engine."""
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        source_config = self.source_config._replace(
+            src_dtypes={'ISIN': 'category', 'Date': 'category'}
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_exp = xetra_etl.extract()
+
+            xetra_etl.src_args = source_config._replace(
+                src_csv_engine='pyarrow'
+            )
+            df_result = xetra_etl.extract()
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_extract_day_cache(self):
+        """Tests the extract method reading
+        the extracted days from the day cache."""
+
+        # Expected results
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
+        cache_keys_exp = [
+            f'cache/days/{date}.parquet'
+            for date in ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        ]
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18',
+            '2021-04-19', '2021-04-20'
+        ]
+        source_config = self.source_config._replace(
+            src_day_cache_key='cache/days/'
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_first = xetra_etl.extract()
+
+            with patch.object(self.s3_bucket_src, "read_csv_to_df") as read:
+                df_second = xetra_etl.extract()
+                df_stream = pd.concat(
+                    list(xetra_etl.extract_stream()), ignore_index=True
+                )
+
+        # Test after method execution
+        read.assert_not_called()
+        self.assertEqual(
+            self.s3_bucket_trg.list_files_by_prefix('cache/days/'),
+            cache_keys_exp
+        )
+        self.assertTrue(df_exp.equals(df_first))
+        self.assertTrue(df_exp.equals(df_second))
+        self.assertTrue(df_exp.equals(df_stream))
+
+    def test_extract_files_failed(self):
+        """Tests the extract method
+        when one of the source files cannot be read."""
+
+        # Expected results
+        failed_key = '2021-04-17/2021-04-17_BINS_XETR14.csv'
+        log_exp = f"Error: Failed to read the source file {failed_key}"
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17']
+        read_csv_to_df = self.s3_bucket_src.read_csv_to_df
+
+        def read_or_fail(key, **kwargs):
+            if key == failed_key:
+                raise OSError("Connection reset")
+            return read_csv_to_df(key, **kwargs)
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config._replace(src_max_workers=2),
+                self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+
+            with patch.object(self.s3_bucket_src, "read_csv_to_df",
+                    side_effect=read_or_fail):
+                with self.assertLogs() as log:
+                    with self.assertRaises(ExtractionException) as error:
+                        xetra_etl.extract()
+
+                    # Log test after method execution
+                    self.assertTrue(
+                        any(log_exp in line for line in log.output)
+                    )
+
+        # Test after method execution
+        self.assertIn(failed_key, str(error.exception))
+
     def test_transform_emptydf(self):
         """Tests the transform method with
         an empty DataFrame as input."""
@@ -288,6 +591,294 @@ class TestXetraETLMethods(unittest.TestCase):
         # Test after method execution
         self.assertTrue(df_exp.equals(df_result))
 
+    def test_extract_stream(self):
+        """Tests the extract_stream method
+        when there are files to be extracted."""
+
+        # Expected results
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18',
+            '2021-04-19', '2021-04-20'
+        ]
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config._replace(src_max_workers=3),
+                self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_results = list(xetra_etl.extract_stream())
+
+        # Test after method execution
+        self.assertEqual(len(df_results), 8)
+        self.assertTrue(
+            df_exp.equals(pd.concat(df_results, ignore_index=True))
+        )
+
+    def test_transform_stream_ok(self):
+        """Tests the transform_stream method
+        with one DataFrame per source row in shuffled order."""
+
+        # Expected results
+        df_exp = self.df_report
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        df_inputs = [
+            self.df_src.loc[row:row]
+            for row in [8, 1, 4, 3, 7, 2, 5, 6]
+        ]
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_result = xetra_etl.transform_stream(iter(df_inputs))
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_transform_stream_empty(self):
+        """Tests the transform_stream method
+        without any DataFrames."""
+
+        # Expected results
+        log_exp = "The dataframe is empty. No transformations to apply."
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=['2021-04-17', []]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+
+            with self.assertLogs() as log:
+                df_result = xetra_etl.transform_stream(iter([]))
+
+                # Log test after method execution
+                self.assertIn(log_exp, log.output[1])
+
+        # Test after method execution
+        self.assertTrue(df_result.empty)
+
+    def test_transform_categories(self):
+        """Tests the transform method with
+        categorical ISIN and Date columns as input."""
+
+        # Expected results
+        df_exp = self.df_report
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        df_input = (
+            self.df_src.loc[1:8].reset_index(drop=True)
+            .astype({'ISIN': 'category', 'Date': 'category'})
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_result = xetra_etl.transform(df_input)
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_transform_sharded(self):
+        """Tests the transform method aggregating
+        ISIN shards in a process pool."""
+
+        # Expected results
+        df_exp = self.df_report
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        df_input = self.df_src.loc[1:8].reset_index(drop=True)
+        source_config = self.source_config._replace(
+            src_transform_workers=2, src_transform_shard_rows=len(df_input)
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+
+            with patch('xetra.transformers.xetra_transformer.'
+                    'ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+                df_result = xetra_etl.transform(df_input)
+                df_result_again = xetra_etl.transform(df_input)
+                xetra_etl.close()
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertTrue(df_exp.equals(df_result_again))
+        # One pool is kept for all transforms of the job
+        pool.assert_called_once()
+        self.assertIsNone(xetra_etl._shard_pool)
+        # The workers are not forked from the multi-threaded process
+        self.assertIn(
+            pool.call_args.kwargs['mp_context'].get_start_method(),
+            ['forkserver', 'spawn']
+        )
+
+    def test_transform_sharded_below_threshold(self):
+        """Tests the transform method aggregating serially
+        below src_transform_shard_rows source rows."""
+
+        # Expected results
+        df_exp = self.df_report
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        df_input = self.df_src.loc[1:8].reset_index(drop=True)
+        source_config = self.source_config._replace(
+            src_transform_workers=2,
+            src_transform_shard_rows=len(df_input) + 1
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+
+            with patch('xetra.transformers.xetra_transformer.'
+                    'ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+                df_result = xetra_etl.transform(df_input)
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+        pool.assert_not_called()
+
+    def test_report_state(self):
+        """Tests the report method with a state table
+        holding the prices of the previous date."""
+
+        # Expected results
+        df_exp = self.df_report
+        extract_date_list_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+        df_state_exp = pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-19', 23.58, 24.22]],
+            columns=[
+                'isin', 'date', 'opening_price_eur', 'closing_price_eur'
+            ]
+        )
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        state_key = 'state/last_prices.parquet'
+        target_config = self.target_config._replace(trg_state_key=state_key)
+        self.s3_bucket_trg.write_df_to_s3(
+            state_key,
+            pd.DataFrame(
+                [['AT0000A0E9W5', '2021-04-16', 18.27, 18.27]],
+                columns=df_state_exp.columns
+            ),
+            'parquet'
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, target_config
+            )
+            extract_date_list_result = xetra_etl.plan().scan.dates
+            df_result = xetra_etl.transform(xetra_etl.extract())
+            xetra_etl.load(df_result)
+
+        # Test after method execution
+        self.assertEqual(extract_date_list_exp, extract_date_list_result)
+        self.assertTrue(df_exp.equals(df_result))
+        df_state_result = self.s3_bucket_trg.read_parquet_to_df(state_key)
+        self.assertTrue(df_state_exp.equals(df_state_result))
+
+    def test_report_state_dates_overridden(self):
+        """Tests the report method with a state table and
+        extract dates overridden after the construction."""
+
+        # Expected results
+        scan_dates_exp = ['2021-04-18', '2021-04-19']
+        meta_exp = ['2021-04-18', '2021-04-19']
+
+        # Test init
+        state_key = 'state/last_prices.parquet'
+        target_config = self.target_config._replace(trg_state_key=state_key)
+        self.s3_bucket_trg.write_df_to_s3(
+            state_key,
+            pd.DataFrame(
+                [['AT0000A0E9W5', '2021-04-17', 20.21, 21.19]],
+                columns=[
+                    'isin', 'date', 'opening_price_eur', 'closing_price_eur'
+                ]
+            ),
+            'parquet'
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=['2021-04-17', ['2021-04-16', '2021-04-17']]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, target_config
+            )
+        xetra_etl.extract_date = '2021-04-18'
+        xetra_etl.extract_date_list = [
+            '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        scan_dates_result = xetra_etl.plan().scan.dates
+        result = xetra_etl.report()
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(scan_dates_exp, scan_dates_result)
+        df_meta_result = self.s3_bucket_trg.read_csv_to_df(self.meta_key)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+
     def test_load(self):
         """Tests the load method."""
 
@@ -354,6 +945,114 @@ class TestXetraETLMethods(unittest.TestCase):
             }
         )
 
+    def test_load_partitioned(self):
+        """Tests the load method writing one partition per date,
+        sorted by ISIN."""
+
+        # Expected results
+        keys_exp = [
+            'report/partitioned/date=2021-04-17/part-0.parquet',
+            'report/partitioned/date=2021-04-18/part-0.parquet'
+        ]
+        df_exp = pd.DataFrame({
+            'isin': ['AT0000A0E9W5', 'DE0005557508'],
+            'opening_price_eur': [20.21, 10.0],
+            'closing_price_eur': [18.27, 11.0]
+        })
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18']
+        target_config = self.target_config._replace(
+            trg_partition_key='report/partitioned/', trg_row_group_size=1
+        )
+        df_input = pd.DataFrame({
+            'isin': ['DE0005557508', 'AT0000A0E9W5', 'AT0000A0E9W5'],
+            'date': ['2021-04-17', '2021-04-18', '2021-04-17'],
+            'opening_price_eur': [10.0, 20.58, 20.21],
+            'closing_price_eur': [11.0, 19.27, 18.27]
+        })
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, target_config
+            )
+            result = xetra_etl.load(df_input)
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(
+            self.s3_bucket_trg.list_files_by_prefix('report/'), keys_exp
+        )
+        data = self.trg_bucket.Object(key=keys_exp[0]).get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        self.assertEqual(parquet_file.num_row_groups, 2)
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+        df_meta_result = self.s3_bucket_trg.read_csv_to_df(self.meta_key)
+        self.assertEqual(
+            list(df_meta_result['source_date']), ['2021-04-17', '2021-04-18']
+        )
+
+    def test_load_compression(self):
+        """Tests the load method writing zstd compressed parquet
+        partitions and a gzip compressed csv report."""
+
+        # Expected results
+        keys_exp = [
+            'report/partitioned/date=2021-04-17/part-0.parquet',
+            'report/partitioned/date=2021-04-18/part-0.parquet'
+        ]
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18']
+        target_config = self.target_config._replace(
+            trg_partition_key='report/partitioned/', trg_compression='zstd',
+            trg_compression_level=3, trg_dictionary_columns=['isin']
+        )
+        df_input = pd.DataFrame({
+            'isin': ['DE0005557508', 'AT0000A0E9W5'],
+            'date': ['2021-04-17', '2021-04-18'],
+            'opening_price_eur': [10.0, 20.58]
+        })
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, target_config
+            )
+            result_parquet = xetra_etl.load(df_input)
+            xetra_etl.trg_args = target_config._replace(
+                trg_format='csv', trg_partition_key=None,
+                trg_compression='gzip'
+            )
+            result_csv = xetra_etl.load(df_input)
+
+        # Test after method execution
+        self.assertTrue(result_parquet)
+        self.assertTrue(result_csv)
+        self.assertEqual(
+            self.s3_bucket_trg.list_files_by_prefix('report/partitioned/'),
+            keys_exp
+        )
+        data = self.trg_bucket.Object(key=keys_exp[0]).get().get('Body').read()
+        column_meta = pq.ParquetFile(BytesIO(data)).metadata.row_group(0)
+        self.assertEqual(column_meta.column(0).compression, 'ZSTD')
+        self.assertIn('RLE_DICTIONARY', column_meta.column(0).encodings)
+        self.assertNotIn('RLE_DICTIONARY', column_meta.column(1).encodings)
+        csv_key = self.s3_bucket_trg.list_files_by_prefix(
+            self.target_config.trg_key)[0]
+        self.assertTrue(csv_key.endswith('.csv.gz'))
+        data = self.trg_bucket.Object(key=csv_key).get().get('Body').read()
+        self.assertTrue(df_input.equals(
+            pd.read_csv(BytesIO(data), compression='gzip')
+        ))
+
     def test_report(self):
         """Tests the report method."""
 
@@ -379,9 +1078,16 @@ class TestXetraETLMethods(unittest.TestCase):
             xetra_etl.extract_date = extract_date
             xetra_etl.extract_date_list = extract_date_list
             xetra_etl.meta_update_list = meta_exp
-            xetra_etl.report()
+            metrics = xetra_etl.report()
 
         # Test after method execution
+        self.assertTrue(metrics)
+        self.assertEqual(
+            [stage.name for stage in metrics.stages],
+            ['extract', 'transform', 'load']
+        )
+        self.assertEqual(metrics.stages[1].rows_out, len(df_exp))
+        self.assertEqual(metrics.stages[2].objects_written, 2)
         trg_file = self.s3_bucket_trg.list_files_by_prefix(
             self.target_config.trg_key)[0]
         data = (
@@ -411,6 +1117,242 @@ class TestXetraETLMethods(unittest.TestCase):
             }
         )
 
+    def test_report_arrow_native(self):
+        """Tests the report method with src_arrow_native giving
+        the same partitions, state table and day cache, without
+        converting the data to Pandas dataframes."""
+
+        # Expected results
+        df_exp = self.df_report
+        keys_exp = [
+            f"report/partitioned/date={date}/part-0.parquet"
+            for date in df_exp.date
+        ]
+        df_state_exp = pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-19', 23.58, 24.22]],
+            columns=[
+                'isin', 'date', 'opening_price_eur', 'closing_price_eur'
+            ]
+        )
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+        state_key = 'state/last_prices.parquet'
+        source_config = self.source_config._replace(
+            src_arrow_native=True, src_day_cache_key='cache/days/',
+            src_dtypes={'ISIN': 'category', 'TradedVolume': 'int64'}
+        )
+        target_config = self.target_config._replace(
+            trg_state_key=state_key, trg_partition_key='report/partitioned/'
+        )
+        self.s3_bucket_trg.write_df_to_s3(
+            state_key,
+            pd.DataFrame(
+                [['AT0000A0E9W5', '2021-04-16', 18.27, 18.27]],
+                columns=df_state_exp.columns
+            ),
+            'parquet'
+        )
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]), \
+                patch.object(S3BucketConnector, 'read_parquet_to_df') as \
+                read_parquet_to_df, \
+                patch.object(S3BucketConnector, 'write_df_to_s3',
+                    wraps=self.s3_bucket_trg.write_df_to_s3) as write_df_to_s3:
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, target_config
+            )
+            metrics = xetra_etl.report()
+
+        # Test after method execution
+        self.assertTrue(metrics)
+        self.assertEqual(metrics.stages[1].rows_out, len(df_exp))
+        read_parquet_to_df.assert_not_called()
+        self.assertEqual(
+            [call.args[0] for call in write_df_to_s3.call_args_list],
+            [self.meta_key]
+        )
+        self.assertEqual(
+            self.s3_bucket_trg.list_files_by_prefix('report/'), keys_exp
+        )
+        df_result = pd.concat([
+            self.s3_bucket_trg.read_parquet_to_df(key)
+            .assign(date=date)
+            for key, date in zip(keys_exp, df_exp.date)
+        ], ignore_index=True).loc[:, df_exp.columns]
+        self.assertTrue(df_exp.equals(df_result))
+        df_state_result = self.s3_bucket_trg.read_parquet_to_df(state_key)
+        self.assertTrue(df_state_exp.equals(df_state_result))
+        self.assertEqual(
+            len(self.s3_bucket_trg.list_files_by_prefix('cache/days/')), 3
+        )
+
+        # The cached days are read as Arrow tables without the source files
+        self.src_bucket.objects.all().delete()
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            table_result = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                source_config, target_config
+            ).extract_table()
+        self.assertEqual(table_result.num_rows, 7)
+        self.assertEqual(table_result.column_names, self.columns_scan)
+
+
+class TestXetraETLAsyncMethods(unittest.TestCase):
+    """Test the XetraETL class with async connectors."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local moto server."""
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        cls.s3_endpoint_url = f'http://127.0.0.1:{port}'
+        cls.server = ThreadedMotoServer(
+            ip_address='127.0.0.1', port=port, verbose=False
+        )
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local moto server."""
+
+        cls.server.stop()
+
+    def setUp(self):
+        """Set up the test environment."""
+
+        # Reuse the data and configuration of the synchronous tests
+        self.sync_tests = TestXetraETLMethods()
+        self.sync_tests.setUp()
+        self.sync_tests.tearDown()
+        self.source_config = self.sync_tests.source_config
+        self.target_config = self.sync_tests.target_config
+        self.df_src = self.sync_tests.df_src
+        self.columns_scan = self.sync_tests.columns_scan
+        self.df_report = self.sync_tests.df_report
+        self.meta_key = 'meta_key'
+
+        # Create the source and target bucket on the moto server
+        self.s3 = boto3.resource(
+            service_name='s3', endpoint_url=self.s3_endpoint_url,
+            region_name='us-west-2'
+        )
+        self.buckets = []
+
+        for name in ['src-bucket', 'trg-bucket']:
+            self.s3.create_bucket(
+                Bucket=name,
+                CreateBucketConfiguration={
+                    'LocationConstraint': 'us-west-2'
+                }
+            )
+            self.buckets.append(self.s3.Bucket(name))
+
+        self.s3_bucket_src = AsyncS3BucketConnector(
+            'src-bucket', 'KEY1', 'KEY2', self.s3_endpoint_url
+        )
+        self.s3_bucket_trg = AsyncS3BucketConnector(
+            'trg-bucket', 'KEY1', 'KEY2', self.s3_endpoint_url
+        )
+
+        # Creating source files on the moto server
+        sync_src = self.s3_bucket_src.sync_connector()
+
+        for row in range(len(self.df_src)):
+            date, time = self.df_src.loc[row, ['Date', 'Time']]
+            sync_src.write_df_to_s3(
+                f"{date}/{date}_BINS_XETR{time[:2]}.csv",
+                self.df_src.loc[row:row], 'csv'
+            )
+
+    def tearDown(self):
+        """Delete the buckets."""
+
+        for bucket in self.buckets:
+            bucket.objects.all().delete()
+            bucket.delete()
+
+    def test_extract_files(self):
+        """Tests the extract method
+        with an async source connector."""
+
+        # Expected results
+        df_exp = self.df_src.loc[1:8, self.columns_scan].reset_index(drop=True)
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18',
+            '2021-04-19', '2021-04-20'
+        ]
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            df_result = xetra_etl.extract()
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_report(self):
+        """Tests the report method with
+        async source and target connectors."""
+
+        # Expected results
+        df_exp = self.df_report
+        meta_exp = [
+            '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = [
+            '2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19'
+        ]
+
+        # Method execution
+        with patch.object(MetaProcess, "get_date_list",
+                return_value=[extract_date, extract_date_list]):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key,
+                self.source_config, self.target_config
+            )
+            xetra_etl.extract_date = extract_date
+            xetra_etl.extract_date_list = extract_date_list
+            xetra_etl.meta_update_list = meta_exp
+            result = xetra_etl.report()
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(result.stages[0].objects_read,
+            result.stages[0].s3_calls['GetObject'])
+        self.assertGreater(result.stages[0].bytes_read, 0)
+        trg_bucket = self.s3_bucket_trg.sync_connector()
+        trg_file = trg_bucket.list_files_by_prefix(
+            self.target_config.trg_key)[0]
+        data = self.buckets[1].Object(key=trg_file).get().get('Body').read()
+        df_result = pd.read_parquet(BytesIO(data))
+        self.assertTrue(df_exp.equals(df_result))
+
+        df_meta_result = trg_bucket.read_csv_to_df(self.meta_key)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,187 @@
+"""Local on-disk cache for S3 objects."""
+
+from collections import OrderedDict
+from hashlib import sha256
+from logging import getLogger
+from os import makedirs, path, remove, replace, scandir, utime
+from threading import Lock
+from uuid import uuid4
+
+
+class S3ObjectCache():
+    """Class for caching S3 object bodies on the local disk.
+
+    Entries are keyed by bucket, key and ETag. The Deutsche Boerse
+    source objects never change, and a changed object gets a new ETag,
+    so a cached body is valid as long as its ETag matches.
+
+    The total size of the cache is capped at max_bytes.
+    When the cap is exceeded, the least recently used entries
+    are evicted. The access order survives restarts through
+    the modification times of the cache files.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 1024 ** 3):
+        """Instantiates the S3ObjectCache object.
+
+        parameters
+        ----------
+        cache_dir : str
+        The directory for the cached objects (created if missing)
+
+        max_bytes : int, default 10 GiB
+        The maximum total size of the cached objects
+        """
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._logger = getLogger(__name__)
+
+        makedirs(self.cache_dir, exist_ok=True)
+
+        # Restore the entries of earlier runs, least recently used first
+        files = sorted(
+            (entry for entry in scandir(self.cache_dir)
+                if entry.is_file() and not entry.name.endswith('.tmp')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+
+        for entry in files:
+            self._entries[entry.name] = entry.stat().st_size
+            self._size += entry.stat().st_size
+
+        self._evict()
+
+    def get(self, bucket: str, key: str, etag: str):
+        """Returns the cached body of an S3 object.
+
+        parameters
+        ----------
+        bucket : str
+        The S3 bucket name
+
+        key : str
+        The S3 object key
+
+        etag : str
+        The current ETag of the object
+
+        returns
+        -------
+        body : bytes or None
+        The object body, or None if the object is not cached
+        """
+
+        name = self._entry_name(bucket, key, etag)
+
+        file_path = path.join(self.cache_dir, name)
+
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+
+        try:
+            with open(file_path, 'rb') as cache_file:
+                body = cache_file.read()
+            utime(file_path)
+
+        except FileNotFoundError:
+            # The entry was evicted or removed in the meantime
+            with self._lock:
+                self._size -= self._entries.pop(name, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+            self.hits += 1
+
+        return body
+
+    def put(self, bucket: str, key: str, etag: str, body: bytes):
+        """Stores the body of an S3 object in the cache.
+
+        parameters
+        ----------
+        bucket : str
+        The S3 bucket name
+
+        key : str
+        The S3 object key
+
+        etag : str
+        The ETag of the object
+
+        body : bytes
+        The object body
+        """
+
+        if len(body) > self.max_bytes:
+            return
+
+        name = self._entry_name(bucket, key, etag)
+        file_path = path.join(self.cache_dir, name)
+
+        # Write to a temporary file first, so that readers
+        # never see a partially written cache entry
+        tmp_path = f"{file_path}.{uuid4().hex}.tmp"
+
+        with open(tmp_path, 'wb') as cache_file:
+            cache_file.write(body)
+        replace(tmp_path, file_path)
+
+        with self._lock:
+            self._size += len(body) - self._entries.pop(name, 0)
+            self._entries[name] = len(body)
+            self._evict()
+
+    def stats(self):
+        """Returns the counters of the cache.
+
+        returns
+        -------
+        stats : dict
+        hits, misses, hit_ratio, objects and size_bytes of the cache
+        """
+
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'objects': len(self._entries),
+                'size_bytes': self._size
+            }
+
+    def _evict(self):
+        """Removes least recently used entries above max_bytes.
+
+        The caller must hold the lock (or be the constructor).
+        """
+
+        while self._size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+
+            try:
+                remove(path.join(self.cache_dir, name))
+
+            except FileNotFoundError:
+                pass
+
+            self._logger.debug("Evicted %s from the object cache.", name)
+
+    @staticmethod
+    def _entry_name(bucket: str, key: str, etag: str):
+        """Returns the cache file name of an S3 object version."""
+
+        return sha256(f"{bucket}/{key}/{etag}".encode('utf-8')).hexdigest()
@@ -8,6 +8,17 @@ class S3FileTypes(Enum):
     PARQUET = 'parquet'
 
 
+class CompressionCodecs(Enum):
+    """Supported compression codecs of the target objects.
+
+    Parquet objects support all codecs, csv objects only gzip.
+    """
+
+    ZSTD = 'zstd'
+    SNAPPY = 'snappy'
+    GZIP = 'gzip'
+
+
 class MetaProcessFormat(Enum):
     """Formation for MetaProcess class."""
 
@@ -16,3 +27,27 @@ class MetaProcessFormat(Enum):
     META_SOURCE_DATE_COL = 'source_date'
     META_PROCESS_COL = 'datetime_of_processing'
     META_FILE_FORMAT = 'csv'
+
+
+class ManifestFormat(Enum):
+    """Formation for SourceManifest class."""
+
+    MANIFEST_DATE_COL = 'date'
+    MANIFEST_KEY_COL = 'key'
+    MANIFEST_SIZE_COL = 'size'
+    MANIFEST_ETAG_COL = 'etag'
+
+
+class ReportPartitionFormat(Enum):
+    """Formation for the date partitioned report."""
+
+    PARTITION_FILE_NAME = 'part-0'
+    GZIP_EXTENSION = 'gz'
+
+
+class TransformEngine(Enum):
+    """Supported dataframe engines of the Xetra transform."""
+
+    PANDAS = 'pandas'
+    ARROW = 'arrow'
+    POLARS = 'polars'
@@ -15,3 +15,19 @@ class WrongMetaFileException(Exception):
     Exception that can be raised when the meta file
     format is not correct.
     """
+
+class ExtractionException(Exception):
+    """
+    ExtractionException class
+
+    Exception that can be raised when one or more source
+    files could not be read during the extraction.
+    """
+
+class WrongEngineException(Exception):
+    """
+    WrongEngineException class
+
+    Exception that can be raised when the transform engine
+    given in the configuration is not supported.
+    """
@@ -0,0 +1,175 @@
+"""Persistent listing manifest of the source bucket."""
+
+from datetime import datetime
+from logging import getLogger
+from threading import RLock
+
+from pandas import DataFrame, concat
+
+from xetra.common.constants import ManifestFormat, MetaProcessFormat
+from xetra.common.custom_exceptions import WrongMetaFileException
+from xetra.common.s3 import S3BucketConnector
+
+
+class SourceManifest():
+    """Class for the listing manifest of the source bucket.
+
+    The objects of a past source date never change, so their listing
+    is stored once and reused by later runs instead of listing the
+    source bucket again. The manifest is a csv file with one row per
+    source object: date, key, size and etag. A date without objects
+    (e.g. a holiday) is stored as a single row with an empty key.
+
+    Only finalised dates, i.e. dates before the current date,
+    are added to the manifest. One manifest can be shared by jobs
+    running in several threads, e.g. the chunks of a backfill, whose
+    additions are then written one after the other.
+    """
+
+    def __init__(self, bucket: S3BucketConnector, key: str):
+        """Instantiates the SourceManifest object.
+
+        parameters
+        ----------
+        bucket : S3BucketConnector
+        The S3 bucket holding the manifest
+
+        key : str
+        The key of the manifest object
+        """
+
+        self.bucket = bucket
+        self.key = key
+        self._objects = None
+        self._lock = RLock()
+        self._logger = getLogger(__name__)
+
+    def dates(self):
+        """Returns the source dates stored in the manifest.
+
+        returns
+        -------
+        dates : set
+        The finalised source dates of the manifest
+        """
+
+        with self._lock:
+            return set(self._load())
+
+    def objects(self, date: str):
+        """Returns the stored source objects of a date.
+
+        parameters
+        ----------
+        date : str
+        The source date
+
+        returns
+        -------
+        objects : list or None
+        Dicts with the key, size and etag of the source objects,
+        or None if the date is not in the manifest
+        """
+
+        with self._lock:
+            return self._load().get(date)
+
+    def add(self, objects_by_date: dict):
+        """Adds the listings of finalised dates and writes the manifest.
+
+        Dates from the current date on are skipped, as well as dates
+        that are already in the manifest.
+
+        parameters
+        ----------
+        objects_by_date : dict
+        Lists of dicts with the key, size and etag of the source objects
+        by source date
+
+        returns
+        -------
+        bool : True if the manifest was written, False if not
+        """
+
+        today = datetime.today().strftime(
+            MetaProcessFormat.META_DATE_FORMAT.value
+        )
+
+        with self._lock:
+            manifest = self._load()
+            new_dates = {
+                date: objects for date, objects in objects_by_date.items()
+                if date < today and date not in manifest
+            }
+
+            if not new_dates:
+                return False
+
+            manifest.update(new_dates)
+
+            return self.bucket.write_df_to_s3(self.key, self._to_df(manifest))
+
+    def _load(self):
+        """Reads the manifest object once.
+
+        returns
+        -------
+        manifest : dict
+        The source objects by date
+        """
+
+        if self._objects is not None:
+            return self._objects
+
+        date_col = ManifestFormat.MANIFEST_DATE_COL.value
+        key_col = ManifestFormat.MANIFEST_KEY_COL.value
+        size_col = ManifestFormat.MANIFEST_SIZE_COL.value
+        etag_col = ManifestFormat.MANIFEST_ETAG_COL.value
+
+        try:
+            df_manifest = self.bucket.read_csv_to_df(
+                self.key, dtype={date_col: str, key_col: str, etag_col: str}
+            )
+
+        except self.bucket.exceptions.NoSuchKey:
+            self._logger.info("No source manifest found.")
+            self._objects = {}
+            return self._objects
+
+        if set(df_manifest.columns) != {date_col, key_col, size_col, etag_col}:
+            raise WrongMetaFileException
+
+        objects = {}
+
+        for row in df_manifest.itertuples(index=False):
+            row = row._asdict()
+            objects.setdefault(row[date_col], [])
+
+            if isinstance(row[key_col], str):
+                objects[row[date_col]].append({
+                    'key': row[key_col],
+                    'size': int(row[size_col]),
+                    'etag': row[etag_col]
+                })
+
+        self._objects = objects
+        return self._objects
+
+    @staticmethod
+    def _to_df(manifest: dict):
+        """Converts the source objects by date to the manifest format."""
+
+        date_col = ManifestFormat.MANIFEST_DATE_COL.value
+        key_col = ManifestFormat.MANIFEST_KEY_COL.value
+        size_col = ManifestFormat.MANIFEST_SIZE_COL.value
+        etag_col = ManifestFormat.MANIFEST_ETAG_COL.value
+
+        return concat([
+            DataFrame({
+                date_col: date,
+                key_col: [obj['key'] for obj in objects] or [None],
+                size_col: [obj['size'] for obj in objects] or [0],
+                etag_col: [obj['etag'] for obj in objects] or [None]
+            })
+            for date, objects in sorted(manifest.items())
+        ], ignore_index=True)
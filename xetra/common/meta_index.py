@@ -0,0 +1,195 @@
+"""Index of the processed source dates."""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from pandas import DataFrame
+
+from xetra.common.constants import MetaProcessFormat, S3FileTypes
+from xetra.common.s3 import S3BucketConnector
+
+# Day numbers are counted from the unix epoch
+_EPOCH = date(1970, 1, 1)
+
+
+class MetaDateIndex():
+    """Class for the sorted index of the processed source dates.
+
+    The index holds every processed source date once, as a sorted array
+    of day numbers. It is stored as a Parquet object with a single
+    date column, which is a few bytes per processed date.
+
+    The first missing date and the dates of a range are found
+    by binary search, so the lookup cost stays flat as the
+    history of the meta file grows.
+    """
+
+    def __init__(self, days: np.ndarray = None):
+        """Instantiates the MetaDateIndex object.
+
+        parameters
+        ----------
+        days : ndarray, default None
+        Sorted, unique day numbers since 1970-01-01 (defaults to no dates)
+        """
+
+        self.days = (
+            np.zeros(0, dtype=np.int32) if days is None
+            else np.asarray(days, dtype=np.int32)
+        )
+
+    def __len__(self):
+        """Returns the number of processed dates."""
+
+        return len(self.days)
+
+    def __contains__(self, source_date: date):
+        """Checks whether a source date was processed."""
+
+        day = _to_day(source_date)
+        position = np.searchsorted(self.days, day)
+
+        return position < len(self.days) and self.days[position] == day
+
+    @classmethod
+    def from_dates(cls, dates):
+        """Creates an index from source dates.
+
+        parameters
+        ----------
+        dates : iterable
+        Source dates as date objects or strings in META_DATE_FORMAT
+
+        returns
+        -------
+        MetaDateIndex : The index of the given dates
+        """
+
+        return cls(np.unique(np.array(
+            [_to_day(source_date) for source_date in dates], dtype=np.int32
+        )))
+
+    @classmethod
+    def read(cls, bucket: S3BucketConnector, key: str):
+        """Reads the index object from the S3 bucket.
+
+        raises
+        ------
+        NoSuchKey : If the index object does not exist
+        """
+
+        df_index = bucket.read_parquet_to_df(
+            key, columns=[MetaProcessFormat.META_SOURCE_DATE_COL.value]
+        )
+
+        return cls.from_dates(
+            df_index[MetaProcessFormat.META_SOURCE_DATE_COL.value]
+        )
+
+    def write(self, bucket: S3BucketConnector, key: str):
+        """Writes the index object to the S3 bucket.
+
+        returns
+        -------
+        bool : True if the index was written, False if not
+        """
+
+        return bucket.write_df_to_s3(key, DataFrame({
+            MetaProcessFormat.META_SOURCE_DATE_COL.value:
+                [_to_date(day) for day in self.days]
+        }), S3FileTypes.PARQUET.value)
+
+    def add(self, dates):
+        """Returns a new index with additional source dates.
+
+        parameters
+        ----------
+        dates : iterable
+        Source dates as date objects or strings in META_DATE_FORMAT
+
+        returns
+        -------
+        MetaDateIndex : The index of the old and the new dates
+        """
+
+        return MetaDateIndex(
+            np.union1d(self.days, MetaDateIndex.from_dates(dates).days)
+        )
+
+    def first_missing(self, start_date: date):
+        """Returns the first source date from start_date on
+        that was not processed.
+
+        The processed dates from start_date on are consecutive up to
+        the first missing date. Since the day numbers are sorted and
+        unique, days[position + n] - n is non-decreasing, and the end
+        of the consecutive run is found by binary search.
+
+        parameters
+        ----------
+        start_date : date
+        The first date to check
+
+        returns
+        -------
+        missing_date : date
+        The first missing date
+        """
+
+        start = _to_day(start_date)
+        first = int(np.searchsorted(self.days, start))
+        low, high = first, len(self.days)
+
+        # Find the first position that breaks the consecutive run
+        while low < high:
+            middle = (low + high) // 2
+
+            if self.days[middle] - (middle - first) == start:
+                low = middle + 1
+
+            else:
+                high = middle
+
+        return _to_date(start + (low - first))
+
+    def dates_between(self, start_date: date, end_date: date):
+        """Returns the processed source dates of a date range.
+
+        parameters
+        ----------
+        start_date : date
+        The first date of the range
+
+        end_date : date
+        The last date of the range (inclusive)
+
+        returns
+        -------
+        dates : list
+        The processed dates of the range, as date objects
+        """
+
+        first = np.searchsorted(self.days, _to_day(start_date), side='left')
+        last = np.searchsorted(self.days, _to_day(end_date), side='right')
+
+        return [_to_date(day) for day in self.days[first:last]]
+
+
+def _to_day(source_date):
+    """Converts a date or date string to its day number."""
+
+    if isinstance(source_date, str):
+        source_date = datetime.strptime(
+            source_date, MetaProcessFormat.META_DATE_FORMAT.value
+        ).date()
+
+    elif isinstance(source_date, datetime):
+        source_date = source_date.date()
+
+    return (source_date - _EPOCH).days
+
+
+def _to_date(day):
+    """Converts a day number to its date."""
+
+    return _EPOCH + timedelta(days=int(day))
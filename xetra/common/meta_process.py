@@ -2,12 +2,14 @@
 
 from collections import Counter
 from datetime import datetime, timedelta
+from uuid import uuid4
 from doctest import DONT_ACCEPT_TRUE_FOR_1
 
 from pandas import DataFrame, read_csv, concat, to_datetime
 
 from xetra.common.constants import MetaProcessFormat
 from xetra.common.custom_exceptions import WrongMetaFileException
+from xetra.common.meta_index import MetaDateIndex
 from xetra.common.s3 import S3BucketConnector
 
 
@@ -21,11 +23,21 @@ class MetaProcess():
     The source_date column contains the date of the original data,
     and the datetime_of_processing column contains the date and time of the
     ETL job for creating the daily report.
+
+    Optionally, the processed source dates are also kept in a
+    MetaDateIndex object, so that the extraction dates can be found
+    without reading the whole meta file.
+
+    With a segment prefix, every update is written as a small segment
+    object of its own instead of rewriting the meta file, so concurrent
+    jobs never overwrite each other's rows. compact_meta_file merges
+    the segments into the meta file (and the index) from time to time.
     """
 
     @staticmethod
     def update_meta_file(bucket: S3BucketConnector,
-            extract_date_list: list, meta_key: str = 'meta.csv'):
+            extract_date_list: list, meta_key: str = 'meta.csv',
+            index_key: str = None, segment_prefix: str = None):
         """Updates the meta file with the new dates from the latest report.
 
         The meta file is updated with the date(s)
@@ -43,6 +55,14 @@ class MetaProcess():
         meta_key : str, default 'meta.csv'
         The key of the meta file object
 
+        index_key : str, default None
+        The key of the date index object (defaults to no index)
+
+        segment_prefix : str, default None
+        The key prefix of the meta segments; the new dates are written
+        as a new segment, and the meta file and the index are left
+        to compact_meta_file (defaults to rewriting the meta file)
+
         returns
         -------
         bool : True if writing the meta file was successful, False if not
@@ -63,6 +83,15 @@ class MetaProcess():
             datetime.today().strftime(datetime_format)
         )
 
+        if segment_prefix:
+            # Segment keys sort by the time of processing
+            segment_key = (
+                f"{segment_prefix}"
+                f"{datetime.today().strftime('%Y%m%d_%H%M%S_%f')}_"
+                f"{uuid4().hex[:8]}.{MetaProcessFormat.META_FILE_FORMAT.value}"
+            )
+            return bucket.write_df_to_s3(segment_key, df_new)
+
         try:
             # Create dataframe for old meta data if it exists
             df_old = bucket.read_csv_to_df(key=meta_key)
@@ -74,15 +103,25 @@ class MetaProcess():
             else:
                 df_all = concat([df_old, df_new])
 
-        except bucket.session.client('s3').exceptions.NoSuchKey:
+        except bucket.exceptions.NoSuchKey:
             # If the meta file does not exist in the bucket
             df_all = df_new
 
-        return bucket.write_df_to_s3(meta_key, df_all)
+        is_written = bucket.write_df_to_s3(meta_key, df_all)
+
+        if is_written and index_key:
+            index = (
+                MetaProcess.read_date_index(bucket, meta_key, index_key)
+                or MetaDateIndex()
+            )
+            index.add(extract_date_list).write(bucket, index_key)
+
+        return is_written
 
     @staticmethod
     def get_date_list(bucket: S3BucketConnector,
-            start_date: str, meta_key: str = 'meta.csv'):
+            start_date: str, meta_key: str = 'meta.csv',
+            index_key: str = None, segment_prefix: str = None):
         """Returns a list of extraction dates based on the start date.
         The current date is used as the processing date.
 
@@ -97,6 +136,15 @@ class MetaProcess():
         meta_key : str, default 'meta.csv'
         The key for the meta file
 
+        index_key : str, default None
+        The key of the date index object; the index is used instead
+        of the meta file, and is created from it if it is missing
+        (defaults to reading the meta file)
+
+        segment_prefix : str, default None
+        The key prefix of the meta segments, whose dates are added
+        to the dates of the meta file (defaults to no segments)
+
         returns
         -------
         min_date_result : str
@@ -115,6 +163,16 @@ class MetaProcess():
         )
         today = datetime.today().date()
 
+        if index_key or segment_prefix:
+            index = MetaProcess.read_date_index(
+                bucket, meta_key, index_key, segment_prefix
+            )
+
+            if index is not None:
+                return MetaProcess._date_list_from_index(
+                    index, min_date, today
+                )
+
         try:
             # Read the meta file in the S3 bucket
             df_meta = bucket.read_csv_to_df(meta_key)
@@ -158,7 +216,7 @@ class MetaProcess():
                 date_results = []
                 min_date_result = datetime(2500, 1, 1).strftime(date_format)
 
-        except bucket.session.client('s3').exceptions.NoSuchKey:
+        except bucket.exceptions.NoSuchKey:
             date_results = [
                 (datetime.strptime(start_date, date_format).date() +
                 timedelta(days=x)).strftime(date_format)
@@ -168,3 +226,213 @@ class MetaProcess():
             min_date_result = start_date
 
         return min_date_result, date_results
+
+    @staticmethod
+    def get_date_range(first_date: str, last_date: str):
+        """Returns the extraction dates of an explicit date range.
+
+        The dates start at the weekday before first_date, so that
+        the previous closing prices of first_date are extracted too.
+
+        parameters
+        ----------
+        first_date : str
+        The first date of the range
+
+        last_date : str
+        The last date of the range (inclusive)
+
+        returns
+        -------
+        min_date_result : str
+        The first date of the range
+
+        date_results : list
+        A list of dates from the previous weekday until last_date
+        """
+
+        date_format = MetaProcessFormat.META_DATE_FORMAT.value
+        first = datetime.strptime(first_date, date_format).date()
+        last = datetime.strptime(last_date, date_format).date()
+
+        # There is no trading on weekends
+        min_date = first - timedelta(days=1)
+        while min_date.weekday() >= 5:
+            min_date -= timedelta(days=1)
+
+        date_results = [
+            (min_date + timedelta(days=x)).strftime(date_format)
+            for x in range(0, (last - min_date).days + 1)
+        ]
+
+        return first_date, date_results
+
+    @staticmethod
+    def read_date_index(bucket: S3BucketConnector, meta_key: str,
+            index_key: str = None, segment_prefix: str = None):
+        """Reads the processed dates of the meta file and its segments.
+
+        parameters
+        ----------
+        bucket : S3BucketConnector
+        The S3 bucket holding the meta file and the index
+
+        meta_key : str
+        The key of the meta file
+
+        index_key : str, default None
+        The key of the date index object; a missing index is created
+        from the meta file (defaults to reading the meta file)
+
+        segment_prefix : str, default None
+        The key prefix of the meta segments (defaults to no segments)
+
+        returns
+        -------
+        index : MetaDateIndex or None
+        The date index, or None if neither the index,
+        the meta file nor any segments exist
+        """
+
+        index = None
+
+        try:
+            if index_key:
+                index = MetaDateIndex.read(bucket, index_key)
+
+        except bucket.exceptions.NoSuchKey:
+            pass
+
+        if index is None:
+            try:
+                df_meta = bucket.read_csv_to_df(meta_key)
+
+                # Migrate the processed dates of the meta file to the index
+                index = MetaDateIndex.from_dates(
+                    to_datetime(
+                        df_meta[MetaProcessFormat.META_SOURCE_DATE_COL.value]
+                    ).dt.date
+                )
+
+                if index_key:
+                    index.write(bucket, index_key)
+
+            except bucket.exceptions.NoSuchKey:
+                pass
+
+        if segment_prefix:
+            df_segments = MetaProcess._read_segments(
+                bucket, bucket.list_files_by_prefix(segment_prefix)
+            )
+
+            if df_segments is not None:
+                index = (index or MetaDateIndex()).add(
+                    to_datetime(
+                        df_segments[MetaProcessFormat.META_SOURCE_DATE_COL.value]
+                    ).dt.date
+                )
+
+        return index
+
+    @staticmethod
+    def compact_meta_file(bucket: S3BucketConnector, meta_key: str,
+            segment_prefix: str, index_key: str = None,
+            min_segments: int = 1):
+        """Merges the meta segments into the meta file.
+
+        The meta file and the index are rewritten once for all
+        segments, and the merged segments are deleted afterwards.
+        Segments written while compacting are kept for the next run.
+
+        parameters
+        ----------
+        bucket : S3BucketConnector
+        The S3 bucket holding the meta file and its segments
+
+        meta_key : str
+        The key of the meta file
+
+        segment_prefix : str
+        The key prefix of the meta segments
+
+        index_key : str, default None
+        The key of the date index object (defaults to no index)
+
+        min_segments : int, default 1
+        The number of segments from which on they are compacted
+
+        returns
+        -------
+        bool : True if segments were compacted, False if not
+        """
+
+        segment_keys = bucket.list_files_by_prefix(segment_prefix)
+
+        if not segment_keys or len(segment_keys) < min_segments:
+            return False
+
+        df_segments = MetaProcess._read_segments(bucket, segment_keys)
+
+        try:
+            # Create dataframe for old meta data if it exists
+            df_old = bucket.read_csv_to_df(key=meta_key)
+
+            if Counter(df_old.columns) != Counter(df_segments.columns):
+                # The format of the meta file and the segments are not the same
+                raise WrongMetaFileException
+
+            df_all = concat([df_old, df_segments])
+
+        except bucket.exceptions.NoSuchKey:
+            # If the meta file does not exist in the bucket
+            df_all = df_segments
+
+        if not bucket.write_df_to_s3(meta_key, df_all):
+            return False
+
+        if index_key:
+            MetaDateIndex.from_dates(
+                to_datetime(
+                    df_all[MetaProcessFormat.META_SOURCE_DATE_COL.value]
+                ).dt.date
+            ).write(bucket, index_key)
+
+        return bucket.delete_objects(segment_keys)
+
+    @staticmethod
+    def _read_segments(bucket: S3BucketConnector, segment_keys: list):
+        """Reads the rows of the meta segments.
+
+        returns
+        -------
+        df_segments : DataFrame or None
+        The rows of all segments in key order,
+        or None if there are no segments
+        """
+
+        if not segment_keys:
+            return None
+
+        return concat(
+            [bucket.read_csv_to_df(key) for key in sorted(segment_keys)],
+            ignore_index=True
+        )
+
+    @staticmethod
+    def _date_list_from_index(index: MetaDateIndex, min_date, today):
+        """Returns the extraction dates of get_date_list from the index."""
+
+        date_format = MetaProcessFormat.META_DATE_FORMAT.value
+        missing_date = index.first_missing(min_date + timedelta(days=1))
+
+        if missing_date > today:
+            return datetime(2500, 1, 1).strftime(date_format), []
+
+        # Start one day before the first missing date
+        min_date = missing_date - timedelta(days=1)
+        date_results = [
+            (min_date + timedelta(days=x)).strftime(date_format)
+            for x in range(0, (today - min_date).days + 1)
+        ]
+
+        return missing_date.strftime(date_format), date_results
@@ -0,0 +1,322 @@
+"""Metrics of the stages of the Xetra ETL job."""
+
+import json
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from os import makedirs, path, replace
+from threading import Lock
+from time import perf_counter
+from uuid import uuid4
+
+from xetra.common.constants import MetaProcessFormat
+
+# The resource module exists on Unix only, elsewhere
+# the peak RSS of the stages is not measured
+try:
+    from resource import RUSAGE_SELF, getrusage
+except ImportError:
+    getrusage = None
+
+# Operations that transfer object bodies
+_READ_OPERATIONS = {'GetObject'}
+_WRITE_OPERATIONS = {'PutObject', 'UploadPart'}
+_OBJECT_WRITE_OPERATIONS = {'PutObject', 'CompleteMultipartUpload'}
+
+
+class S3CallRecorder():
+    """Class for counting the S3 requests of the process.
+
+    The recorder is registered on the event system of every S3 client.
+    It counts the calls and sums up the latencies per operation,
+    as well as the objects and bytes read and written. The counters
+    are cumulative; the metrics of a stage are the difference of two
+    snapshots, so requests of concurrent jobs in the same process
+    are attributed to all of their stages.
+    """
+
+    def __init__(self):
+        """Instantiates the S3CallRecorder object."""
+
+        self._lock = Lock()
+        self._calls = Counter()
+        self._latency = Counter()
+        self._totals = Counter()
+
+    def register(self, events):
+        """Registers the recorder on an event system.
+
+        parameters
+        ----------
+        events : event emitter or session
+        client.meta.events of a client, or a botocore or aiobotocore
+        session, whose clients then inherit the handlers
+        """
+
+        events.register('before-parameter-build.s3', self._before_call)
+        events.register('after-call.s3', self._after_call)
+
+    def snapshot(self):
+        """Returns a copy of the counters.
+
+        returns
+        -------
+        snapshot : tuple
+        The calls, latencies and totals as Counters
+        """
+
+        with self._lock:
+            return Counter(self._calls), Counter(self._latency), Counter(self._totals)
+
+    def _before_call(self, model, params, context, **kwargs):
+        """Stores the start time and counts the written bytes."""
+
+        context['metrics_start'] = perf_counter()
+
+        if model.name in _WRITE_OPERATIONS:
+            with self._lock:
+                self._totals['bytes_written'] += _body_size(params.get('Body'))
+
+    def _after_call(self, model, parsed, context, **kwargs):
+        """Counts the call, its latency and the read bytes."""
+
+        latency = perf_counter() - context.pop('metrics_start', perf_counter())
+
+        with self._lock:
+            self._calls[model.name] += 1
+            self._latency[model.name] += latency
+
+            if model.name in _READ_OPERATIONS:
+                self._totals['objects_read'] += 1
+                self._totals['bytes_read'] += parsed.get('ContentLength', 0)
+
+            if model.name in _OBJECT_WRITE_OPERATIONS:
+                self._totals['objects_written'] += 1
+
+
+def _body_size(body):
+    """Returns the size of a request body, 0 for unsized streams."""
+
+    if hasattr(body, 'getbuffer'):
+        return body.getbuffer().nbytes
+
+    return len(body) if hasattr(body, '__len__') else 0
+
+
+def _peak_rss_mb():
+    """Returns the peak RSS of the process in MiB, None if unknown."""
+
+    if getrusage is None:
+        return None
+
+    # ru_maxrss is the high-water mark of the process in KiB
+    return getrusage(RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Recorder of the clients of all connectors
+S3_CALLS = S3CallRecorder()
+
+
+class StageMetrics():
+    """Class for the metrics of a single stage.
+
+    Wall time, S3 requests and peak RSS are measured by
+    ReportMetrics.stage, the row counts are set by the stage itself.
+    The peak RSS is None on platforms without the resource module.
+    """
+
+    def __init__(self, name: str):
+        """Instantiates the StageMetrics object.
+
+        parameters
+        ----------
+        name : str
+        The name of the stage, e.g. 'extract'
+        """
+
+        self.name = name
+        self.seconds = 0.0
+        self.rows_in = None
+        self.rows_out = None
+        self.objects_read = 0
+        self.bytes_read = 0
+        self.objects_written = 0
+        self.bytes_written = 0
+        self.s3_calls = {}
+        self.s3_latency = {}
+        self.peak_rss_mb = 0.0
+
+    def as_dict(self):
+        """Returns the metrics as a dict."""
+
+        return dict(vars(self))
+
+
+class ReportMetrics():
+    """Class for the metrics of one run of XetraETL.report.
+
+    The object is truthy if the report was created successfully,
+    so it can be used like the boolean result of earlier versions.
+    """
+
+    def __init__(self):
+        """Instantiates the ReportMetrics object."""
+
+        self.run_id = uuid4().hex
+        self.started_at = datetime.today().strftime(
+            MetaProcessFormat.META_PROCESS_DATE_FORMAT.value
+        )
+        self.is_successful = False
+        self.stages = []
+
+    def __bool__(self):
+        """Returns whether the report was created successfully."""
+
+        return bool(self.is_successful)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measures a stage of the job.
+
+        parameters
+        ----------
+        name : str
+        The name of the stage
+
+        returns
+        -------
+        stage : StageMetrics
+        The metrics of the stage, for setting the row counts
+        """
+
+        stage = StageMetrics(name)
+        calls, latency, totals = S3_CALLS.snapshot()
+        start = perf_counter()
+
+        try:
+            yield stage
+
+        finally:
+            stage.seconds = perf_counter() - start
+            calls_end, latency_end, totals_end = S3_CALLS.snapshot()
+
+            stage.s3_calls = dict(calls_end - calls)
+            stage.s3_latency = {
+                operation: round(latency_end[operation] - latency[operation], 6)
+                for operation in stage.s3_calls
+            }
+            for total in ['objects_read', 'bytes_read',
+                    'objects_written', 'bytes_written']:
+                setattr(stage, total, totals_end[total] - totals[total])
+
+            stage.peak_rss_mb = _peak_rss_mb()
+            self.stages.append(stage)
+
+    def as_dict(self):
+        """Returns the metrics as a dict."""
+
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'is_successful': self.is_successful,
+            'stages': [stage.as_dict() for stage in self.stages]
+        }
+
+
+class JsonLinesSink():
+    """Class for appending the stage metrics to a JSON-lines file.
+
+    Every stage is written as one line with the run id and start time.
+    """
+
+    def __init__(self, path: str):
+        """Instantiates the JsonLinesSink object.
+
+        parameters
+        ----------
+        path : str
+        The path of the JSON-lines file
+        """
+
+        self.path = path
+
+    def emit(self, metrics: ReportMetrics):
+        """Appends the stages of a run to the file."""
+
+        makedirs(path.dirname(self.path) or '.', exist_ok=True)
+
+        with open(self.path, mode='at', encoding='utf-8') as sink_file:
+            for stage in metrics.stages:
+                sink_file.write(json.dumps({
+                    'run_id': metrics.run_id,
+                    'started_at': metrics.started_at,
+                    'is_successful': metrics.is_successful,
+                    **stage.as_dict()
+                }) + '\n')
+
+
+class PrometheusTextfileSink():
+    """Class for writing the metrics of the last run as a Prometheus textfile.
+
+    The file is meant for the textfile collector of the node exporter.
+    It is replaced atomically, so the collector never reads a partial file.
+    """
+
+    def __init__(self, path: str, prefix: str = 'xetra_etl'):
+        """Instantiates the PrometheusTextfileSink object.
+
+        parameters
+        ----------
+        path : str
+        The path of the .prom file
+
+        prefix : str, default 'xetra_etl'
+        The prefix of the metric names
+        """
+
+        self.path = path
+        self.prefix = prefix
+
+    def emit(self, metrics: ReportMetrics):
+        """Writes the stages of a run to the textfile."""
+
+        gauges = {
+            'stage_seconds': 'seconds',
+            'stage_rows_in': 'rows_in',
+            'stage_rows_out': 'rows_out',
+            'stage_objects_read': 'objects_read',
+            'stage_bytes_read': 'bytes_read',
+            'stage_objects_written': 'objects_written',
+            'stage_bytes_written': 'bytes_written',
+            'stage_peak_rss_megabytes': 'peak_rss_mb'
+        }
+        lines = [
+            f"# TYPE {self.prefix}_success gauge",
+            f"{self.prefix}_success {int(bool(metrics))}"
+        ]
+
+        for gauge, attribute in gauges.items():
+            lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+            lines.extend(
+                f'{self.prefix}_{gauge}{{stage="{stage.name}"}} '
+                f'{getattr(stage, attribute)}'
+                for stage in metrics.stages
+                if getattr(stage, attribute) is not None
+            )
+
+        for gauge, attribute in [('s3_calls', 's3_calls'),
+                ('s3_latency_seconds', 's3_latency')]:
+            lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+            lines.extend(
+                f'{self.prefix}_{gauge}'
+                f'{{stage="{stage.name}",operation="{operation}"}} {value}'
+                for stage in metrics.stages
+                for operation, value in getattr(stage, attribute).items()
+            )
+
+        makedirs(path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{uuid4().hex}.tmp"
+
+        with open(tmp_path, mode='wt', encoding='utf-8') as sink_file:
+            sink_file.write('\n'.join(lines) + '\n')
+        replace(tmp_path, self.path)
@@ -1,14 +1,241 @@
 """Classes and methods for accessing S3."""
 
-from io import StringIO, BytesIO
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from gzip import GzipFile
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BytesIO, RawIOBase
 from logging import getLogger
 from os import environ
 
-from boto3.session import Session
-from pandas import DataFrame, read_csv
+import pyarrow as pa
+import pyarrow.parquet as pq
+from numpy import dtype as np_dtype
+from pandas import DataFrame, read_csv, read_parquet
+from pyarrow.csv import (
+    ConvertOptions, ParseOptions, ReadOptions, WriteOptions, open_csv,
+    write_csv
+)
+from pyarrow.csv import read_csv as read_csv_arrow
 
-from xetra.common.constants import S3FileTypes
+from xetra.common.cache import S3ObjectCache
+from xetra.common.constants import CompressionCodecs, S3FileTypes
 from xetra.common.custom_exceptions import WrongFormatException
+from xetra.common.s3_client import MAX_POOL_CONNECTIONS, get_s3_client
+
+# Number of rows serialised at once when writing csv objects
+CSV_CHUNK_ROWS = 100_000
+
+# Bytes requested from the end of a Parquet object before reading
+# its column chunks; they hold the footer of most objects, and
+# smaller objects are read completely with this single request
+PARQUET_FOOTER_BYTES = 64 * 1024
+
+
+def csv_body_to_df(body: bytes, encoding: str = 'utf-8', sep: str = ',',
+        columns: list = None, dtype: dict = None, engine: str = 'c'):
+    """Parses the body of a csv object to a Pandas dataframe.
+
+    The body is parsed in place, without decoding it to a str first.
+
+    parameters
+    ----------
+    body : bytes
+    The raw body of the csv object
+
+    encoding : str, default 'utf-8'
+    The encoding of the body
+
+    sep : str, default ','
+    The separating character of the columns
+
+    columns : list, default None
+    The columns to parse (defaults to all columns)
+
+    dtype : dict, default None
+    Data types of the columns (defaults to the inferred types)
+
+    engine : str, default 'c'
+    The parser: 'c' for the Pandas parser, 'pyarrow' for the
+    multithreaded Arrow parser
+
+    returns
+    -------
+    data_frame : DataFrame
+    A Pandas dataframe containing the parsed data
+    """
+
+    if engine == 'pyarrow':
+        data_frame = csv_body_to_table(
+            body, encoding, sep, columns, dtype
+        ).to_pandas()
+
+        # Arrow orders the categories by their first appearance, the
+        # Pandas parser sorts them, which sorting the column relies on
+        for column in data_frame.select_dtypes('category'):
+            categories = data_frame[column].cat.categories
+            data_frame[column] = data_frame[column].cat.reorder_categories(
+                categories.sort_values()
+            )
+
+        return data_frame
+
+    return read_csv(BytesIO(body), delimiter=sep, encoding=encoding,
+        usecols=columns, dtype=dtype)
+
+
+def csv_body_to_table(body: bytes, encoding: str = 'utf-8', sep: str = ',',
+        columns: list = None, dtype: dict = None):
+    """Parses the body of a csv object to an Arrow table.
+
+    The Arrow parser reads the body buffer without copying it and
+    converts the blocks on several threads. Dates and times are
+    kept as text, like the Pandas parser does.
+
+    parameters
+    ----------
+    body : bytes
+    The raw body of the csv object
+
+    encoding : str, default 'utf-8'
+    The encoding of the body
+
+    sep : str, default ','
+    The separating character of the columns
+
+    columns : list, default None
+    The columns to parse (defaults to all columns)
+
+    dtype : dict, default None
+    Pandas data types of the columns, e.g. {'ISIN': 'category'}
+    (defaults to the inferred types)
+
+    returns
+    -------
+    table : pyarrow.Table
+    An Arrow table containing the parsed data
+    """
+
+    buffer = pa.py_buffer(body)
+    read_options = ReadOptions(encoding=encoding, use_threads=True)
+    parse_options = ParseOptions(delimiter=sep)
+    column_types = {
+        column: _arrow_type(column_dtype)
+        for column, column_dtype in (dtype or {}).items()
+    }
+
+    # The types inferred from the first block show which columns
+    # would be converted to dates or times
+    with open_csv(pa.BufferReader(buffer), read_options, parse_options,
+            ConvertOptions(include_columns=columns,
+                column_types=column_types)) as reader:
+        for field in reader.schema:
+            if pa.types.is_temporal(field.type):
+                column_types[field.name] = pa.string()
+
+    return read_csv_arrow(
+        pa.BufferReader(buffer),
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=ConvertOptions(
+            include_columns=columns, column_types=column_types
+        )
+    )
+
+
+def parquet_options(row_group_size: int = None, compression: str = None,
+        compression_level: int = None, dictionary_columns: list = None):
+    """Returns the Parquet write options of pyarrow.parquet.write_table.
+
+    Options that are None keep the pyarrow defaults.
+
+    parameters
+    ----------
+    row_group_size : int, default None
+    The maximum number of rows per row group
+
+    compression : str, default None
+    The compression codec, 'zstd', 'snappy' or 'gzip'
+
+    compression_level : int, default None
+    The level of the compression codec
+
+    dictionary_columns : list, default None
+    The only columns that are dictionary encoded
+    (defaults to all columns)
+
+    returns
+    -------
+    options : dict
+    The keyword arguments of write_table, and of DataFrame.to_parquet
+    """
+
+    options = {
+        'row_group_size': row_group_size,
+        'compression': compression,
+        'compression_level': compression_level,
+        'use_dictionary': dictionary_columns
+    }
+
+    return {name: value for name, value in options.items()
+        if value is not None}
+
+
+def check_csv_compression(compression: str):
+    """Checks that a compression codec is supported for csv objects.
+
+    raises
+    ------
+    WrongFormatException : If the codec is not gzip
+    """
+
+    if compression not in (None, CompressionCodecs.GZIP.value):
+        raise WrongFormatException(
+            f"csv objects can only be {CompressionCodecs.GZIP.value} "
+            f"compressed, not {compression}."
+        )
+
+
+@contextmanager
+def csv_output(out_buffer, compression: str = None,
+        compression_level: int = None):
+    """Wraps the output of a csv object in a gzip stream if requested.
+
+    The gzip stream is closed on exit, the output itself is not.
+
+    parameters
+    ----------
+    out_buffer : file object
+    The binary output of the csv object
+
+    compression : str, default None
+    None for plain csv, or 'gzip'
+
+    compression_level : int, default None
+    The gzip level (defaults to 9)
+    """
+
+    check_csv_compression(compression)
+
+    if compression is None:
+        yield out_buffer
+        return
+
+    with GzipFile(fileobj=out_buffer, mode='wb', mtime=0,
+            compresslevel=9 if compression_level is None
+            else compression_level) as gzip_buffer:
+        yield gzip_buffer
+
+
+def _arrow_type(dtype):
+    """Returns the Arrow type of a Pandas data type."""
+
+    if dtype == 'category':
+        return pa.dictionary(pa.int32(), pa.string())
+
+    if dtype in ('str', 'string', 'object', str, object):
+        return pa.string()
+
+    return pa.from_numpy_dtype(np_dtype(dtype))
 
 
 class S3BucketConnector():
@@ -17,7 +244,11 @@ class S3BucketConnector():
     def __init__(self, bucket_name: str,
             access_key: str = environ['AWS_ACCESS_KEY_ID'],
             secret_key: str = environ['AWS_SECRET_ACCESS_KEY'],
-            endpoint_url: str = 'https://s3.amazonaws.com'):
+            endpoint_url: str = 'https://s3.amazonaws.com',
+            cache: S3ObjectCache = None,
+            part_size: int = 8 * 1024 ** 2,
+            max_upload_workers: int = 4,
+            max_pool_connections: int = MAX_POOL_CONNECTIONS):
         """Instantiates the S3BucketConnector object.
 
         This object uses AWS credentials, an endpoint URL,
@@ -37,6 +268,18 @@ class S3BucketConnector():
 
         endpoint_url : str
         Endpoint url for the S3 bucket (defaults to AWS S3 url)
+
+        cache : S3ObjectCache, default None
+        Local cache for the bodies of listed objects (defaults to no cache)
+
+        part_size : int, default 8 MiB
+        Size of the parts of multipart uploads (at least 5 MiB)
+
+        max_upload_workers : int, default 4
+        Number of parts of a multipart upload uploaded concurrently
+
+        max_pool_connections : int, default 50
+        Connection pool size of the shared client of the endpoint
         """
 
         self._name = bucket_name
@@ -44,19 +287,26 @@ class S3BucketConnector():
         self.secret_key = secret_key
         self.endpoint_url = endpoint_url
 
-        self.session = Session(
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key
+        # Connectors of the same endpoint share one client
+        s3_client = get_s3_client(
+            self.access_key, self.secret_key, self.endpoint_url,
+            max_pool_connections
         )
+        self.session = s3_client.session
+        self._client = s3_client.client
 
-        self._s3 = self.session.resource(
-            service_name='s3',
-            endpoint_url=self.endpoint_url
-        )
+        # Exception types of the client, e.g. exceptions.NoSuchKey
+        self.exceptions = s3_client.exceptions
 
-        self._bucket = self._s3.Bucket(self._name)
         self._logger = getLogger(__name__)
 
+        # ETags of the listed objects, used for validating the cache
+        self.cache = cache
+        self._etags = {}
+
+        self.part_size = part_size
+        self.max_upload_workers = max_upload_workers
+
     def list_files_by_prefix(self, prefix: str):
         """Generates a list of csv files for the given prefix.
 
@@ -74,12 +324,50 @@ class S3BucketConnector():
         A list of files with the given prefix
         """
 
-        files = [obj.key
-            for obj in self._bucket.objects.filter(Prefix=prefix)]
-        return files
+        return [obj['key'] for obj in self.list_objects_by_prefix(prefix)]
+
+    def list_objects_by_prefix(self, prefix: str):
+        """Lists the objects for the given prefix with their sizes and ETags.
+
+        parameters
+        ----------
+        prefix : str
+        The prefix of the objects
+
+        returns
+        -------
+        objects : list
+        Dicts with the key, size and etag of the objects
+        """
+
+        paginator = self._client.get_paginator('list_objects')
+        objects = [
+            {'key': obj['Key'], 'size': obj['Size'], 'etag': obj['ETag']}
+            for page in paginator.paginate(Bucket=self._name, Prefix=prefix)
+            for obj in page.get('Contents', [])
+        ]
+        self.register_etags(objects)
+
+        return objects
+
+    def register_etags(self, objects: list):
+        """Registers the ETags of objects listed elsewhere.
+
+        Objects served from a listing manifest can be read
+        from the cache without listing them again.
+
+        parameters
+        ----------
+        objects : list
+        Dicts with the key and etag of the objects
+        """
+
+        for obj in objects:
+            self._etags[obj['key']] = obj['etag']
 
     def read_csv_to_df(self, key: str,
-            encoding: str = 'utf-8', sep: str = ','):
+            encoding: str = 'utf-8', sep: str = ',',
+            columns: list = None, dtype: dict = None, engine: str = 'c'):
         """Reads data from an S3 object to a Pandas dataframe.
 
         parameters
@@ -93,6 +381,17 @@ class S3BucketConnector():
         sep : str, default ','
         The separating character for parsing the file
 
+        columns : list, default None
+        The columns to parse; all other columns are skipped while parsing
+        (defaults to all columns)
+
+        dtype : dict, default None
+        Data types of the columns, e.g. {'ISIN': 'category'}
+        (defaults to the types inferred by Pandas)
+
+        engine : str, default 'c'
+        The csv parser, 'c' or 'pyarrow'
+
         returns
         -------
         data_frame : DataFrame
@@ -102,21 +401,164 @@ class S3BucketConnector():
         self._logger.info("Reading %s/%s/%s ...",
             self.endpoint_url, self._name, key)
 
-        # Get csv file object from the bucket
-        csv_obj = (
-            self._bucket.Object(key=key).get()
-            .get('Body').read().decode(encoding)
-        )
-
-        # Read the csv data to a dataframe
-        data = StringIO(csv_obj)
-        data_frame = read_csv(data, delimiter=sep)
+        # Read the csv object body to a dataframe
+        data_frame = csv_body_to_df(self.__get_obj__(key), encoding, sep,
+            columns, dtype, engine)
 
         self._logger.info("Finished reading object %s.", key)
         return data_frame
 
+    def read_csv_to_table(self, key: str,
+            encoding: str = 'utf-8', sep: str = ',',
+            columns: list = None, dtype: dict = None):
+        """Reads data from an S3 object to an Arrow table.
+
+        parameters
+        ----------
+        key : str
+        The key of the desired S3 object
+
+        encoding : str, default 'utf-8'
+        The encoding which should be used to decode the file
+
+        sep : str, default ','
+        The separating character for parsing the file
+
+        columns : list, default None
+        The columns to parse (defaults to all columns)
+
+        dtype : dict, default None
+        Pandas data types of the columns, e.g. {'ISIN': 'category'}
+        (defaults to the types inferred by Arrow)
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing the desired data
+        """
+
+        self._logger.info("Reading %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        table = csv_body_to_table(self.__get_obj__(key), encoding, sep,
+            columns, dtype)
+
+        self._logger.info("Finished reading object %s.", key)
+        return table
+
+    def read_parquet_to_df(self, key: str, columns: list = None,
+            filters: list = None):
+        """Reads data from a parquet S3 object to a Pandas dataframe.
+
+        With columns or filters, only the footer and the needed
+        column chunks are downloaded, see read_parquet_to_table.
+
+        parameters
+        ----------
+        key : str
+        The key of the desired S3 object
+
+        columns : list, default None
+        The columns to read (defaults to all columns)
+
+        filters : list, default None
+        Row filters in the pyarrow.parquet.read_table format;
+        row groups whose statistics do not match are not downloaded
+
+        returns
+        -------
+        data_frame : DataFrame
+        A Pandas dataframe containing the desired data
+        """
+
+        if columns is None and filters is None:
+            self._logger.info("Reading %s/%s/%s ...",
+                self.endpoint_url, self._name, key)
+
+            data = BytesIO(self.__get_obj__(key))
+            data_frame = read_parquet(data)
+
+            self._logger.info("Finished reading object %s.", key)
+            return data_frame
+
+        return self.read_parquet_to_table(key, columns, filters).to_pandas()
+
+    def read_parquet_to_table(self, key: str, columns: list = None,
+            filters: list = None):
+        """Reads data from a parquet S3 object to an Arrow table.
+
+        Without columns and filters, the whole object is downloaded
+        with a single GET, or served from the cache. Otherwise the end
+        of the object, holding the footer, is requested first, and only
+        the column chunks of the selected columns and matching row
+        groups are downloaded with ranged GETs. Neighbouring chunks
+        are coalesced into one request.
+
+        parameters
+        ----------
+        key : str
+        The key of the desired S3 object
+
+        columns : list, default None
+        The columns to read (defaults to all columns)
+
+        filters : list, default None
+        Row filters in the pyarrow.parquet.read_table format;
+        row groups whose statistics do not match are not downloaded
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing the desired data
+        """
+
+        self._logger.info("Reading %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        if columns is None and filters is None:
+            source = pa.BufferReader(self.__get_obj__(key))
+
+        else:
+            source = self.__open_parquet__(key)
+
+        table = pq.read_table(source, columns=columns, filters=filters,
+            pre_buffer=True)
+
+        self._logger.info("Finished reading object %s.", key)
+        return table
+
+    def open_object(self, key: str, size: int = None):
+        """Opens an S3 object as a seekable file object.
+
+        Reads are served by ranged GETs, so that readers of columnar
+        files such as Parquet only download the byte ranges they need,
+        i.e. the footer and the selected column chunks.
+
+        parameters
+        ----------
+        key : str
+        The key of the desired S3 object
+
+        size : int, default None
+        The size of the object, e.g. from list_objects_by_prefix
+        (defaults to requesting it with a HEAD request)
+
+        returns
+        -------
+        S3RangeReader : A readable, seekable file object of the S3 object
+        """
+
+        if size is None:
+            size = self._client.head_object(
+                Bucket=self._name, Key=key
+            )['ContentLength']
+
+        return S3RangeReader(self._client, self._name, key, size)
+
     def write_df_to_s3(self, key: str,
-            data_frame: DataFrame, format: str = 'csv'):
+            data_frame: DataFrame, format: str = 'csv',
+            row_group_size: int = None, compression: str = None,
+            compression_level: int = None, dictionary_columns: list = None):
         """Writes dataframe to a target S3 bucket.
 
         parameters
@@ -131,6 +573,22 @@ class S3BucketConnector():
         The format of the new S3 object (defaults to 'csv')
         Possible values : {'csv', 'parquet'}
 
+        row_group_size : int, default None
+        The maximum number of rows per Parquet row group
+        (defaults to the pyarrow default)
+
+        compression : str, default None
+        The compression codec, 'zstd', 'snappy' or 'gzip' for Parquet
+        and 'gzip' for csv (defaults to snappy for Parquet and to no
+        compression for csv)
+
+        compression_level : int, default None
+        The level of the compression codec (defaults to the codec default)
+
+        dictionary_columns : list, default None
+        The only Parquet columns that are dictionary encoded
+        (defaults to all columns)
+
         returns
         -------
         bool : True if the write was successful, False if not
@@ -144,14 +602,106 @@ class S3BucketConnector():
             self.endpoint_url, self._name, key)
 
         if format == S3FileTypes.CSV.value:
-            data = data_frame.to_csv(index=False)
-            out_buffer = StringIO(data)
-            return self.__put_obj__(out_buffer, key)
+            check_csv_compression(compression)
+
+            def write_body(out_buffer):
+                # Rows are serialised in chunks, so the CSV text
+                # of the whole dataframe is never held in memory
+                with csv_output(out_buffer, compression,
+                        compression_level) as csv_buffer:
+                    for start in range(0, len(data_frame), CSV_CHUNK_ROWS):
+                        chunk = data_frame.iloc[start:start + CSV_CHUNK_ROWS]
+                        csv_buffer.write(
+                            chunk.to_csv(index=False, header=start == 0)
+                            .encode('utf-8')
+                        )
+
+            return self.__put_obj__(write_body, key)
+
+        if format == S3FileTypes.PARQUET.value:
+            options = parquet_options(row_group_size, compression,
+                compression_level, dictionary_columns)
+
+            def write_body(out_buffer):
+                data_frame.to_parquet(out_buffer, index=False, **options)
+
+            return self.__put_obj__(write_body, key)
+
+        # If the format is neither csv nor parquet
+        self._logger.error(
+            "Error: %s is not a valid file type. No files will be written.",
+            format
+        )
+        raise WrongFormatException
+
+    def write_table_to_s3(self, key: str,
+            table: pa.Table, format: str = 'parquet',
+            row_group_size: int = None, compression: str = None,
+            compression_level: int = None, dictionary_columns: list = None):
+        """Writes an Arrow table to a target S3 bucket.
+
+        The table is serialised by Arrow, without converting it
+        to a Pandas dataframe.
+
+        parameters
+        ----------
+        key : str
+        The object key
+
+        table : pyarrow.Table
+        The Arrow table to convert into an S3 object
+
+        format : str
+        The format of the new S3 object (defaults to 'parquet')
+        Possible values : {'csv', 'parquet'}
+
+        row_group_size : int, default None
+        The maximum number of rows per Parquet row group
+        (defaults to the pyarrow default)
+
+        compression : str, default None
+        The compression codec, 'zstd', 'snappy' or 'gzip' for Parquet
+        and 'gzip' for csv (defaults to snappy for Parquet and to no
+        compression for csv)
+
+        compression_level : int, default None
+        The level of the compression codec (defaults to the codec default)
+
+        dictionary_columns : list, default None
+        The only Parquet columns that are dictionary encoded
+        (defaults to all columns)
+
+        returns
+        -------
+        bool : True if the write was successful, False if not
+        """
+
+        if table.num_rows == 0:
+            self._logger.info("The table is empty! No files will be written.")
+            return False
+
+        self._logger.info("Preparing to write %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        if format == S3FileTypes.CSV.value:
+            check_csv_compression(compression)
+
+            def write_body(out_buffer):
+                with csv_output(out_buffer, compression,
+                        compression_level) as csv_buffer:
+                    write_csv(table, csv_buffer,
+                        WriteOptions(batch_size=CSV_CHUNK_ROWS))
+
+            return self.__put_obj__(write_body, key)
 
         if format == S3FileTypes.PARQUET.value:
-            data = data_frame.to_parquet(index=False)
-            out_buffer = BytesIO(data)
-            return self.__put_obj__(out_buffer, key)
+            options = parquet_options(row_group_size, compression,
+                compression_level, dictionary_columns)
+
+            def write_body(out_buffer):
+                pq.write_table(table, out_buffer, **options)
+
+            return self.__put_obj__(write_body, key)
 
         # If the format is neither csv nor parquet
         self._logger.error(
@@ -159,15 +709,146 @@ class S3BucketConnector():
             format
         )
         raise WrongFormatException
-        return False
 
-    def __put_obj__(self, out_buffer: StringIO or BytesIO, key: str):
+    def delete_objects(self, keys: list):
+        """Deletes objects from the S3 bucket.
+
+        parameters
+        ----------
+        keys : list
+        The keys of the objects to delete
+
+        returns
+        -------
+        bool : True if all objects were deleted, False if not
+        """
+
+        is_deleted = True
+
+        # A delete request takes at most 1000 keys
+        for start in range(0, len(keys), 1000):
+            response = self._client.delete_objects(
+                Bucket=self._name,
+                Delete={
+                    'Objects': [
+                        {'Key': key} for key in keys[start:start + 1000]
+                    ],
+                    'Quiet': True
+                }
+            )
+
+            for error in response.get('Errors', []):
+                self._logger.error(
+                    "Error: Failed to delete %s/%s/%s: %s",
+                    self.endpoint_url, self._name, error['Key'],
+                    error['Message']
+                )
+                is_deleted = False
+
+        return is_deleted
+
+    def __cached_obj__(self, key: str):
+        """Helper method for reading objects from the object cache.
+
+        returns
+        -------
+        body : bytes or None
+        The cached body, or None if the ETag of the object
+        is unknown or the object is not cached
+        """
+
+        etag = self._etags.get(key)
+
+        if self.cache is None or etag is None:
+            return None
+
+        body = self.cache.get(self._name, key, etag)
+
+        if body is not None:
+            self._logger.debug("Read %s from the object cache.", key)
+
+        return body
+
+    def __get_obj__(self, key: str):
+        """Helper method for downloading objects from the S3 bucket.
+
+        Objects whose ETag is known from list_files_by_prefix
+        are served from the cache without any request to S3.
+
+        parameters
+        ----------
+        key : str
+        The S3 object key
+
+        returns
+        -------
+        body : bytes
+        The body of the S3 object
+        """
+
+        body = self.__cached_obj__(key)
+
+        if body is not None:
+            return body
+
+        response = self._client.get_object(Bucket=self._name, Key=key)
+        body = response.get('Body').read()
+
+        if self.cache is not None:
+            self.cache.put(self._name, key, response.get('ETag'), body)
+
+        return body
+
+    def __open_parquet__(self, key: str):
+        """Helper method for opening Parquet objects for ranged reads.
+
+        The last PARQUET_FOOTER_BYTES of the object are requested
+        first. Its size is taken from the response, so no HEAD request
+        is needed, and the footer is read from the downloaded bytes.
+
+        parameters
+        ----------
+        key : str
+        The S3 object key
+
+        returns
+        -------
+        source : pyarrow.BufferReader or S3RangeReader
+        The whole body of small objects or cached objects,
+        a ranged reader of larger objects
+        """
+
+        body = self.__cached_obj__(key)
+
+        if body is not None:
+            return pa.BufferReader(body)
+
+        response = self._client.get_object(
+            Bucket=self._name, Key=key,
+            Range=f"bytes=-{PARQUET_FOOTER_BYTES}"
+        )
+        tail = response['Body'].read()
+        size = int(response['ContentRange'].split('/')[-1])
+
+        if len(tail) == size:
+            if self.cache is not None:
+                self.cache.put(self._name, key, response.get('ETag'), tail)
+
+            return pa.BufferReader(tail)
+
+        return S3RangeReader(self._client, self._name, key, size,
+            tail=tail)
+
+    def __put_obj__(self, write_body, key: str):
         """Helper method for uploading objects to the S3 bucket.
 
+        The body is written into an S3MultipartWriter, which uploads
+        it in parts of part_size while it is being serialised.
+
         parameters
         ----------
-        out_buffer : StringIO or BytesIO
-        The output object for writing the file
+        write_body : callable
+        Function writing the object body into the given file object
 
         key : str
         The S3 object key
@@ -177,11 +858,20 @@ class S3BucketConnector():
         bool : True if the upload was successful, False if not
         """
 
-        new_obj = self._bucket.put_object(
-            Body=out_buffer.getvalue(), Key=key
+        out_buffer = S3MultipartWriter(
+            self._client, self._name, key,
+            part_size=self.part_size, max_workers=self.max_upload_workers
         )
 
-        if not new_obj:
+        try:
+            write_body(out_buffer)
+            out_buffer.close()
+
+        except Exception:
+            out_buffer.abort()
+            raise
+
+        if not out_buffer.response:
             self._logger.error(
                 "Error: Something went wrong while writing %s/%s/%s.",
                 self.endpoint_url, self._name, key
@@ -189,3 +879,268 @@ class S3BucketConnector():
             return False
 
         return True
+
+
+class S3RangeReader(RawIOBase):
+    """Seekable file object reading an S3 object with ranged GETs.
+
+    Every read is a single GET of the requested byte range;
+    seeking does not send any request. The last downloaded range is
+    kept, so that reads within it, e.g. of a small Parquet file after
+    its footer, are served without another request.
+    """
+
+    def __init__(self, client, bucket_name: str, key: str, size: int,
+            tail: bytes = b''):
+        """Instantiates the S3RangeReader object.
+
+        parameters
+        ----------
+        client : botocore client
+        The S3 client used for the downloads
+
+        bucket_name : str
+        The S3 bucket name
+
+        key : str
+        The S3 object key
+
+        size : int
+        The size of the S3 object
+
+        tail : bytes, default b''
+        The already downloaded last bytes of the object,
+        which are kept as the last downloaded range
+        """
+
+        super().__init__()
+        self._client = client
+        self._bucket_name = bucket_name
+        self._key = key
+        self.size = size
+        self._position = 0
+        self._block_start = size - len(tail)
+        self._block = tail
+
+    def readable(self):
+        """The reader is always readable until it is closed."""
+
+        return True
+
+    def seekable(self):
+        """The reader supports random access."""
+
+        return True
+
+    def tell(self):
+        """Returns the current position in the object."""
+
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET):
+        """Moves the position without any request to S3."""
+
+        if whence == SEEK_SET:
+            self._position = offset
+        elif whence == SEEK_CUR:
+            self._position += offset
+        elif whence == SEEK_END:
+            self._position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}.")
+
+        return self._position
+
+    def readinto(self, buffer):
+        """Reads the next bytes of the object into buffer.
+
+        returns
+        -------
+        int : The number of bytes read, 0 at the end of the object
+        """
+
+        if self.closed:
+            raise ValueError("I/O operation on closed S3RangeReader.")
+
+        end = min(self._position + len(buffer), self.size)
+
+        if end <= self._position:
+            return 0
+
+        start = self._position - self._block_start
+
+        if start < 0 or self._block_start + len(self._block) < end:
+            self._block_start = self._position
+            self._block = self._client.get_object(
+                Bucket=self._bucket_name, Key=self._key,
+                Range=f"bytes={self._position}-{end - 1}"
+            )['Body'].read()
+            start = 0
+
+        body = self._block[start:start + end - self._position]
+        buffer[:len(body)] = body
+        self._position += len(body)
+        return len(body)
+
+
+class S3MultipartWriter(RawIOBase):
+    """Writable file object streaming its data into an S3 object.
+
+    Written data is buffered until a part of part_size is complete,
+    which is then uploaded as part of a multipart upload. Up to
+    max_workers parts are uploaded concurrently, and at most that many
+    parts are held in memory, regardless of the size of the object.
+    Objects smaller than part_size are uploaded with a single put_object.
+    """
+
+    def __init__(self, client, bucket_name: str, key: str,
+            part_size: int = 8 * 1024 ** 2, max_workers: int = 4):
+        """Instantiates the S3MultipartWriter object.
+
+        parameters
+        ----------
+        client : botocore client
+        The S3 client used for the upload
+
+        bucket_name : str
+        The S3 bucket name
+
+        key : str
+        The S3 object key
+
+        part_size : int, default 8 MiB
+        Size of the uploaded parts (S3 requires at least 5 MiB)
+
+        max_workers : int, default 4
+        Number of parts uploaded concurrently
+        """
+
+        super().__init__()
+        self._client = client
+        self._bucket_name = bucket_name
+        self._key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.response = None
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._executor = None
+        self._futures = {}
+        self._parts = []
+
+    def writable(self):
+        """The writer is always writable until it is closed."""
+
+        return True
+
+    def tell(self):
+        """Returns the number of bytes written so far."""
+
+        return self._position
+
+    def write(self, data):
+        """Buffers data and uploads every completed part.
+
+        returns
+        -------
+        int : The number of bytes written
+        """
+
+        if self.closed:
+            raise ValueError("I/O operation on closed S3MultipartWriter.")
+
+        self._buffer += data
+        self._position += len(data)
+
+        while len(self._buffer) >= self.part_size:
+            self.__upload_part__(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+        return len(data)
+
+    def close(self):
+        """Uploads the remaining data and completes the upload."""
+
+        if self.closed:
+            return
+
+        try:
+            if self._upload_id is None:
+                # Small objects are uploaded in a single request
+                self.response = self._client.put_object(
+                    Bucket=self._bucket_name, Key=self._key,
+                    Body=bytes(self._buffer)
+                )
+
+            else:
+                if self._buffer:
+                    self.__upload_part__(bytes(self._buffer))
+
+                self.__wait__(len(self._futures))
+                self.response = self._client.complete_multipart_upload(
+                    Bucket=self._bucket_name, Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={'Parts': sorted(
+                        self._parts, key=lambda part: part['PartNumber']
+                    )}
+                )
+
+        finally:
+            self._buffer = bytearray()
+
+            if self._executor is not None:
+                self._executor.shutdown()
+
+            super().close()
+
+    def abort(self):
+        """Aborts the upload and discards the uploaded parts."""
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key,
+                UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+        self._buffer = bytearray()
+        super().close()
+
+    def __upload_part__(self, data: bytes):
+        """Helper method for uploading one part in the background."""
+
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key
+            )['UploadId']
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        # Wait for a free worker, so that memory use stays bounded
+        self.__wait__(len(self._futures) - self.max_workers + 1)
+
+        part_number = len(self._parts) + len(self._futures) + 1
+        future = self._executor.submit(
+            self._client.upload_part,
+            Bucket=self._bucket_name, Key=self._key,
+            UploadId=self._upload_id, PartNumber=part_number, Body=data
+        )
+        self._futures[future] = part_number
+
+    def __wait__(self, count: int):
+        """Helper method for waiting until count uploads are finished."""
+
+        while count > 0 and self._futures:
+            done, _ = wait(self._futures, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                part_number = self._futures.pop(future)
+                self._parts.append({
+                    'ETag': future.result()['ETag'],
+                    'PartNumber': part_number
+                })
+                count -= 1
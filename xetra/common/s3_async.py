@@ -0,0 +1,599 @@
+"""Asyncio-native classes and methods for accessing S3."""
+
+from asyncio import FIRST_COMPLETED, Semaphore, create_task, gather, wait
+from contextlib import asynccontextmanager
+from io import RawIOBase
+from logging import getLogger
+from os import environ
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from pandas import DataFrame
+
+from xetra.common.constants import S3FileTypes
+from xetra.common.custom_exceptions import WrongFormatException
+from xetra.common.metrics import S3_CALLS
+from xetra.common.s3 import (
+    CSV_CHUNK_ROWS, S3BucketConnector, check_csv_compression, csv_body_to_df,
+    csv_body_to_table, csv_output, parquet_options
+)
+
+# Rows per Parquet row group without row_group_size,
+# the default maximum of pyarrow.parquet.write_table
+PARQUET_ROW_GROUP_ROWS = 1024 ** 2
+
+
+class AsyncS3BucketConnector():
+    """Class for interacting with S3 buckets from asyncio code.
+
+    This is the awaitable counterpart of S3BucketConnector.
+    A single event loop can keep up to max_concurrency requests
+    in flight without spending one thread per request.
+
+    The connector can be used as an async context manager, in which
+    case all requests share one client and its connection pool:
+
+        async with AsyncS3BucketConnector('bucket') as bucket:
+            files = await bucket.list_files_by_prefix('2022-05-11')
+
+    Outside of a context a short-lived client is opened per call.
+    """
+
+    def __init__(self, bucket_name: str,
+            access_key: str = environ['AWS_ACCESS_KEY_ID'],
+            secret_key: str = environ['AWS_SECRET_ACCESS_KEY'],
+            endpoint_url: str = 'https://s3.amazonaws.com',
+            max_concurrency: int = 100, part_size: int = 8 * 1024 ** 2,
+            max_upload_workers: int = 4):
+        """Instantiates the AsyncS3BucketConnector object.
+
+        parameters
+        ----------
+        bucket_name : str
+        The S3 bucket name
+
+        access_key : str
+        AWS access key credential (defaults to AWS_ACCESS_KEY_ID)
+
+        secret_key : str
+        AWS secret key credential (defaults to AWS_SECRET_ACCESS_KEY)
+
+        endpoint_url : str
+        Endpoint url for the S3 bucket (defaults to AWS S3 url)
+
+        max_concurrency : int, default 100
+        Maximum number of requests in flight at the same time
+
+        part_size : int, default 8 MiB
+        Size of the parts of multipart uploads
+        (S3 requires at least 5 MiB)
+
+        max_upload_workers : int, default 4
+        Number of parts of a multipart upload uploaded concurrently
+        """
+
+        self._name = bucket_name
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.endpoint_url = endpoint_url
+        self.max_concurrency = max_concurrency
+        self.part_size = part_size
+        self.max_upload_workers = max_upload_workers
+
+        self.session = get_session()
+        S3_CALLS.register(self.session)
+        self._client = None
+        self._client_context = None
+        self._semaphore = None
+        self._logger = getLogger(__name__)
+
+    async def __aenter__(self):
+        """Opens the shared client used by all requests."""
+
+        self._client_context = self.__create_client__()
+        self._client = await self._client_context.__aenter__()
+        self._semaphore = Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Closes the shared client."""
+
+        client_context = self._client_context
+        self._client = None
+        self._client_context = None
+        self._semaphore = None
+        await client_context.__aexit__(*exc_info)
+
+    def copy(self):
+        """Returns an unopened connector for the same bucket.
+
+        An open connector holds the client of its event loop, so jobs
+        running in other threads, e.g. backfill chunks, use copies.
+
+        returns
+        -------
+        AsyncS3BucketConnector : A connector with the same settings
+        """
+
+        return AsyncS3BucketConnector(
+            bucket_name=self._name,
+            access_key=self.access_key,
+            secret_key=self.secret_key,
+            endpoint_url=self.endpoint_url,
+            max_concurrency=self.max_concurrency,
+            part_size=self.part_size,
+            max_upload_workers=self.max_upload_workers
+        )
+
+    def sync_connector(self):
+        """Returns a blocking S3BucketConnector for the same bucket.
+
+        This is used for the small number of requests that are made
+        through synchronous code, such as the meta file handling.
+
+        returns
+        -------
+        S3BucketConnector : A connector with the same credentials
+        """
+
+        return S3BucketConnector(
+            bucket_name=self._name,
+            access_key=self.access_key,
+            secret_key=self.secret_key,
+            endpoint_url=self.endpoint_url,
+            part_size=self.part_size,
+            max_upload_workers=self.max_upload_workers
+        )
+
+    async def list_files_by_prefix(self, prefix: str):
+        """Generates a list of csv files for the given prefix.
+
+        parameters
+        ----------
+        prefix : str
+        The date prefix of the objects
+
+        returns
+        -------
+        files : list
+        A list of files with the given prefix
+        """
+
+        return [
+            obj['key'] for obj in await self.list_objects_by_prefix(prefix)
+        ]
+
+    async def list_objects_by_prefix(self, prefix: str):
+        """Lists the objects for the given prefix with their sizes and ETags.
+
+        parameters
+        ----------
+        prefix : str
+        The prefix of the objects
+
+        returns
+        -------
+        objects : list
+        Dicts with the key, size and etag of the objects
+        """
+
+        objects = []
+
+        async with self.__client__() as client:
+            paginator = client.get_paginator('list_objects_v2')
+
+            async for page in paginator.paginate(
+                    Bucket=self._name, Prefix=prefix):
+                objects.extend(
+                    {'key': obj['Key'], 'size': obj['Size'],
+                        'etag': obj['ETag']}
+                    for obj in page.get('Contents', [])
+                )
+
+        return objects
+
+    async def read_csv_to_df(self, key: str,
+            encoding: str = 'utf-8', sep: str = ',',
+            columns: list = None, dtype: dict = None, engine: str = 'c'):
+        """Reads data from an S3 object to a Pandas dataframe.
+
+        parameters
+        ----------
+        key : str
+        The key of the desired S3 object
+
+        encoding : str, default 'utf-8'
+        The encoding which should be used to decode the file
+
+        sep : str, default ','
+        The separating character for parsing the file
+
+        columns : list, default None
+        The columns to parse; all other columns are skipped while parsing
+        (defaults to all columns)
+
+        dtype : dict, default None
+        Data types of the columns, e.g. {'ISIN': 'category'}
+        (defaults to the types inferred by Pandas)
+
+        engine : str, default 'c'
+        The csv parser, 'c' or 'pyarrow'
+
+        returns
+        -------
+        data_frame : DataFrame
+        A Pandas dataframe containing the desired data
+        """
+
+        self._logger.info("Reading %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        # Get csv file object from the bucket
+        async with self.__client__() as client:
+            response = await client.get_object(Bucket=self._name, Key=key)
+
+            async with response['Body'] as stream:
+                body = await stream.read()
+
+        # Read the csv object body to a dataframe
+        data_frame = csv_body_to_df(body, encoding, sep,
+            columns, dtype, engine)
+
+        self._logger.info("Finished reading object %s.", key)
+        return data_frame
+
+    async def read_csv_to_table(self, key: str,
+            encoding: str = 'utf-8', sep: str = ',',
+            columns: list = None, dtype: dict = None):
+        """Reads data from an S3 object to an Arrow table.
+
+        See S3BucketConnector.read_csv_to_table for the parameters.
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing the desired data
+        """
+
+        self._logger.info("Reading %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        async with self.__client__() as client:
+            response = await client.get_object(Bucket=self._name, Key=key)
+
+            async with response['Body'] as stream:
+                body = await stream.read()
+
+        table = csv_body_to_table(body, encoding, sep, columns, dtype)
+
+        self._logger.info("Finished reading object %s.", key)
+        return table
+
+    async def write_df_to_s3(self, key: str,
+            data_frame: DataFrame, format: str = 'csv',
+            row_group_size: int = None, compression: str = None,
+            compression_level: int = None, dictionary_columns: list = None):
+        """Writes dataframe to a target S3 bucket.
+
+        parameters
+        ----------
+        key : str
+        The object key
+
+        data_frame : DataFrame
+        The Pandas dataframe to convert into an S3 object
+
+        format : str
+        The format of the new S3 object (defaults to 'csv')
+        Possible values : {'csv', 'parquet'}
+
+        row_group_size : int, default None
+        The maximum number of rows per Parquet row group
+        (defaults to the pyarrow default)
+
+        compression : str, default None
+        The compression codec, 'zstd', 'snappy' or 'gzip' for Parquet
+        and 'gzip' for csv (defaults to snappy for Parquet and to no
+        compression for csv)
+
+        compression_level : int, default None
+        The level of the compression codec (defaults to the codec default)
+
+        dictionary_columns : list, default None
+        The only Parquet columns that are dictionary encoded
+        (defaults to all columns)
+
+        returns
+        -------
+        bool : True if the write was successful, False if not
+        """
+
+        if data_frame.empty:
+            self._logger.info("The data frame is empty! No files will be written.")
+            return False
+
+        self._logger.info("Preparing to write %s/%s/%s ...",
+            self.endpoint_url, self._name, key)
+
+        if format == S3FileTypes.CSV.value:
+            check_csv_compression(compression)
+
+            async def write_body(out_buffer):
+                # Rows are serialised in chunks, and the completed parts
+                # are uploaded after every chunk
+                with csv_output(out_buffer, compression,
+                        compression_level) as csv_buffer:
+                    for start in range(0, len(data_frame), CSV_CHUNK_ROWS):
+                        chunk = data_frame.iloc[start:start + CSV_CHUNK_ROWS]
+                        csv_buffer.write(
+                            chunk.to_csv(index=False, header=start == 0)
+                            .encode('utf-8')
+                        )
+                        await out_buffer.upload_parts()
+
+            return await self.__put_obj__(write_body, key)
+
+        if format == S3FileTypes.PARQUET.value:
+            options = parquet_options(None, compression, compression_level,
+                dictionary_columns)
+            rows = row_group_size or PARQUET_ROW_GROUP_ROWS
+
+            async def write_body(out_buffer):
+                # Row groups are serialised one at a time, and the
+                # completed parts are uploaded after every row group
+                table = pa.Table.from_pandas(data_frame, preserve_index=False)
+
+                with pq.ParquetWriter(out_buffer, table.schema,
+                        **options) as writer:
+                    for start in range(0, table.num_rows, rows):
+                        writer.write_table(table.slice(start, rows))
+                        await out_buffer.upload_parts()
+
+            return await self.__put_obj__(write_body, key)
+
+        # If the format is neither csv nor parquet
+        self._logger.error(
+            "Error: %s is not a valid file type. No files will be written.",
+            format
+        )
+        raise WrongFormatException
+
+    async def __put_obj__(self, write_body, key: str):
+        """Helper method for uploading objects to the S3 bucket.
+
+        The body is written into an AsyncS3MultipartWriter, which uploads
+        it in parts of part_size while it is being serialised.
+
+        parameters
+        ----------
+        write_body : coroutine function
+        Function writing the object body into the given writer
+
+        key : str
+        The S3 object key
+
+        returns
+        -------
+        bool : True if the upload was successful, False if not
+        """
+
+        async with self.__client__() as client:
+            out_buffer = AsyncS3MultipartWriter(
+                client, self._name, key, part_size=self.part_size,
+                max_workers=self.max_upload_workers
+            )
+
+            try:
+                await write_body(out_buffer)
+                await out_buffer.aclose()
+
+            except Exception:
+                await out_buffer.abort()
+                raise
+
+        if not out_buffer.response:
+            self._logger.error(
+                "Error: Something went wrong while writing %s/%s/%s.",
+                self.endpoint_url, self._name, key
+            )
+            return False
+
+        return True
+
+    def __create_client__(self):
+        """Helper method for creating a new aiobotocore client context."""
+
+        return self.session.create_client(
+            's3',
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+            endpoint_url=self.endpoint_url,
+            config=AioConfig(max_pool_connections=self.max_concurrency)
+        )
+
+    @asynccontextmanager
+    async def __client__(self):
+        """Helper context yielding a client for a single request.
+
+        Inside an open connector the shared client is used and the
+        number of requests in flight is bounded by max_concurrency.
+        """
+
+        if self._client is None:
+            async with self.__create_client__() as client:
+                yield client
+            return
+
+        async with self._semaphore:
+            yield self._client
+
+
+class AsyncS3MultipartWriter(RawIOBase):
+    """Writable file object streaming its data into an S3 object
+    from asyncio code.
+
+    This is the awaitable counterpart of S3MultipartWriter. Writes are
+    synchronous, so that serialisers such as GzipFile and ParquetWriter
+    can write into the object; they only buffer the data.
+    upload_parts uploads the completed parts of part_size as parts
+    of a multipart upload. Up to max_workers parts are uploaded
+    concurrently as tasks, so the writer holds at most that many parts
+    and the data written since the last upload_parts.
+    Objects smaller than part_size are uploaded with a single put_object.
+    """
+
+    def __init__(self, client, bucket_name: str, key: str,
+            part_size: int = 8 * 1024 ** 2, max_workers: int = 4):
+        """Instantiates the AsyncS3MultipartWriter object.
+
+        parameters
+        ----------
+        client : aiobotocore client
+        The S3 client used for the upload
+
+        bucket_name : str
+        The S3 bucket name
+
+        key : str
+        The S3 object key
+
+        part_size : int, default 8 MiB
+        Size of the uploaded parts (S3 requires at least 5 MiB)
+
+        max_workers : int, default 4
+        Number of parts uploaded concurrently
+        """
+
+        super().__init__()
+        self._client = client
+        self._bucket_name = bucket_name
+        self._key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.response = None
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._tasks = {}
+        self._parts = []
+
+    def writable(self):
+        """The writer is always writable until it is closed."""
+
+        return True
+
+    def tell(self):
+        """Returns the number of bytes written so far."""
+
+        return self._position
+
+    def write(self, data):
+        """Buffers data until the next upload_parts.
+
+        returns
+        -------
+        int : The number of bytes written
+        """
+
+        if self.closed:
+            raise ValueError("I/O operation on closed AsyncS3MultipartWriter.")
+
+        self._buffer += data
+        self._position += len(data)
+
+        return len(data)
+
+    async def upload_parts(self):
+        """Uploads every completed part of the buffered data."""
+
+        while len(self._buffer) >= self.part_size:
+            await self.__upload_part__(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+
+    async def aclose(self):
+        """Uploads the remaining data and completes the upload."""
+
+        if self.closed:
+            return
+
+        try:
+            await self.upload_parts()
+
+            if self._upload_id is None:
+                # Small objects are uploaded in a single request
+                self.response = await self._client.put_object(
+                    Bucket=self._bucket_name, Key=self._key,
+                    Body=bytes(self._buffer)
+                )
+
+            else:
+                if self._buffer:
+                    await self.__upload_part__(bytes(self._buffer))
+
+                await self.__wait__(len(self._tasks))
+                self.response = await self._client.complete_multipart_upload(
+                    Bucket=self._bucket_name, Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={'Parts': sorted(
+                        self._parts, key=lambda part: part['PartNumber']
+                    )}
+                )
+
+        finally:
+            self._buffer = bytearray()
+            super().close()
+
+    async def abort(self):
+        """Aborts the upload and discards the uploaded parts."""
+
+        # Pending parts are cancelled before the upload is aborted
+        for task in self._tasks:
+            task.cancel()
+
+        await gather(*self._tasks, return_exceptions=True)
+        self._tasks = {}
+
+        if self._upload_id is not None:
+            await self._client.abort_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key,
+                UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+        self._buffer = bytearray()
+        super().close()
+
+    async def __upload_part__(self, data: bytes):
+        """Helper method for uploading one part in a task."""
+
+        if self._upload_id is None:
+            self._upload_id = (await self._client.create_multipart_upload(
+                Bucket=self._bucket_name, Key=self._key
+            ))['UploadId']
+
+        # Wait for a free worker, so that memory use stays bounded
+        await self.__wait__(len(self._tasks) - self.max_workers + 1)
+
+        part_number = len(self._parts) + len(self._tasks) + 1
+        task = create_task(self._client.upload_part(
+            Bucket=self._bucket_name, Key=self._key,
+            UploadId=self._upload_id, PartNumber=part_number, Body=data
+        ))
+        self._tasks[task] = part_number
+
+    async def __wait__(self, count: int):
+        """Helper method for waiting until count uploads are finished."""
+
+        while count > 0 and self._tasks:
+            done, _ = await wait(self._tasks, return_when=FIRST_COMPLETED)
+
+            for task in done:
+                part_number = self._tasks.pop(task)
+                self._parts.append({
+                    'ETag': task.result()['ETag'],
+                    'PartNumber': part_number
+                })
+                count -= 1
@@ -0,0 +1,98 @@
+"""Process-wide pool of S3 clients."""
+
+from threading import Lock
+from typing import NamedTuple
+
+from boto3.session import Session
+from botocore.config import Config
+
+from xetra.common.metrics import S3_CALLS
+
+# Default size of the connection pool of a client
+MAX_POOL_CONNECTIONS = 50
+
+
+class S3Client(NamedTuple):
+    """Class for a shared S3 session and client.
+
+    session: boto3 session holding the credentials
+    client: low-level S3 client
+    exceptions: exception types of the client, e.g. exceptions.NoSuchKey
+    """
+
+    session: Session
+    client: object
+    exceptions: object
+
+
+_clients = {}
+_lock = Lock()
+
+
+def get_s3_client(access_key: str, secret_key: str, endpoint_url: str,
+        max_pool_connections: int = MAX_POOL_CONNECTIONS,
+        tcp_keepalive: bool = True):
+    """Returns the shared S3 client for the credentials and endpoint.
+
+    Creating a session and a client loads the service model and
+    resolves the endpoint, which dominates the runtime of short runs.
+    The client is therefore created once per process, credentials,
+    endpoint and pool settings, and shared by all connectors.
+    boto3 clients are thread-safe, and their connection pool keeps
+    the connections of all connectors alive between requests.
+    boto3 resources are not thread-safe, so no resource is shared.
+
+    parameters
+    ----------
+    access_key : str
+    AWS access key credential
+
+    secret_key : str
+    AWS secret key credential
+
+    endpoint_url : str
+    Endpoint url of the S3 service
+
+    max_pool_connections : int, default 50
+    Maximum number of open connections of the client
+
+    tcp_keepalive : bool, default True
+    Whether TCP keep-alive is enabled on the connections
+
+    returns
+    -------
+    S3Client : The shared session, client and exception types
+    """
+
+    key = (access_key, secret_key, endpoint_url,
+        max_pool_connections, tcp_keepalive)
+
+    with _lock:
+        if key not in _clients:
+            session = Session(
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key
+            )
+            client = session.client(
+                service_name='s3',
+                endpoint_url=endpoint_url,
+                config=Config(
+                    max_pool_connections=max_pool_connections,
+                    tcp_keepalive=tcp_keepalive
+                )
+            )
+            S3_CALLS.register(client.meta.events)
+            _clients[key] = S3Client(
+                session=session,
+                client=client,
+                exceptions=client.exceptions
+            )
+
+        return _clients[key]
+
+
+def clear_s3_clients():
+    """Drops the shared clients, e.g. after forking a process."""
+
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,281 @@
+"""Reader of the Xetra report"""
+
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from xetra.common.constants import S3FileTypes
+from xetra.common.custom_exceptions import WrongFormatException
+from xetra.common.s3 import S3BucketConnector
+from xetra.transformers.xetra_transformer import XetraTargetConfig
+
+
+class XetraReportReader():
+    """Class for reading the Xetra report from the target bucket.
+
+    Only the data of the requested ISINs, dates and columns
+    is downloaded:
+
+    - date partitions outside the date range are skipped by their key
+    - row groups whose ISIN or date statistics exclude the request
+      are skipped
+    - only the column chunks of the requested columns are read,
+      with ranged GETs
+
+    The report is read from the date partitions under trg_partition_key,
+    or from the report objects under trg_key if the report is not
+    partitioned. Only Parquet reports can be read.
+    """
+
+    def __init__(self, bucket: S3BucketConnector,
+            trg_args: XetraTargetConfig, max_workers: int = 8):
+        """Constructor for the report reader.
+
+        parameters
+        ----------
+        bucket : S3BucketConnector
+        Connection to the target S3 bucket
+
+        trg_args : XetraTargetConfig
+        NamedTuple class with the target configuration of the report
+
+        max_workers : int, default 8
+        Number of report objects read concurrently
+        """
+
+        if trg_args.trg_format != S3FileTypes.PARQUET.value:
+            raise WrongFormatException(
+                f"Only {S3FileTypes.PARQUET.value} reports can be read."
+            )
+
+        self._logger = getLogger(__name__)
+        self.bucket = bucket
+        self.trg_args = trg_args
+        self.max_workers = max_workers
+
+    def columns(self):
+        """Returns the columns of the report in their order."""
+
+        return [
+            self.trg_args.trg_col_isin,
+            self.trg_args.trg_col_date,
+            self.trg_args.trg_col_op_price,
+            self.trg_args.trg_col_clos_price,
+            self.trg_args.trg_col_min_price,
+            self.trg_args.trg_col_max_price,
+            self.trg_args.trg_col_dail_trad_vol,
+            self.trg_args.trg_col_ch_prev_clos
+        ]
+
+    def read_table(self, isins: list = None, start_date: str = None,
+            end_date: str = None, columns: list = None):
+        """Reads the matching rows of the report to an Arrow table.
+
+        parameters
+        ----------
+        isins : list, default None
+        The ISINs to read (defaults to all ISINs)
+
+        start_date : str, default None
+        The first date to read (defaults to the first date of the report)
+
+        end_date : str, default None
+        The last date to read, inclusive
+        (defaults to the last date of the report)
+
+        columns : list, default None
+        The columns to read (defaults to all report columns)
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing the matching rows
+        """
+
+        columns = list(columns or self.columns())
+        isins = sorted(set(isins)) if isins is not None else None
+
+        objects = self._list_objects(start_date, end_date)
+        self._logger.info("Reading %s report objects ...", len(objects))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tables = [
+                table for table in executor.map(
+                    lambda obj: self._read_object(
+                        *obj, isins, start_date, end_date, columns
+                    ),
+                    objects
+                )
+                if table is not None
+            ]
+
+        if not tables:
+            return pa.table({column: [] for column in columns})
+
+        table = pa.concat_tables(tables, promote_options='default')
+
+        self._logger.info("Finished reading %s report rows.", table.num_rows)
+        return table
+
+    def read_df(self, isins: list = None, start_date: str = None,
+            end_date: str = None, columns: list = None):
+        """Reads the matching rows of the report to a Pandas dataframe.
+
+        See read_table for the parameters.
+
+        returns
+        -------
+        data_frame : DataFrame
+        A Pandas dataframe containing the matching rows
+        """
+
+        return self.read_table(isins, start_date, end_date, columns).to_pandas()
+
+    def _list_objects(self, start_date: str, end_date: str):
+        """Lists the report objects that can contain the date range.
+
+        returns
+        -------
+        objects : list
+        Tuples of the object dict and the date of its partition,
+        or None for objects of a report that is not partitioned
+        """
+
+        if not self.trg_args.trg_partition_key:
+            return [
+                (obj, None)
+                for obj in self.bucket.list_objects_by_prefix(
+                    self.trg_args.trg_key
+                )
+                if obj['key'].endswith(f".{S3FileTypes.PARQUET.value}")
+            ]
+
+        prefix = self.trg_args.trg_partition_key
+        partition_col = f"{self.trg_args.trg_col_date}="
+        objects = []
+
+        for obj in self.bucket.list_objects_by_prefix(prefix):
+            partition = obj['key'][len(prefix):].split('/')[0]
+
+            if not partition.startswith(partition_col):
+                continue
+
+            date = partition[len(partition_col):]
+
+            if ((start_date is None or date >= start_date)
+                    and (end_date is None or date <= end_date)):
+                objects.append((obj, date))
+
+        return objects
+
+    def _read_object(self, obj: dict, date: str, isins: list,
+            start_date: str, end_date: str, columns: list):
+        """Reads the matching row groups and columns of a report object.
+
+        returns
+        -------
+        table : pyarrow.Table or None
+        The matching rows, or None if no row group matches
+        """
+
+        isin_col = self.trg_args.trg_col_isin
+        date_col = self.trg_args.trg_col_date
+
+        parquet_file = pq.ParquetFile(
+            self.bucket.open_object(obj['key'], obj['size']), pre_buffer=True
+        )
+        metadata = parquet_file.metadata
+        names = metadata.schema.names
+
+        # Row groups are skipped by the statistics of the filtered columns
+        row_groups = [
+            number for number in range(metadata.num_row_groups)
+            if self._row_group_matches(
+                metadata.row_group(number), names,
+                isins, start_date if date is None else None,
+                end_date if date is None else None
+            )
+        ]
+
+        if not row_groups:
+            return None
+
+        filter_cols = [isin_col] if isins is not None else []
+        if date is None and (start_date or end_date):
+            filter_cols.append(date_col)
+
+        table = parquet_file.read_row_groups(row_groups, columns=[
+            name for name in names if name in columns or name in filter_cols
+        ])
+
+        # Rows of other ISINs and dates within the row groups
+        mask = None
+        if isins is not None:
+            mask = pc.is_in(table[isin_col], value_set=pa.array(isins))
+        if date is None and start_date:
+            mask = _and(mask, pc.greater_equal(table[date_col], start_date))
+        if date is None and end_date:
+            mask = _and(mask, pc.less_equal(table[date_col], end_date))
+        if mask is not None:
+            table = table.filter(mask)
+
+        # The date of a partition is part of its key
+        if date is not None and date_col in columns:
+            table = table.append_column(
+                date_col, pa.array([date] * table.num_rows, pa.string())
+            )
+
+        return table.select(columns)
+
+    def _row_group_matches(self, row_group, names: list, isins: list,
+            start_date: str, end_date: str):
+        """Checks whether the statistics of a row group match the request.
+
+        Row groups without statistics always match.
+        """
+
+        if isins is not None:
+            statistics = _statistics(row_group, names,
+                self.trg_args.trg_col_isin)
+
+            if statistics is not None:
+                position = bisect_left(isins, statistics.min)
+
+                if (position == len(isins)
+                        or isins[position] > statistics.max):
+                    return False
+
+        if start_date or end_date:
+            statistics = _statistics(row_group, names,
+                self.trg_args.trg_col_date)
+
+            if statistics is not None and (
+                    (start_date and statistics.max < start_date)
+                    or (end_date and statistics.min > end_date)):
+                return False
+
+        return True
+
+
+def _statistics(row_group, names: list, column: str):
+    """Returns the min/max statistics of a column chunk, or None."""
+
+    if column not in names:
+        return None
+
+    statistics = row_group.column(names.index(column)).statistics
+
+    if statistics is None or not statistics.has_min_max:
+        return None
+
+    return statistics
+
+
+def _and(mask, condition):
+    """Combines two boolean filter masks, the first may be None."""
+
+    return condition if mask is None else pc.and_(mask, condition)
@@ -0,0 +1,247 @@
+"""Parallel backfill of the Xetra report over a date range."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from logging import getLogger
+
+from xetra.common.constants import MetaProcessFormat, S3FileTypes
+from xetra.common.manifest import SourceManifest
+from xetra.common.meta_process import MetaProcess
+from xetra.common.s3 import S3BucketConnector
+from xetra.transformers.xetra_transformer import (
+    XetraETL, XetraSourceConfig, XetraTargetConfig, _is_async, merge_states
+)
+
+
+def plan_chunks(start_date: str, end_date: str, chunk_days: int = 30):
+    """Splits a date range into consecutive chunks.
+
+    parameters
+    ----------
+    start_date : str
+    The first date of the range
+
+    end_date : str
+    The last date of the range (inclusive)
+
+    chunk_days : int, default 30
+    The number of calendar days per chunk
+
+    returns
+    -------
+    chunks : list
+    Tuples of the first and last date of every chunk
+    """
+
+    date_format = MetaProcessFormat.META_DATE_FORMAT.value
+    first = datetime.strptime(start_date, date_format).date()
+    end = datetime.strptime(end_date, date_format).date()
+    chunks = []
+
+    while first <= end:
+        last = min(first + timedelta(days=chunk_days - 1), end)
+        chunks.append((first.strftime(date_format), last.strftime(date_format)))
+        first = last + timedelta(days=1)
+
+    return chunks
+
+
+class XetraBackfill():
+    """Class for backfilling the Xetra report over a date range.
+
+    The range is split into chunks, which are processed concurrently
+    by XetraETL jobs, each writing its own report object. Every chunk
+    also extracts the trading day before its first date, so the change
+    since the previous closing is continuous across the chunks.
+    The meta file and the state table are updated once after all
+    chunks have finished, with the dates and the last prices of the
+    successful chunks. The chunks share one source manifest.
+    """
+
+    def __init__(self, src_bucket: S3BucketConnector,
+            trg_bucket: S3BucketConnector, meta_key: str,
+            src_args: XetraSourceConfig, trg_args: XetraTargetConfig,
+            chunk_days: int = 30, max_workers: int = 4,
+            meta_index_key: str = None, meta_segment_prefix: str = None,
+            metrics_sinks: list = None):
+        """Constructor for the Xetra backfill.
+
+        parameters
+        ----------
+        src_bucket, trg_bucket, meta_key, src_args, trg_args :
+        See XetraETL
+
+        chunk_days : int, default 30
+        The number of calendar days per chunk
+
+        max_workers : int, default 4
+        The number of chunks processed concurrently
+
+        meta_index_key, meta_segment_prefix, metrics_sinks :
+        See XetraETL
+        """
+
+        self._logger = getLogger(__name__)
+        self.src_bucket = src_bucket
+        self.trg_bucket = trg_bucket
+        self.meta_key = meta_key
+        self.src_args = src_args
+        self.trg_args = trg_args
+        self.chunk_days = chunk_days
+        self.max_workers = max_workers
+        self.meta_index_key = meta_index_key
+        self.meta_segment_prefix = meta_segment_prefix
+        self.metrics_sinks = metrics_sinks
+        self._manifest = None
+
+        # The meta file, the state table and the manifest are read and
+        # written synchronously, also with an async target connector
+        if _is_async(self.trg_bucket):
+            self._meta_bucket = self.trg_bucket.sync_connector()
+
+        else:
+            self._meta_bucket = self.trg_bucket
+
+        if self.src_args.src_manifest_key:
+            self._manifest = SourceManifest(
+                self._meta_bucket, self.src_args.src_manifest_key
+            )
+
+    def run(self, start_date: str, end_date: str):
+        """Processes the date range, updates the meta file and the state table.
+
+        parameters
+        ----------
+        start_date : str
+        The first date of the range
+
+        end_date : str
+        The last date of the range (inclusive)
+
+        returns
+        -------
+        bool : True if all chunks were successful, False if not
+        """
+
+        chunks = plan_chunks(start_date, end_date, self.chunk_days)
+        self._logger.info("Backfilling %s to %s in %s chunks ...",
+            start_date, end_date, len(chunks))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            outcomes = list(executor.map(self._run_chunk, chunks))
+
+        results = [is_successful for is_successful, _ in outcomes]
+        state_updates = [state_update for _, state_update in outcomes]
+
+        processed_dates = [
+            date
+            for chunk, is_successful in zip(chunks, results) if is_successful
+            for date in MetaProcess.get_date_range(*chunk)[1]
+            if date >= chunk[0]
+        ]
+
+        if processed_dates:
+            MetaProcess.update_meta_file(
+                self._meta_bucket, processed_dates, self.meta_key,
+                self.meta_index_key, self.meta_segment_prefix
+            )
+            self._write_state(state_updates)
+
+        self._logger.info("Finished the backfill: %s of %s chunks successful.",
+            sum(results), len(chunks))
+        return all(results)
+
+    def _run_chunk(self, chunk: tuple):
+        """Runs the XetraETL job of a chunk.
+
+        The chunk writes its report with the dates of the chunk
+        in the key, since all chunks are loaded at the same time.
+
+        parameters
+        ----------
+        chunk : tuple
+        The first and last date of the chunk
+
+        returns
+        -------
+        is_successful : bool
+        True if the report of the chunk was created, False if not
+
+        state_update : DataFrame, pyarrow.Table or None
+        The last prices per ISIN of the chunk, None if it failed
+        """
+
+        first_date, last_date = chunk
+
+        # An async connector is opened by the job of a chunk,
+        # so every chunk uses its own
+        src_bucket, trg_bucket = [
+            bucket.copy() if _is_async(bucket) else bucket
+            for bucket in [self.src_bucket, self.trg_bucket]
+        ]
+
+        # A failing chunk is logged, so the others still update the meta file
+        try:
+            xetra_etl = XetraETL(
+                src_bucket, trg_bucket, self.meta_key,
+                self.src_args,
+                self.trg_args._replace(
+                    trg_key=f"{self.trg_args.trg_key}{first_date}_{last_date}"
+                ),
+                meta_index_key=self.meta_index_key,
+                meta_segment_prefix=self.meta_segment_prefix,
+                metrics_sinks=self.metrics_sinks,
+                date_range=chunk,
+                source_manifest=self._manifest
+            )
+            if not xetra_etl.report():
+                return False, None
+
+            return True, xetra_etl._state_update
+
+        except Exception:
+            self._logger.exception("Failed to backfill %s to %s.",
+                first_date, last_date)
+            return False, None
+
+    def _write_state(self, state_updates: list):
+        """Merges the last prices of the chunks into the state table.
+
+        The prices of an ISIN in the state table are kept if they are
+        later than the ones of the chunks, e.g. after backfilling dates
+        before the last daily run.
+
+        parameters
+        ----------
+        state_updates : list
+        The last prices per ISIN of every chunk, None for failed chunks
+
+        returns
+        -------
+        bool : True if the state table was written, False if not
+        """
+
+        if not self.trg_args.trg_state_key:
+            return False
+
+        state_updates = [update for update in state_updates if update is not None]
+
+        if not state_updates:
+            return False
+
+        try:
+            state = self._meta_bucket.read_parquet_to_df(
+                self.trg_args.trg_state_key
+            )
+
+        except self._meta_bucket.exceptions.NoSuchKey:
+            state = None
+
+        is_written = self._meta_bucket.write_df_to_s3(
+            self.trg_args.trg_state_key,
+            merge_states([state, *state_updates], self.trg_args),
+            S3FileTypes.PARQUET.value
+        )
+
+        self._logger.info("Finished updating the state table.")
+        return is_written
@@ -0,0 +1,314 @@
+"""Dataframe engines aggregating the Xetra source rows.
+
+Every engine computes the same aggregates per ISIN and date
+as XetraETL._aggregate, from a Pandas dataframe of source rows:
+
+- the opening and closing price are the first and last StartPrice
+  after a stable sort by Time, so rows with equal times keep
+  their input order
+- the minimum, maximum and the traded volume are plain reductions
+
+and returns them as a Pandas dataframe with the target column names,
+sorted by ISIN and date. The engines are module-level functions,
+so that they can run in worker processes.
+"""
+
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas import CategoricalDtype, DataFrame
+
+from xetra.common.constants import TransformEngine
+from xetra.common.custom_exceptions import WrongEngineException
+
+try:
+    import polars
+except ImportError:  # polars is only needed by the polars engine
+    polars = None
+
+
+# Helper columns of the streamed aggregation
+FIRST_TIME = '_first_time'
+LAST_TIME = '_last_time'
+
+
+def aggregate_pandas(data_frame: DataFrame, src_args: NamedTuple,
+        trg_args: NamedTuple, with_times: bool = False):
+    """Aggregates source rows per ISIN and date with Pandas.
+
+    parameters
+    ----------
+    data_frame : DataFrame
+    A Pandas dataframe containing source rows
+
+    src_args : XetraSourceConfig
+    NamedTuple class with source configuration data
+
+    trg_args : XetraTargetConfig
+    NamedTuple class with target configuration data
+
+    with_times : bool, default False
+    Whether to keep the first and last Time of every group,
+    which is needed to merge aggregates of separate chunks
+
+    returns
+    -------
+    data_frame : DataFrame
+    The aggregates with target column names, sorted by ISIN and date
+    """
+
+    # Select the aggregated columns and drop all null values
+    data_frame = data_frame.loc[:, source_columns(src_args)].dropna()
+
+    aggregations = {
+        trg_args.trg_col_op_price:
+            (src_args.src_col_start_price, 'first'),
+        trg_args.trg_col_clos_price:
+            (src_args.src_col_start_price, 'last'),
+        trg_args.trg_col_min_price:
+            (src_args.src_col_min_price, 'min'),
+        trg_args.trg_col_max_price:
+            (src_args.src_col_max_price, 'max'),
+        trg_args.trg_col_dail_trad_vol:
+            (src_args.src_col_traded_vol, 'sum')
+    }
+
+    if with_times:
+        aggregations = {
+            FIRST_TIME: (src_args.src_col_time, 'first'),
+            LAST_TIME: (src_args.src_col_time, 'last'),
+            **aggregations
+        }
+
+    # A stable sort keeps the input order of rows with equal times,
+    # so the result does not depend on how the rows are sharded
+    data_frame = (
+        data_frame.sort_values(by=[src_args.src_col_time], kind='stable')
+        .groupby([
+            src_args.src_col_isin,
+            src_args.src_col_date
+        ], as_index=False, observed=True)
+        .agg(**aggregations)
+        .rename(columns={
+            src_args.src_col_isin: trg_args.trg_col_isin,
+            src_args.src_col_date: trg_args.trg_col_date
+        })
+    )
+
+    # Categorical keys and times are converted back to plain columns
+    # so that the report schema does not depend on src_dtypes
+    for column in data_frame.columns[:4 if with_times else 2]:
+        if isinstance(data_frame[column].dtype, CategoricalDtype):
+            data_frame[column] = data_frame[column].astype(
+                data_frame[column].cat.categories.dtype
+            )
+
+    return data_frame
+
+
+def aggregate_arrow(data_frame: DataFrame, src_args: NamedTuple,
+        trg_args: NamedTuple, with_times: bool = False):
+    """Aggregates source rows per ISIN and date with Arrow compute kernels.
+
+    The hash aggregation runs single-threaded, since only then
+    the first and last values follow the order of the sorted rows.
+
+    See aggregate_pandas for the parameters.
+    """
+
+    return aggregate_table(
+        pa.Table.from_pandas(
+            data_frame, columns=source_columns(src_args), preserve_index=False
+        ),
+        src_args, trg_args, with_times
+    ).to_pandas()
+
+
+def aggregate_table(table: pa.Table, src_args: NamedTuple,
+        trg_args: NamedTuple, with_times: bool = False):
+    """Aggregates source rows of an Arrow table per ISIN and date.
+
+    This is the Arrow engine without any Pandas conversion.
+
+    parameters
+    ----------
+    table : pyarrow.Table
+    An Arrow table containing source rows
+
+    src_args, trg_args, with_times :
+    See aggregate_pandas
+
+    returns
+    -------
+    table : pyarrow.Table
+    The aggregates with target column names, sorted by ISIN and date
+    """
+
+    table = _source_table(table, src_args)
+    table = table.take(pc.sort_indices(
+        table, sort_keys=[(src_args.src_col_time, 'ascending')]
+    ))
+
+    aggregations = [
+        (src_args.src_col_start_price, 'first'),
+        (src_args.src_col_start_price, 'last'),
+        (src_args.src_col_min_price, 'min'),
+        (src_args.src_col_max_price, 'max'),
+        (src_args.src_col_traded_vol, 'sum')
+    ]
+    names = _target_names(trg_args, with_times)
+
+    if with_times:
+        aggregations = [
+            (src_args.src_col_time, 'first'),
+            (src_args.src_col_time, 'last'),
+            *aggregations
+        ]
+
+    keys = [src_args.src_col_isin, src_args.src_col_date]
+    table = table.group_by(keys, use_threads=False).aggregate(aggregations)
+    table = table.select(
+        keys + [f"{column}_{function}" for column, function in aggregations]
+    ).rename_columns(names)
+    return table.take(pc.sort_indices(
+        table, sort_keys=[(name, 'ascending') for name in names[:2]]
+    ))
+
+
+def aggregate_polars(data_frame: DataFrame, src_args: NamedTuple,
+        trg_args: NamedTuple, with_times: bool = False):
+    """Aggregates source rows per ISIN and date with Polars.
+
+    The sort and the grouped aggregation run multi-threaded,
+    the groups keep the order of the sorted rows.
+
+    See aggregate_pandas for the parameters.
+    """
+
+    time = polars.col(src_args.src_col_time)
+    start_price = polars.col(src_args.src_col_start_price)
+    aggregations = [
+        start_price.first(),
+        start_price.last(),
+        polars.col(src_args.src_col_min_price).min(),
+        polars.col(src_args.src_col_max_price).max(),
+        polars.col(src_args.src_col_traded_vol).sum()
+    ]
+
+    if with_times:
+        aggregations = [time.first(), time.last(), *aggregations]
+
+    keys = [src_args.src_col_isin, src_args.src_col_date]
+    names = _target_names(trg_args, with_times)
+    frame = (
+        polars.from_arrow(_source_table(
+            pa.Table.from_pandas(data_frame, columns=source_columns(src_args),
+                preserve_index=False),
+            src_args
+        ))
+        .sort(src_args.src_col_time, maintain_order=True)
+        .group_by(keys)
+        .agg([
+            aggregation.alias(name)
+            for aggregation, name in zip(aggregations, names[2:])
+        ])
+        .sort(keys)
+        .rename(dict(zip(keys, names[:2])))
+    )
+
+    return frame.select(names).to_pandas()
+
+
+def source_columns(src_args: NamedTuple):
+    """Returns the source columns that the engines read.
+
+    parameters
+    ----------
+    src_args : XetraSourceConfig
+    NamedTuple class with source configuration data
+
+    returns
+    -------
+    columns : list
+    The ISIN, date, time, price and volume columns
+    """
+
+    return [
+        src_args.src_col_isin,
+        src_args.src_col_date,
+        src_args.src_col_time,
+        src_args.src_col_start_price,
+        src_args.src_col_min_price,
+        src_args.src_col_max_price,
+        src_args.src_col_traded_vol
+    ]
+
+
+ENGINES = {
+    TransformEngine.PANDAS.value: aggregate_pandas,
+    TransformEngine.ARROW.value: aggregate_arrow,
+    TransformEngine.POLARS.value: aggregate_polars
+}
+
+
+def get_engine(name: str):
+    """Returns the aggregation function of an engine.
+
+    parameters
+    ----------
+    name : str
+    The name of the engine, 'pandas', 'arrow' or 'polars'
+
+    returns
+    -------
+    engine : function
+    The aggregation function, see aggregate_pandas
+    """
+
+    if name not in ENGINES:
+        raise WrongEngineException(
+            f"The transform engine {name} is not supported."
+        )
+
+    if name == TransformEngine.POLARS.value and polars is None:
+        raise WrongEngineException(
+            f"The transform engine {name} requires the polars package."
+        )
+
+    return ENGINES[name]
+
+
+def _source_table(table: pa.Table, src_args: NamedTuple):
+    """Selects the aggregated columns of an Arrow table and drops null rows.
+
+    Categorical columns are decoded, so that they are sorted
+    and grouped by their values.
+    """
+
+    table = table.select(source_columns(src_args)).drop_null()
+
+    return pa.table({
+        name: column.cast(column.type.value_type)
+        if pa.types.is_dictionary(column.type) else column
+        for name, column in zip(table.column_names, table.columns)
+    })
+
+
+def _target_names(trg_args: NamedTuple, with_times: bool):
+    """Returns the column names of the aggregates, keys first."""
+
+    names = [
+        trg_args.trg_col_isin,
+        trg_args.trg_col_date,
+        trg_args.trg_col_op_price,
+        trg_args.trg_col_clos_price,
+        trg_args.trg_col_min_price,
+        trg_args.trg_col_max_price,
+        trg_args.trg_col_dail_trad_vol
+    ]
+
+    if with_times:
+        names[2:2] = [FIRST_TIME, LAST_TIME]
+
+    return names
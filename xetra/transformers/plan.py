@@ -0,0 +1,188 @@
+"""Lazy query plan of the Xetra report.
+
+The report job is described as a plan of three nodes before any data
+is read:
+
+- Scan: the source dates to list and read, and the columns to parse
+- Aggregate: the aggregation per ISIN and date, see engines
+- DateFilter: the report dates that are kept
+
+optimize rewrites the plan with the rules in RULES, which push the
+column projection of the aggregation and the date filter of the report
+down into the scan, so that unused columns are never parsed and unused
+dates are never listed or read.
+"""
+
+from datetime import datetime
+from typing import NamedTuple
+
+from xetra.common.constants import MetaProcessFormat
+from xetra.transformers.engines import source_columns
+
+
+class Scan(NamedTuple):
+    """Reads the source files of the dates, parsing only the columns."""
+
+    dates: list
+    columns: list
+
+
+class Aggregate(NamedTuple):
+    """Aggregates the source rows per ISIN and date.
+
+    keys: the ISIN and date column
+    order_by: the column ordering the rows of a group
+    columns: the source columns the aggregations read
+    """
+
+    keys: list
+    order_by: str
+    columns: list
+
+
+class DateFilter(NamedTuple):
+    """Keeps the report rows of first_date and later dates.
+
+    The lookback_days trading days (weekdays) before first_date are
+    needed for the change since the previous closing of first_date.
+    """
+
+    column: str
+    first_date: str
+    lookback_days: int = 1
+
+
+class ReportPlan(NamedTuple):
+    """Plan of the report job, from the scan to the date filter."""
+
+    scan: Scan
+    aggregate: Aggregate
+    date_filter: DateFilter
+
+    def explain(self):
+        """Returns a readable description of the plan."""
+
+        dates = (
+            f"{self.scan.dates[0]}..{self.scan.dates[-1]}"
+            if self.scan.dates else 'none'
+        )
+
+        return (
+            f"Scan(dates={dates}, columns={self.scan.columns}) -> "
+            f"Aggregate(keys={self.aggregate.keys}, "
+            f"order_by={self.aggregate.order_by!r}) -> "
+            f"DateFilter({self.date_filter.column} >= "
+            f"{self.date_filter.first_date!r})"
+        )
+
+
+def build_plan(src_args: NamedTuple, trg_args: NamedTuple,
+        first_date: str, dates: list):
+    """Builds the plan of a report, without any optimization.
+
+    parameters
+    ----------
+    src_args : XetraSourceConfig
+    NamedTuple class with source configuration data
+
+    trg_args : XetraTargetConfig
+    NamedTuple class with target configuration data
+
+    first_date : str
+    The first date of the report
+
+    dates : list
+    The source dates to extract
+
+    returns
+    -------
+    ReportPlan : The plan scanning all src_columns of all dates
+    """
+
+    return ReportPlan(
+        scan=Scan(dates=list(dates), columns=list(src_args.src_columns)),
+        aggregate=Aggregate(
+            keys=[src_args.src_col_isin, src_args.src_col_date],
+            order_by=src_args.src_col_time,
+            columns=source_columns(src_args)
+        ),
+        date_filter=DateFilter(
+            column=trg_args.trg_col_date, first_date=first_date
+        )
+    )
+
+
+def push_down_projection(plan: ReportPlan):
+    """Scans only the src_columns that the aggregation reads."""
+
+    return plan._replace(scan=plan.scan._replace(columns=[
+        column for column in plan.scan.columns
+        if column in plan.aggregate.columns
+    ]))
+
+
+def push_down_date_filter(plan: ReportPlan):
+    """Scans only the dates of the report and its lookback dates.
+
+    The lookback starts at the lookback_days-th weekday before
+    first_date, so that the weekend before a Monday is scanned
+    together with the Friday, like MetaProcess.get_date_range
+    chooses the dates. If there are fewer earlier weekdays,
+    all earlier dates are kept.
+    """
+
+    first_date = plan.date_filter.first_date
+    lookback_days = plan.date_filter.lookback_days
+
+    if not first_date:
+        return plan
+
+    earlier = sorted(date for date in plan.scan.dates if date < first_date)
+    weekdays = [date for date in earlier if _is_weekday(date)]
+
+    if lookback_days <= 0 or not earlier:
+        first_scanned = first_date
+
+    elif len(weekdays) >= lookback_days:
+        first_scanned = weekdays[-lookback_days]
+
+    else:
+        first_scanned = earlier[0]
+
+    return plan._replace(scan=plan.scan._replace(dates=[
+        date for date in plan.scan.dates if date >= first_scanned
+    ]))
+
+
+# Rewrite rules of optimize, applied in order
+RULES = [push_down_projection, push_down_date_filter]
+
+
+def optimize(plan: ReportPlan, rules: list = None):
+    """Rewrites a plan with the optimizer rules.
+
+    parameters
+    ----------
+    plan : ReportPlan
+    The plan to rewrite
+
+    rules : list, default None
+    Functions rewriting a plan (defaults to RULES)
+
+    returns
+    -------
+    ReportPlan : The rewritten plan
+    """
+
+    for rule in RULES if rules is None else rules:
+        plan = rule(plan)
+
+    return plan
+
+
+def _is_weekday(date: str):
+    """Checks whether a date in META_DATE_FORMAT is a trading weekday."""
+
+    return datetime.strptime(
+        date, MetaProcessFormat.META_DATE_FORMAT.value
+    ).weekday() < 5
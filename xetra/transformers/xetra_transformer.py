@@ -1,13 +1,45 @@
 """Xetra ETL component"""
 
+from asyncio import gather, run
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction
 from logging import getLogger
+from multiprocessing import get_all_start_methods, get_context
 from typing import NamedTuple
+from weakref import finalize
 
+import pyarrow as pa
+import pyarrow.compute as pc
 from pandas import DataFrame, concat
+from pandas.util import hash_pandas_object
 
+from xetra.common.constants import (
+    CompressionCodecs, MetaProcessFormat, ReportPartitionFormat, S3FileTypes,
+    TransformEngine
+)
+from xetra.common.custom_exceptions import ExtractionException
+from xetra.common.manifest import SourceManifest
 from xetra.common.meta_process import MetaProcess
+from xetra.common.metrics import ReportMetrics
 from xetra.common.s3 import S3BucketConnector
+from xetra.transformers.engines import (
+    FIRST_TIME, LAST_TIME, aggregate_table, get_engine
+)
+from xetra.transformers.plan import build_plan, optimize
+
+# The shard workers are started from a single-threaded server process,
+# since forking the ETL process can deadlock on locks held by its other
+# threads, e.g. of backfill chunks, S3 clients or logging. Windows has
+# no forkserver and spawns the workers.
+if 'forkserver' in get_all_start_methods():
+    _WORKER_CONTEXT = get_context('forkserver')
+    _WORKER_CONTEXT.set_forkserver_preload(['xetra.transformers.engines'])
+
+else:
+    _WORKER_CONTEXT = get_context('spawn')
 
 
 class XetraSourceConfig(NamedTuple):
@@ -22,6 +54,18 @@ class XetraSourceConfig(NamedTuple):
     src_col_min_price: column name for minimum price in source
     src_col_max_price: column name for maximum price in source
     src_col_traded_vol: column name for traded volume in source
+    src_max_workers: number of source files read concurrently
+    src_streaming: fold source files into the report one by one
+    src_dtypes: data types of the source columns used while parsing
+    src_day_cache_key: key prefix of the extracted days in the target bucket
+    src_csv_engine: parser of the source files, 'c' or 'pyarrow'
+    src_manifest_key: key of the source listing manifest in the target bucket
+    src_transform_workers: number of processes aggregating ISIN shards
+    src_transform_shard_rows: minimum number of source rows aggregated
+    in ISIN shards, smaller data is aggregated serially
+    src_transform_engine: dataframe engine of the aggregation,
+    'pandas', 'arrow' or 'polars'
+    src_arrow_native: extract, transform and load Arrow tables
     """
 
     src_first_extract_date: str
@@ -33,6 +77,16 @@ class XetraSourceConfig(NamedTuple):
     src_col_min_price: str
     src_col_max_price: str
     src_col_traded_vol: str
+    src_max_workers: int = 8
+    src_streaming: bool = False
+    src_dtypes: dict = None
+    src_day_cache_key: str = None
+    src_csv_engine: str = 'c'
+    src_manifest_key: str = None
+    src_transform_workers: int = 1
+    src_transform_shard_rows: int = 1_000_000
+    src_transform_engine: str = 'pandas'
+    src_arrow_native: bool = False
 
 
 class XetraTargetConfig(NamedTuple):
@@ -49,6 +103,13 @@ class XetraTargetConfig(NamedTuple):
     trg_key: basic key prefix of target file
     trg_key_date_format: date format of target file key
     trg_format: file format of the target file
+    trg_state_key: key of the last opening and closing prices per ISIN
+    trg_partition_key: key prefix of the report partitioned by date
+    trg_row_group_size: maximum number of rows per Parquet row group
+    trg_compression: compression codec of the report objects,
+        'zstd', 'snappy' or 'gzip' for Parquet and 'gzip' for csv
+    trg_compression_level: level of the compression codec
+    trg_dictionary_columns: only Parquet columns that are dictionary encoded
     """
 
     trg_col_isin: str
@@ -62,24 +123,36 @@ class XetraTargetConfig(NamedTuple):
     trg_key: str
     trg_key_date_format: str
     trg_format: str
+    trg_state_key: str = None
+    trg_partition_key: str = None
+    trg_row_group_size: int = None
+    trg_compression: str = None
+    trg_compression_level: int = None
+    trg_dictionary_columns: list = None
 
 
 class XetraETL():
     """    Reads the Xetra data from the Deutsche Boerse S3 bucket,
         makes transformations, and loads the new data into a target bucket.
+
+        The source and target buckets can be S3BucketConnector or
+        AsyncS3BucketConnector objects.
     """
 
     def __init__(self, src_bucket: S3BucketConnector,
             trg_bucket: S3BucketConnector, meta_key: str,
-            src_args: XetraSourceConfig, trg_args: XetraTargetConfig):
+            src_args: XetraSourceConfig, trg_args: XetraTargetConfig,
+            meta_index_key: str = None, meta_segment_prefix: str = None,
+            metrics_sinks: list = None, date_range: tuple = None,
+            source_manifest: SourceManifest = None):
         """Constructor for Xetra ETL.
 
         parameters
         ----------
-        src_bucket : S3BucketConnector
+        src_bucket : S3BucketConnector or AsyncS3BucketConnector
         Connection to the source S3 bucket
 
-        trg_bucket : S3BucketConnector
+        trg_bucket : S3BucketConnector or AsyncS3BucketConnector
         Connection to the target S3 bucket
 
         meta_key : str
@@ -90,17 +163,65 @@ class XetraETL():
 
         trg_args : XetraTargetConfig
         NamedTuple class with target configuration data
+
+        meta_index_key : str, default None
+        Key for the index of the processed dates (defaults to no index)
+
+        meta_segment_prefix : str, default None
+        Key prefix for the append-only meta segments
+        (defaults to rewriting the meta file)
+
+        metrics_sinks : list, default None
+        Sinks emitting the metrics of every report, e.g. JsonLinesSink
+        (defaults to returning the metrics only)
+
+        date_range : tuple, default None
+        The first and last date to process, e.g. a chunk of a backfill;
+        the meta file and the state table are then neither read nor
+        updated, the runner of the range updates them
+        (defaults to the dates missing from the meta file)
+
+        source_manifest : SourceManifest, default None
+        The source manifest shared with other jobs, e.g. the chunks
+        of a backfill (defaults to a manifest of src_manifest_key)
         """
 
         self._logger = getLogger(__name__)
         self.src_bucket = src_bucket
         self.trg_bucket = trg_bucket
         self.meta_key = meta_key
+        self.meta_index_key = meta_index_key
+        self.meta_segment_prefix = meta_segment_prefix
         self.src_args = src_args
         self.trg_args = trg_args
-        self.extract_date = ''
-        self.extract_date_list = []
-        self.meta_update_list = []
+        self.metrics_sinks = metrics_sinks or []
+        self.date_range = date_range
+        self._sync_trg_bucket = None
+        self._manifest = source_manifest
+        self._shard_pool = None
+        self._shard_pool_finalizer = None
+
+        # Dates to extract, starting one day before the first missing date
+        if self.date_range is None:
+            self.extract_date, self.extract_date_list = (
+                MetaProcess.get_date_list(
+                    self._meta_bucket(), self.src_args.src_first_extract_date,
+                    self.meta_key, self.meta_index_key,
+                    self.meta_segment_prefix
+                )
+            )
+
+        else:
+            self.extract_date, self.extract_date_list = (
+                MetaProcess.get_date_range(*self.date_range)
+            )
+
+        # Dates added to the meta file by load; unless they are set,
+        # they follow the extract_date and extract_date_list of the load
+        self.meta_update_list = None
+
+        self._state = self._read_state() if self.date_range is None else None
+        self._state_update = None
 
     def extract(self):
         """Extracts data from the Deutsche Boerse S3 bucket.
@@ -116,26 +237,388 @@ class XetraETL():
         """
 
         self._logger.info("Extracting the source files ...")
+        scan = self.plan().scan
+
+        # Dates that were already extracted are read from the day cache
+        day_frames = self._read_cached_days()
 
         # Uses the list_files_by_prefix method to get all
         # CSV files loaded to the bucket since the specified date
-        files = [key for date in self.extract_date_list
-            for key in self.src_bucket.list_files_by_prefix(date)]
+        files_by_date = self._list_source_files_by_date([
+            date for date in scan.dates
+            if date not in day_frames
+        ])
+        files = [key for keys in files_by_date.values() for key in keys]
 
         # Check for empty file list
-        if not files:
+        if not files and not day_frames:
             data_frame = DataFrame()
             self._logger.info("No files were extracted.")
             return data_frame
 
-        data_frame = concat(
-            [self.src_bucket.read_csv_to_df(file)
-            for file in files], ignore_index=True
-        )
+        file_frames = iter(self._read_source_files(files))
+
+        for date, keys in files_by_date.items():
+            if keys:
+                day_frames[date] = concat(
+                    [next(file_frames) for _ in keys], ignore_index=True
+                )
+                self._write_cached_day(date, day_frames[date])
+
+        data_frame = self._restore_categories(concat(
+            [day_frames[date] for date in scan.dates
+                if date in day_frames],
+            ignore_index=True
+        ))
 
         self._logger.info("Finished extracting the source files.")
         return data_frame
 
+    def extract_table(self):
+        """Extracts data from the Deutsche Boerse S3 bucket to an Arrow table.
+
+        This is the Arrow counterpart of the extract method, used with
+        src_arrow_native. The source files are parsed by the Arrow csv
+        parser and the cached days are read as Arrow tables, so the
+        data is never converted to a Pandas dataframe.
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table of the extracted data
+        """
+
+        self._logger.info("Extracting the source files to Arrow ...")
+        scan = self.plan().scan
+
+        day_tables = self._read_cached_days()
+        files_by_date = self._list_source_files_by_date([
+            date for date in scan.dates
+            if date not in day_tables
+        ])
+        files = [key for keys in files_by_date.values() for key in keys]
+
+        # Check for empty file list
+        if not files and not day_tables:
+            self._logger.info("No files were extracted.")
+            return pa.table({})
+
+        file_tables = iter(self._read_source_files(files))
+
+        for date, keys in files_by_date.items():
+            if keys:
+                day_tables[date] = pa.concat_tables(
+                    [next(file_tables) for _ in keys],
+                    promote_options='permissive'
+                )
+                self._write_cached_day(date, day_tables[date])
+
+        table = pa.concat_tables(
+            [day_tables[date] for date in scan.dates
+                if date in day_tables],
+            promote_options='permissive'
+        )
+
+        self._logger.info("Finished extracting the source files.")
+        return table
+
+    def _day_cache_key(self, date: str):
+        """Returns the key of the day cache object of a source date."""
+
+        return f"{self.src_args.src_day_cache_key}{date}.parquet"
+
+    def _read_cached_days(self):
+        """Reads the cached days of the scanned dates.
+
+        Days are cached as Parquet objects with the projected source
+        rows in the target bucket under src_day_cache_key.
+
+        returns
+        -------
+        day_frames : dict
+        The dataframes of the cached days by date
+        """
+
+        day_frames = {}
+
+        for date in self._cached_dates():
+            data_frame = self._read_cached_day(date)
+
+            if data_frame is not None:
+                day_frames[date] = data_frame
+
+        if self.src_args.src_day_cache_key:
+            self._logger.info("Read %s of %s days from the day cache.",
+                len(day_frames), len(self.plan().scan.dates))
+
+        return day_frames
+
+    def _cached_dates(self):
+        """Returns the scanned dates in the day cache.
+
+        The day cache is listed once instead of requesting every day.
+        """
+
+        if not self.src_args.src_day_cache_key:
+            return []
+
+        keys = set(self._meta_bucket().list_files_by_prefix(
+            self.src_args.src_day_cache_key
+        ))
+
+        return [
+            date for date in self.plan().scan.dates
+            if self._day_cache_key(date) in keys
+        ]
+
+    def _read_cached_day(self, date: str):
+        """Reads the extracted rows of one day from the day cache.
+
+        returns
+        -------
+        data_frame : DataFrame, pyarrow.Table or None
+        The rows of the day, an Arrow table with src_arrow_native,
+        or None if the day was cached with other source columns
+        """
+
+        columns = self.plan().scan.columns
+
+        if self.src_args.src_arrow_native:
+            table = self._meta_bucket().read_parquet_to_table(
+                self._day_cache_key(date)
+            )
+
+            if not set(columns) <= set(table.column_names):
+                return None
+
+            return table.select(columns)
+
+        data_frame = self._meta_bucket().read_parquet_to_df(
+            self._day_cache_key(date)
+        )
+
+        if not set(columns) <= set(data_frame.columns):
+            return None
+
+        return data_frame.loc[:, columns]
+
+    def _write_cached_day(self, date: str, data_frame: DataFrame):
+        """Writes the extracted rows of a finished day to the day cache.
+
+        The current day is not cached, since its source files
+        are still being published.
+        """
+
+        if not self.src_args.src_day_cache_key:
+            return
+
+        if date >= datetime.today().strftime(
+                MetaProcessFormat.META_DATE_FORMAT.value):
+            return
+
+        _write_data(
+            self._meta_bucket(), self._day_cache_key(date), data_frame,
+            S3FileTypes.PARQUET.value
+        )
+
+    def _read_file(self):
+        """Returns a function that reads one source file.
+
+        Only the columns of the scan are parsed, using the src_dtypes.
+        With src_arrow_native the files are parsed to Arrow tables.
+        """
+
+        columns = self.plan().scan.columns
+
+        if self.src_args.src_arrow_native:
+            return partial(
+                self.src_bucket.read_csv_to_table,
+                columns=columns,
+                dtype=self.src_args.src_dtypes
+            )
+
+        return partial(
+            self.src_bucket.read_csv_to_df,
+            columns=columns,
+            dtype=self.src_args.src_dtypes,
+            engine=self.src_args.src_csv_engine
+        )
+
+    def _restore_categories(self, data_frame: DataFrame):
+        """Converts categorical src_dtypes columns back to categories.
+
+        Concatenating files with different categories
+        turns categorical columns into object columns.
+        """
+
+        categories = {
+            column: 'category'
+            for column, dtype in (self.src_args.src_dtypes or {}).items()
+            if dtype == 'category' and column in data_frame.columns
+        }
+
+        return data_frame.astype(categories) if categories else data_frame
+
+    def _list_source_files_by_date(self, dates: list):
+        """Lists the source files of the given dates.
+
+        Dates in the source manifest are served from the manifest,
+        the other dates are listed in the source bucket. Listed dates
+        before the current date are added to the manifest.
+
+        returns
+        -------
+        files_by_date : dict
+        The keys of the source files by date, in the order of dates
+        """
+
+        manifest = self._source_manifest()
+        objects_by_date = {}
+
+        if manifest is not None:
+            manifest_dates = manifest.dates()
+            objects_by_date = {
+                date: manifest.objects(date) for date in dates
+                if date in manifest_dates
+            }
+
+            if not _is_async(self.src_bucket):
+                for objects in objects_by_date.values():
+                    self.src_bucket.register_etags(objects)
+
+        missing_dates = [date for date in dates if date not in objects_by_date]
+
+        if _is_async(self.src_bucket):
+            listed = run(self._list_source_files_async(missing_dates))
+
+        else:
+            listed = {
+                date: self.src_bucket.list_objects_by_prefix(date)
+                for date in missing_dates
+            }
+
+        if manifest is not None and listed:
+            manifest.add(listed)
+
+        objects_by_date.update(listed)
+
+        return {
+            date: [obj['key'] for obj in objects_by_date[date]]
+            for date in dates
+        }
+
+    async def _list_source_files_async(self, dates: list):
+        """Lists the source objects through an AsyncS3BucketConnector."""
+
+        if not dates:
+            return {}
+
+        async with self.src_bucket:
+            object_lists = await gather(*[
+                self.src_bucket.list_objects_by_prefix(date)
+                for date in dates
+            ])
+
+        return dict(zip(dates, object_lists))
+
+    def _source_manifest(self):
+        """Returns the source manifest, or None if it is not configured."""
+
+        if not self.src_args.src_manifest_key:
+            return None
+
+        if self._manifest is None:
+            self._manifest = SourceManifest(
+                self._meta_bucket(), self.src_args.src_manifest_key
+            )
+
+        return self._manifest
+
+    def _read_source_files(self, files: list):
+        """Reads the source files concurrently into dataframes.
+
+        With a synchronous connector the files are downloaded and parsed
+        by a bounded pool of src_max_workers threads. With an async
+        connector all requests run on one event loop instead.
+        The dataframes are returned in the same order as the given files,
+        so the extracted data is deterministic regardless of which
+        download finishes first.
+
+        parameters
+        ----------
+        files : list
+        The keys of the source files
+
+        returns
+        -------
+        data_frames : list
+        A list of Pandas dataframes (or Arrow tables with
+        src_arrow_native), one per source file
+        """
+
+        if _is_async(self.src_bucket):
+            results = run(self._read_source_files_async(files))
+
+        else:
+            results = self._read_source_files_threaded(files)
+
+        data_frames = []
+        failed_files = []
+
+        for file, result in zip(files, results):
+            if isinstance(result, Exception):
+                self._logger.error(
+                    "Error: Failed to read the source file %s: %s",
+                    file, result
+                )
+                failed_files.append(file)
+
+            else:
+                data_frames.append(result)
+
+        if failed_files:
+            raise ExtractionException(
+                f"{len(failed_files)} of {len(files)} source files "
+                f"could not be read: {', '.join(failed_files)}"
+            )
+
+        return data_frames
+
+    def _read_source_files_threaded(self, files: list):
+        """Reads the source files with a pool of worker threads.
+
+        returns
+        -------
+        results : list
+        A dataframe or the raised exception for every file
+        """
+
+        with ThreadPoolExecutor(
+                max_workers=self.src_args.src_max_workers) as executor:
+            futures = [
+                executor.submit(self._read_file(), file)
+                for file in files
+            ]
+
+        return [
+            future.exception() or future.result()
+            for future in futures
+        ]
+
+    async def _read_source_files_async(self, files: list):
+        """Reads the source files through an AsyncS3BucketConnector.
+
+        returns
+        -------
+        results : list
+        A dataframe or the raised exception for every file
+        """
+
+        async with self.src_bucket:
+            return await gather(*[
+                self._read_file()(file) for file in files
+            ], return_exceptions=True)
+
     def transform(self, data_frame: DataFrame):
         """Transforms the Xetra data into a form suitable for reporting.
         
@@ -162,58 +645,39 @@ class XetraETL():
 
         self._logger.info("Transforming the Xetra data ...")
 
-        # Select specific columns and drop all null values
-        data_frame = data_frame.loc[:, self.src_args.src_columns]
-        data_frame.dropna(inplace=True)
-
-        # The opening_price column is created by sorting the data by Time,
-        # then grouping it by ISIN and Date, selecting StartPrice,
-        # and finally transforming the column to contain only the first date
-        data_frame[self.trg_args.trg_col_op_price] = (
-            data_frame.sort_values(
-                by=[self.src_args.src_col_time]
-            ).groupby([
-                self.src_args.src_col_isin,
-                self.src_args.src_col_date
-            ])[self.src_args.src_col_start_price]
-            .transform('first')
-        )
+        # Open, close, min, max and volume per ISIN and date;
+        # polars is multi-threaded itself and is not sharded
+        if (self.src_args.src_transform_workers > 1
+                and len(data_frame) >= self.src_args.src_transform_shard_rows
+                and self.src_args.src_transform_engine
+                != TransformEngine.POLARS.value):
+            data_frame = self._aggregate_sharded(data_frame)
 
-        # The closing_price column is created by transforming the data
-        # similarly to opening_price, but selecting for the last date instead
-        data_frame[self.trg_args.trg_col_clos_price] = (
-            data_frame.sort_values(
-            by=[self.src_args.src_col_time]
-            ).groupby([
-                self.src_args.src_col_isin,
-                self.src_args.src_col_date
-            ])[self.src_args.src_col_start_price]
-            .transform('last')
-        )
+        else:
+            data_frame = self._aggregate(data_frame)
 
-        # Rename columns
-        data_frame.rename(columns={
-            self.src_args.src_col_isin: self.trg_args.trg_col_isin,
-            self.src_args.src_col_date: self.trg_args.trg_col_date,
-            self.src_args.src_col_min_price: self.trg_args.trg_col_min_price,
-            self.src_args.src_col_max_price: self.trg_args.trg_col_max_price,
-            self.src_args.src_col_traded_vol: self.trg_args.trg_col_dail_trad_vol
-        }, inplace=True)
-
-        # Data aggregation
-        data_frame = (
-            data_frame.groupby([
-                self.trg_args.trg_col_isin,
-                self.trg_args.trg_col_date
-            ], as_index=False)
-            .agg({
-                self.trg_args.trg_col_op_price: 'min',
-                self.trg_args.trg_col_clos_price: 'min',
-                self.trg_args.trg_col_min_price: 'min',
-                self.trg_args.trg_col_max_price: 'max',
-                self.trg_args.trg_col_dail_trad_vol: 'sum'
-        })
-        )
+        data_frame = self._finalize_report(data_frame)
+
+        self._logger.info("Finished transforming the Xetra data.")
+
+        return data_frame
+
+    def _finalize_report(self, data_frame: DataFrame):
+        """Completes the aggregated report data.
+
+        Adds the percentage of change since the previous closing,
+        rounds the prices and keeps only the dates from extract_date on.
+
+        parameters
+        ----------
+        data_frame : DataFrame
+        The report data aggregated by ISIN and date
+
+        returns
+        -------
+        data_frame : DataFrame
+        a Pandas dataframe containing the final report data
+        """
 
         # The prev_closing_price column is created
         # by sorting the data by Date, and then grouping it by ISIN
@@ -224,6 +688,28 @@ class XetraETL():
             [self.trg_args.trg_col_op_price].shift(1)
         )
 
+        # The first date of every ISIN takes the previous price
+        # of earlier runs from the state table
+        if self._state is not None:
+            state = self._state.set_index(self.trg_args.trg_col_isin)
+            isins = data_frame[self.trg_args.trg_col_isin]
+            state_prices = isins.map(
+                state[self.trg_args.trg_col_op_price]
+            ).where(
+                isins.map(state[self.trg_args.trg_col_date])
+                < data_frame[self.trg_args.trg_col_date]
+            )
+            data_frame[self.trg_args.trg_col_ch_prev_clos] = (
+                data_frame[self.trg_args.trg_col_ch_prev_clos]
+                .fillna(state_prices)
+            )
+
+        # The last prices per ISIN are kept for the next run
+        self._state_update = merge_states(
+            [self._state, data_frame.loc[:, self._state_columns()]],
+            self.trg_args
+        )
+
         # Calculate the percentage of change in the closing price since the last date
         data_frame[self.trg_args.trg_col_ch_prev_clos] = (
             (data_frame[self.trg_args.trg_col_op_price] -
@@ -235,42 +721,469 @@ class XetraETL():
         data_frame = data_frame.round(decimals=2)
 
         # Filter the dataframe by date
+        date_filter = self.plan().date_filter
         data_frame = data_frame[
-            data_frame.date >= self.extract_date
+            data_frame[date_filter.column] >= date_filter.first_date
         ].reset_index(drop=True)
 
+        return data_frame
+
+    def transform_table(self, table: pa.Table):
+        """Transforms an Arrow table of Xetra data into the report.
+
+        This is the Arrow counterpart of the transform method, used
+        with src_arrow_native. The rows are aggregated by the Arrow
+        compute kernels and the report is completed on the aggregates,
+        without converting them to a Pandas dataframe.
+
+        parameters
+        ----------
+        table : pyarrow.Table
+        An Arrow table containing the extracted data
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing transformed report data
+        """
+
+        # Check for empty table
+        if table.num_rows == 0:
+            self._logger.info("The table is empty. No transformations to apply.")
+            return table
+
+        self._logger.info("Transforming the Xetra data with Arrow ...")
+
+        table = self._finalize_report_table(
+            aggregate_table(table, self.src_args, self.trg_args)
+        )
+
         self._logger.info("Finished transforming the Xetra data.")
 
+        return table
+
+    def _finalize_report_table(self, table: pa.Table):
+        """Completes the aggregated report data of an Arrow table.
+
+        See _finalize_report. The aggregates are sorted by ISIN and
+        date, so the previous opening price of a row is the one
+        of the row before it, if that row has the same ISIN.
+
+        parameters
+        ----------
+        table : pyarrow.Table
+        The report data aggregated by ISIN and date
+
+        returns
+        -------
+        table : pyarrow.Table
+        An Arrow table containing the final report data
+        """
+
+        isins = table[self.trg_args.trg_col_isin].combine_chunks()
+        dates = table[self.trg_args.trg_col_date].combine_chunks()
+        prices = table[self.trg_args.trg_col_op_price].combine_chunks()
+        first_row = min(table.num_rows, 1)
+
+        previous_prices = pc.if_else(
+            pa.concat_arrays([
+                pa.array([False] * first_row),
+                pc.equal(isins[1:], isins[:-1])
+            ]),
+            pa.concat_arrays([pa.nulls(first_row, prices.type), prices[:-1]]),
+            pa.scalar(None, prices.type)
+        )
+
+        # The first date of every ISIN takes the previous price
+        # of earlier runs from the state table
+        if self._state is not None:
+            positions = pc.index_in(isins, value_set=(
+                self._state[self.trg_args.trg_col_isin].combine_chunks()
+            ))
+            state_prices = pc.if_else(
+                pc.less(
+                    self._state[self.trg_args.trg_col_date].take(positions),
+                    dates
+                ),
+                self._state[self.trg_args.trg_col_op_price].take(positions),
+                pa.scalar(None, prices.type)
+            )
+            previous_prices = pc.coalesce(previous_prices, state_prices)
+
+        # The last prices per ISIN are kept for the next run;
+        # a stable sort keeps the state rows before the new rows
+        state = pa.concat_tables(
+            ([self._state] if self._state is not None else [])
+            + [table.select(self._state_columns())],
+            promote_options='permissive'
+        )
+        state = state.take(pc.sort_indices(state, sort_keys=[
+            (self.trg_args.trg_col_isin, 'ascending'),
+            (self.trg_args.trg_col_date, 'ascending')
+        ]))
+        state_isins = state[self.trg_args.trg_col_isin].combine_chunks()
+        self._state_update = state.filter(pa.concat_arrays([
+            pc.not_equal(state_isins[:-1], state_isins[1:]),
+            pa.array([True] * min(state.num_rows, 1))
+        ]))
+
+        # Calculate the percentage of change in the closing price since the last date
+        table = table.append_column(
+            self.trg_args.trg_col_ch_prev_clos,
+            pc.multiply(
+                pc.divide(pc.subtract(prices, previous_prices),
+                    previous_prices),
+                100
+            )
+        )
+
+        # Round all float values to 2 decimals
+        table = pa.table({
+            name: pc.round(column, 2, round_mode='half_to_even')
+            if pa.types.is_floating(column.type) else column
+            for name, column in zip(table.column_names, table.columns)
+        })
+
+        # Filter the table by date
+        date_filter = self.plan().date_filter
+
+        return table.filter(
+            pc.greater_equal(table[date_filter.column],
+                date_filter.first_date)
+        )
+
+    def extract_stream(self):
+        """Extracts data from the Deutsche Boerse S3 bucket file by file.
+
+        This is the streaming counterpart of the extract method.
+        Instead of concatenating all source files into one dataframe,
+        one dataframe per source file (or per day from the day cache)
+        is yielded in date order. At most src_max_workers files are
+        downloaded ahead of the consumer, so memory use does not grow
+        with the number of files.
+
+        yields
+        ------
+        data_frame : DataFrame
+        A Pandas dataframe of a single source file or cached day
+        """
+
+        self._logger.info("Streaming the source files ...")
+
+        if _is_async(self.src_bucket):
+            def read_file(key):
+                return run(self._read_file()(key))
+
+        else:
+            read_file = self._read_file()
+
+        # Cached days are streamed as a whole, other days file by file
+        scan = self.plan().scan
+        cached_dates = self._cached_dates()
+        files_by_date = self._list_source_files_by_date([
+            date for date in scan.dates
+            if date not in cached_dates
+        ])
+        jobs = []
+
+        for date in scan.dates:
+            if date in cached_dates:
+                jobs.append((
+                    self._day_cache_key(date),
+                    partial(self._read_cached_day_or_files, date, read_file)
+                ))
+
+            else:
+                jobs.extend(
+                    (file, partial(read_file, file))
+                    for file in files_by_date[date]
+                )
+
+        if not jobs:
+            self._logger.info("No files were extracted.")
+            return
+
+        labels = [label for label, _ in jobs]
+
+        with ThreadPoolExecutor(
+                max_workers=self.src_args.src_max_workers) as executor:
+            pending = deque()
+
+            for label, job in jobs:
+                pending.append((label, executor.submit(job)))
+
+                if len(pending) >= self.src_args.src_max_workers:
+                    yield self._stream_result(*pending.popleft(), labels)
+
+            while pending:
+                yield self._stream_result(*pending.popleft(), labels)
+
+        self._logger.info("Finished streaming the source files.")
+
+    def _read_cached_day_or_files(self, date: str, read_file):
+        """Reads a day from the day cache, or from its source files
+        if the day was cached with other source columns."""
+
+        data_frame = self._read_cached_day(date)
+
+        if data_frame is None:
+            data_frame = concat(
+                [read_file(file)
+                    for file in self._list_source_files_by_date([date])[date]],
+                ignore_index=True
+            )
+
         return data_frame
 
-    def load(self, data_frame: DataFrame):
-        """Loads the data into a new S3 bucket for reporting.
+    def _stream_result(self, file: str, future: Future, files: list):
+        """Returns the dataframe of a streamed source file.
+
+        raises
+        ------
+        ExtractionException : If the source file could not be read
+        """
+
+        try:
+            return future.result()
+
+        except Exception as error:
+            self._logger.error(
+                "Error: Failed to read the source file %s: %s",
+                file, error
+            )
+            raise ExtractionException(
+                f"1 of {len(files)} source files "
+                f"could not be read: {file}"
+            ) from error
+
+    def transform_stream(self, data_frames):
+        """Transforms streamed Xetra data into the report.
+
+        Every dataframe is folded into running aggregates per ISIN and
+        date as it arrives: the first and last StartPrice by Time,
+        the minimum and maximum price and the summed traded volume.
+        Only the aggregates are kept in memory, never the source rows.
+        The result is the same report as the transform method returns
+        for the concatenated data.
 
         parameters
         ----------
+        data_frames : iterable
+        Pandas dataframes with extracted data, e.g. from extract_stream
+
+        returns
+        -------
         data_frame : DataFrame
-        A Pandas dataframe of transformed data
+        a Pandas dataframe containing transformed report data
+        """
+
+        self._logger.info("Transforming the streamed Xetra data ...")
+
+        aggregates = None
+
+        for data_frame in data_frames:
+            if data_frame.empty:
+                continue
+
+            partial = self._aggregate(data_frame, with_times=True)
+
+            if partial.empty:
+                continue
+
+            if aggregates is None:
+                aggregates = partial
+
+            else:
+                aggregates = self._merge_aggregates(aggregates, partial)
+
+        if aggregates is None:
+            self._logger.info("The dataframe is empty. No transformations to apply.")
+            return DataFrame()
+
+        data_frame = self._finalize_report(
+            aggregates.drop(columns=[FIRST_TIME, LAST_TIME])
+        )
+
+        self._logger.info("Finished transforming the streamed Xetra data.")
+
+        return data_frame
+
+    def _aggregate(self, data_frame: DataFrame, with_times: bool = False):
+        """Aggregates source rows per ISIN and date in a single pass.
+
+        The data is sorted by Time once, so that the first and last
+        StartPrice of every group are its opening and closing price.
+        The opening, closing, minimum and maximum price and the traded
+        volume are then computed in one grouped reduction, by the
+        dataframe engine selected with src_transform_engine.
+
+        parameters
+        ----------
+        data_frame : DataFrame
+        A Pandas dataframe containing source rows
+
+        with_times : bool, default False
+        Whether to keep the first and last Time of every group,
+        which is needed to merge aggregates of separate chunks
 
         returns
         -------
-        bool : True if the write was successful, False if not
+        data_frame : DataFrame
+        The aggregates with target column names, sorted by ISIN and date
         """
 
-        key_date = (
-            datetime.today().date()
-            .strftime(self.trg_args.trg_key_date_format)
+        engine = get_engine(self.src_args.src_transform_engine)
+
+        return engine(data_frame, self.src_args, self.trg_args, with_times)
+
+    def _aggregate_sharded(self, data_frame: DataFrame):
+        """Aggregates source rows in a pool of src_transform_workers processes.
+
+        The rows are hash-partitioned by ISIN, so every ISIN and date
+        group lies in exactly one shard and the shards are aggregated
+        independently. The shard aggregates are disjoint and are merged
+        by sorting them by ISIN and date, which gives the same result
+        as the _aggregate method.
+
+        parameters
+        ----------
+        data_frame : DataFrame
+        A Pandas dataframe containing source rows
+
+        returns
+        -------
+        data_frame : DataFrame
+        The aggregates with target column names, sorted by ISIN and date
+        """
+
+        workers = self.src_args.src_transform_workers
+        shard_ids = hash_pandas_object(
+            data_frame[self.src_args.src_col_isin], index=False
+        ).to_numpy() % workers
+        shards = [data_frame[shard_ids == shard] for shard in range(workers)]
+
+        aggregates = list(self._shard_executor(workers).map(
+            partial(get_engine(self.src_args.src_transform_engine),
+                src_args=self.src_args, trg_args=self.trg_args),
+            shards
+        ))
+
+        return (
+            concat(aggregates, ignore_index=True)
+            .sort_values(
+                by=[self.trg_args.trg_col_isin, self.trg_args.trg_col_date],
+                kind='stable'
+            )
+            .reset_index(drop=True)
         )
 
-        # Format object key
-        target_key = (
-            self.trg_args.trg_key +
-            f"_{key_date}." + self.trg_args.trg_format
+    def _shard_executor(self, workers: int):
+        """Returns the process pool aggregating the ISIN shards.
+
+        The pool is started by the first sharded transform and kept
+        until close is called or the job is garbage collected, since
+        starting the workers takes longer than most aggregations.
+
+        parameters
+        ----------
+        workers : int
+        The number of worker processes
+
+        returns
+        -------
+        ProcessPoolExecutor : The pool with the given number of workers
+        """
+
+        if self._shard_pool is not None and self._shard_pool[0] != workers:
+            self.close()
+
+        if self._shard_pool is None:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=_WORKER_CONTEXT
+            )
+            self._shard_pool = (workers, executor)
+            self._shard_pool_finalizer = finalize(self, executor.shutdown)
+
+        return self._shard_pool[1]
+
+    def close(self):
+        """Shuts down the process pool of the ISIN shards, if started."""
+
+        if self._shard_pool_finalizer is not None:
+            self._shard_pool_finalizer()
+
+        self._shard_pool = None
+        self._shard_pool_finalizer = None
+
+    def _merge_aggregates(self, aggregates: DataFrame, partial: DataFrame):
+        """Merges the aggregates of a new chunk into the running aggregates.
+
+        The opening price is taken from the group with the earliest
+        first Time, the closing price from the group with the latest
+        last Time. On equal times the earlier chunk wins for the opening
+        and the later chunk wins for the closing price.
+
+        returns
+        -------
+        data_frame : DataFrame
+        The merged aggregates, sorted by ISIN and date
+        """
+
+        keys = [self.trg_args.trg_col_isin, self.trg_args.trg_col_date]
+        combined = concat([aggregates, partial], ignore_index=True)
+
+        opening = (
+            combined.sort_values(by=[FIRST_TIME], kind='stable')
+            .groupby(keys)[[FIRST_TIME, self.trg_args.trg_col_op_price]]
+            .first()
         )
+        closing = (
+            combined.sort_values(by=[LAST_TIME], kind='stable')
+            .groupby(keys)[[LAST_TIME, self.trg_args.trg_col_clos_price]]
+            .last()
+        )
+        totals = combined.groupby(keys).agg({
+            self.trg_args.trg_col_min_price: 'min',
+            self.trg_args.trg_col_max_price: 'max',
+            self.trg_args.trg_col_dail_trad_vol: 'sum'
+        })
 
-        new_object = self.trg_bucket.write_df_to_s3(
-            target_key, data_frame, format=self.trg_args.trg_format
+        return (
+            opening.join([closing, totals])
+            .reset_index()
+            .loc[:, combined.columns]
         )
 
+    def load(self, data_frame: DataFrame):
+        """Loads the data into a new S3 bucket for reporting.
+
+        parameters
+        ----------
+        data_frame : DataFrame or pyarrow.Table
+        A Pandas dataframe or an Arrow table of transformed data
+
+        returns
+        -------
+        bool : True if the write was successful, False if not
+        """
+
+        if self.trg_args.trg_partition_key:
+            new_object = self._load_partitions(data_frame)
+
+        else:
+            key_date = (
+                datetime.today().date()
+                .strftime(self.trg_args.trg_key_date_format)
+            )
+
+            # Format object key
+            target_key = (
+                self.trg_args.trg_key +
+                f"_{key_date}." + self._report_extension()
+            )
+
+            new_object = self._write_report_object(target_key, data_frame)
+
         if new_object is None:
             self._logger.error(
                 "Error: Something went wrong loading the report data."
@@ -279,31 +1192,424 @@ class XetraETL():
 
         self._logger.info("Finished loading the Xetra report.")
 
+        # The runner of a date range updates the meta file itself
+        if self.date_range is not None:
+            return True
+
         # Update the meta file
         MetaProcess.update_meta_file(
-            self.trg_bucket, self.meta_update_list, self.meta_key
+            self._meta_bucket(), self._meta_update_dates(), self.meta_key,
+            self.meta_index_key, self.meta_segment_prefix
         )
 
         self._logger.info("Finished updating the meta file.")
+
+        self._write_state()
         return True
 
+    def _load_partitions(self, data_frame: DataFrame):
+        """Writes the report as one object per date partition.
+
+        The objects are stored under trg_partition_key in directories
+        named after the date column, e.g. date=2022-05-10/. The date
+        is part of the key and not of the object, as usual for Hive
+        partitions. Rows are sorted by ISIN, so the row group statistics
+        let readers skip row groups of other ISINs. A partition that is
+        loaded again is replaced.
+
+        parameters
+        ----------
+        data_frame : DataFrame or pyarrow.Table
+        A Pandas dataframe or an Arrow table of transformed data
+
+        returns
+        -------
+        keys : list or None
+        The keys of the written partitions,
+        or None if a partition could not be written
+        """
+
+        keys = []
+
+        for date, partition in self._partitions(data_frame):
+            key = self._partition_key(date)
+
+            if not self._write_report_object(key, partition):
+                return None
+
+            keys.append(key)
+
+        self._logger.info("Loaded %s date partitions.", len(keys))
+        return keys
+
+    def _partitions(self, data_frame: DataFrame):
+        """Splits the report data into its date partitions.
+
+        yields
+        ------
+        date, partition : tuple
+        The date and the rows of the date without the date column,
+        sorted by ISIN, in the order of the dates
+        """
+
+        date_col = self.trg_args.trg_col_date
+
+        if len(data_frame) == 0:
+            return
+
+        if not isinstance(data_frame, pa.Table):
+            for date, partition in data_frame.groupby(
+                    date_col, sort=True, observed=True):
+                yield date, (
+                    partition.drop(columns=[date_col])
+                    .sort_values(by=[self.trg_args.trg_col_isin],
+                        kind='stable')
+                    .reset_index(drop=True)
+                )
+
+            return
+
+        for date in sorted(pc.unique(data_frame[date_col]).to_pylist()):
+            partition = data_frame.filter(
+                pc.equal(data_frame[date_col], date)
+            ).drop_columns([date_col])
+
+            yield date, partition.take(pc.sort_indices(
+                partition,
+                sort_keys=[(self.trg_args.trg_col_isin, 'ascending')]
+            ))
+
+    def _write_report_object(self, key: str, data_frame: DataFrame):
+        """Writes a report object in the trg_format.
+
+        Arrow tables are written through the synchronous connector,
+        since they are not serialised on the event loop.
+
+        returns
+        -------
+        bool : True if the write was successful, False if not
+        """
+
+        if isinstance(data_frame, pa.Table):
+            bucket = self._meta_bucket()
+
+        else:
+            bucket = self.trg_bucket
+
+        is_written = _write_data(
+            bucket, key, data_frame, self.trg_args.trg_format,
+            row_group_size=self.trg_args.trg_row_group_size,
+            compression=self.trg_args.trg_compression,
+            compression_level=self.trg_args.trg_compression_level,
+            dictionary_columns=self.trg_args.trg_dictionary_columns
+        )
+
+        if isawaitable(is_written):
+            is_written = run(is_written)
+
+        return is_written
+
+    def _partition_key(self, date: str):
+        """Returns the key of the report partition of a date."""
+
+        return (
+            f"{self.trg_args.trg_partition_key}"
+            f"{self.trg_args.trg_col_date}={date}/"
+            f"{ReportPartitionFormat.PARTITION_FILE_NAME.value}."
+            f"{self._report_extension()}"
+        )
+
+    def _report_extension(self):
+        """Returns the file extension of the report objects.
+
+        Gzip compressed csv objects get the extension csv.gz,
+        Parquet objects keep their extension with every codec.
+        """
+
+        if (self.trg_args.trg_format == S3FileTypes.CSV.value
+                and self.trg_args.trg_compression
+                == CompressionCodecs.GZIP.value):
+            return (
+                f"{self.trg_args.trg_format}."
+                f"{ReportPartitionFormat.GZIP_EXTENSION.value}"
+            )
+
+        return self.trg_args.trg_format
+
+    def _state_columns(self):
+        """Returns the columns of the state table."""
+
+        return [
+            self.trg_args.trg_col_isin,
+            self.trg_args.trg_col_date,
+            self.trg_args.trg_col_op_price,
+            self.trg_args.trg_col_clos_price
+        ]
+
+    def _read_state(self):
+        """Reads the last opening and closing prices per ISIN.
+
+        The state table holds the prices of the last processed date
+        of every ISIN, which are needed for the change since the
+        previous closing of the next date.
+
+        returns
+        -------
+        data_frame : DataFrame, pyarrow.Table or None
+        The state table, an Arrow table with src_arrow_native,
+        or None if there is no state table yet
+        """
+
+        if not self.trg_args.trg_state_key:
+            return None
+
+        bucket = self._meta_bucket()
+
+        if self.src_args.src_arrow_native:
+            read_state = bucket.read_parquet_to_table
+
+        else:
+            read_state = bucket.read_parquet_to_df
+
+        try:
+            data_frame = read_state(
+                self.trg_args.trg_state_key, columns=self._state_columns()
+            )
+
+        except bucket.exceptions.NoSuchKey:
+            self._logger.info("No state table found.")
+            return None
+
+        return data_frame
+
+    def _write_state(self):
+        """Writes the prices of the last transformed dates to the state table.
+
+        returns
+        -------
+        bool : True if the state table was written, False if not
+        """
+
+        if not self.trg_args.trg_state_key or self._state_update is None:
+            return False
+
+        is_written = _write_data(
+            self._meta_bucket(), self.trg_args.trg_state_key,
+            self._state_update, S3FileTypes.PARQUET.value
+        )
+
+        self._logger.info("Finished updating the state table.")
+        return is_written
+
+
+    def plan(self):
+        """Returns the optimized plan of the report.
+
+        The plan is built lazily from the current extract_date and
+        extract_date_list, so the columns and dates of the scan follow
+        the aggregation and the date filter of the report.
+
+        returns
+        -------
+        ReportPlan : The plan of the extract and transform steps
+        """
+
+        return optimize(build_plan(
+            self.src_args, self.trg_args,
+            self.extract_date, self._scan_dates()
+        ))
+
+    def _scan_dates(self):
+        """Returns the source dates to extract.
+
+        With the prices of the last processed day in the state table,
+        the days before extract_date are not needed anymore.
+
+        returns
+        -------
+        dates : list
+        The dates of extract_date_list to extract
+        """
+
+        if self._state is None:
+            return self.extract_date_list
+
+        return [
+            date for date in self.extract_date_list
+            if date >= self.extract_date
+        ]
+
+    def _meta_update_dates(self):
+        """Returns the dates added to the meta file.
+
+        returns
+        -------
+        dates : list
+        meta_update_list if it is set, else the dates of
+        extract_date_list from extract_date on
+        """
+
+        if self.meta_update_list is not None:
+            return self.meta_update_list
+
+        return [
+            date for date in self.extract_date_list
+            if date >= self.extract_date
+        ]
+
+    def _meta_bucket(self):
+        """Returns a synchronous connector to the target bucket.
+
+        returns
+        -------
+        S3BucketConnector : The connector used for the meta file
+        """
+
+        if not _is_async(self.trg_bucket):
+            return self.trg_bucket
+
+        if self._sync_trg_bucket is None:
+            self._sync_trg_bucket = self.trg_bucket.sync_connector()
+
+        return self._sync_trg_bucket
 
     def report(self):
         """Processes Xetra source data through ETL into a report.
 
+        The wall time, rows, S3 requests and peak RSS of every stage
+        are measured and emitted to the metrics sinks.
+
         returns
         -------
-        bool : is_successful
-        True if the job was successful, false if not
+        ReportMetrics : metrics
+        The metrics of the stages, truthy if the job was successful
         """
 
-        data_frame = self.extract()
-        data_frame = self.transform(data_frame)
-        is_successful = self.load(data_frame)
+        metrics = ReportMetrics()
+        self._logger.info("Report plan: %s", self.plan().explain())
+
+        if self.src_args.src_streaming:
+            with metrics.stage('extract_transform') as stage:
+                data_frame = self.transform_stream(self.extract_stream())
+                stage.rows_out = len(data_frame)
+
+        elif self.src_args.src_arrow_native:
+            with metrics.stage('extract') as stage:
+                data_frame = self.extract_table()
+                stage.rows_out = len(data_frame)
+
+            with metrics.stage('transform') as stage:
+                stage.rows_in = len(data_frame)
+                data_frame = self.transform_table(data_frame)
+                stage.rows_out = len(data_frame)
+
+        else:
+            with metrics.stage('extract') as stage:
+                data_frame = self.extract()
+                stage.rows_out = len(data_frame)
 
-        if not is_successful:
+            with metrics.stage('transform') as stage:
+                stage.rows_in = len(data_frame)
+                data_frame = self.transform(data_frame)
+                stage.rows_out = len(data_frame)
+
+        with metrics.stage('load') as stage:
+            stage.rows_in = len(data_frame)
+            metrics.is_successful = self.load(data_frame)
+            stage.rows_out = len(data_frame) if metrics.is_successful else 0
+
+        for stage in metrics.stages:
+            self._logger.info(
+                "Stage %s: %.3f s, %s rows, %s objects / %s bytes read, "
+                "%s objects / %s bytes written, %s S3 calls.",
+                stage.name, stage.seconds, stage.rows_out, stage.objects_read,
+                stage.bytes_read, stage.objects_written, stage.bytes_written,
+                sum(stage.s3_calls.values())
+            )
+
+        self._emit_metrics(metrics)
+
+        if not metrics.is_successful:
             self._logger.error("Failed to create Xetra daily report.")
-            return is_successful
+            return metrics
 
         self._logger.info("Successfully created the Xetra daily report!")
-        return is_successful
\ No newline at end of file
+        return metrics
+
+    def _emit_metrics(self, metrics: ReportMetrics):
+        """Emits the metrics to the sinks.
+
+        A failing sink is logged, it never fails the job.
+        """
+
+        for sink in self.metrics_sinks:
+            try:
+                sink.emit(metrics)
+
+            except OSError:
+                self._logger.exception(
+                    "Failed to emit the metrics to %s.", type(sink).__name__
+                )
+
+
+def merge_states(states: list, trg_args: XetraTargetConfig):
+    """Merges state tables into the last prices per ISIN.
+
+    parameters
+    ----------
+    states : list
+    State tables as Pandas dataframes or Arrow tables, or None;
+    on equal dates the later state table wins
+
+    trg_args : XetraTargetConfig
+    NamedTuple class with target configuration data
+
+    returns
+    -------
+    data_frame : DataFrame or None
+    The prices of the last date of every ISIN, sorted by ISIN,
+    or None if there is no state table
+    """
+
+    states = [
+        state.to_pandas() if isinstance(state, pa.Table) else state
+        for state in states if state is not None
+    ]
+
+    if not states:
+        return None
+
+    return (
+        concat(states, ignore_index=True)
+        .sort_values(by=[trg_args.trg_col_date], kind='stable')
+        .groupby([trg_args.trg_col_isin])
+        .tail(1)
+        .sort_values(by=[trg_args.trg_col_isin])
+        .reset_index(drop=True)
+    )
+
+
+def _write_data(bucket, key: str, data_frame: DataFrame, format: str,
+        **options):
+    """Writes a Pandas dataframe or an Arrow table to an S3 object.
+
+    Arrow tables need a synchronous S3BucketConnector. The options,
+    like row_group_size and compression, are passed to the connector.
+
+    returns
+    -------
+    bool : True if the write was successful, False if not
+    (awaitable for dataframes written by an async connector)
+    """
+
+    if isinstance(data_frame, pa.Table):
+        return bucket.write_table_to_s3(key, data_frame, format=format,
+            **options)
+
+    return bucket.write_df_to_s3(key, data_frame, format=format, **options)
+
+
+def _is_async(bucket):
+    """Checks whether a bucket connector has awaitable methods."""
+
+    return iscoroutinefunction(bucket.read_csv_to_df)